@@ -1,3 +1,8 @@
-from src.agents.builder import get_hospital_orchestrator
+# The orchestrator is built on first access to `root_agent` (e.g. when
+# `adk run` looks it up), not at import time, and memoized per process.
 
-root_agent = get_hospital_orchestrator()
+def __getattr__(name):
+    if name == "root_agent":
+        from src.agents.builder import get_hospital_orchestrator
+        return get_hospital_orchestrator()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Run surge plans for many hospitals through one shared orchestrator.
+
+Jobs are JSON lines:
+
+    {"hospital_id": "delhi-aiims", "location": {"name": "Delhi", "lat": 28.57, "lon": 77.21},
+     "prompt": "Expected Diwali crowds and high pollution", "horizon": 7}
+
+Optional per-job keys: "job_id" (defaults to a hash of the job),
+"start_date" (ISO date, defaults to today) and "data_dir" (defaults to
+<data-root>/<hospital_id>), the directory holding that hospital's
+roster.csv, inventory.csv and historical_admissions.csv.
+
+Up to --concurrency jobs run at once and all of them share one Gemini
+request budget (--qps). Each result is appended to the output JSONL as soon
+as its job finishes, with its per-agent token usage; re-running the same
+command skips jobs that already succeeded, so an interrupted batch resumes
+where it stopped.
+
+Usage:
+    python scripts/run_batch.py jobs.jsonl --out results.jsonl --concurrency 4 --qps 2
+    python scripts/run_batch.py jobs.jsonl --out results.jsonl --restart
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import date
+
+from src.agents.builder import get_hospital_orchestrator
+from src.agents.rate_limit import model_rate_limiter
+from src.agents.runtime import OrchestratorRuntime
+from src.agents.token_budget import token_budget
+from src.config import GEMINI_QPS, ORCHESTRATOR_MODE, OUTPUT_MODE
+from src.observability.logger import logger, run_context
+from src.observability.metrics import metrics
+from src.tools.data_paths import use_data_dir
+
+DEFAULT_PROMPT = "Plan for the next {horizon} days."
+
+
+def job_id(job: dict) -> str:
+    if job.get("job_id"):
+        return str(job["job_id"])
+    digest = hashlib.sha256(json.dumps(job, sort_keys=True).encode()).hexdigest()[:10]
+    return f"{job['hospital_id']}-{digest}"
+
+
+def load_jobs(path: str) -> list[dict]:
+    jobs, seen = [], set()
+    with open(path) as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            job = json.loads(line)
+            if "hospital_id" not in job:
+                raise SystemExit(f"{path}:{line_no}: job has no hospital_id")
+            job["job_id"] = job_id(job)
+            if job["job_id"] in seen:
+                raise SystemExit(f"{path}:{line_no}: duplicate job_id {job['job_id']!r}")
+            seen.add(job["job_id"])
+            jobs.append(job)
+    return jobs
+
+
+def completed_jobs(path: str) -> set[str]:
+    """job_ids already recorded as successful in the output file."""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn last line from an interrupted run
+            if record.get("status") == "ok":
+                done.add(record["job_id"])
+    return done
+
+
+def job_prompt(job: dict) -> str:
+    horizon = int(job.get("horizon", 7))
+    lines = [job.get("prompt") or DEFAULT_PROMPT.format(horizon=horizon), "", f"Hospital: {job['hospital_id']}"]
+    location = job.get("location")
+    if isinstance(location, dict):
+        coords = f" (lat {location['lat']}, lon {location['lon']})" if "lat" in location and "lon" in location else ""
+        lines.append(f"Location: {location.get('name', '')}{coords}".rstrip())
+    elif location:
+        lines.append(f"Location: {location}")
+    lines.append(f"Planning horizon: {horizon} days")
+    return "\n".join(lines)
+
+
+def job_state(job: dict) -> dict:
+    """Initial session state; the orchestrator's pre-fetch stage reads horizon, start date and location."""
+    state = {
+        "hospital_id": job["hospital_id"],
+        "horizon_days": int(job.get("horizon", 7)),
+        "start_date": job.get("start_date") or date.today().isoformat(),
+    }
+    location = job.get("location")
+    if isinstance(location, dict) and "lat" in location and "lon" in location:
+        state.update(lat=float(location["lat"]), lon=float(location["lon"]))
+    return state
+
+
+class ResultWriter:
+    """Appends one JSON line per finished job and syncs it to disk."""
+
+    def __init__(self, path: str, restart: bool):
+        self._f = open(path, "w" if restart else "a+")
+        if not restart:
+            self._f.seek(0, os.SEEK_END)
+            if self._f.tell():
+                self._f.seek(self._f.tell() - 1)
+                if self._f.read(1) != "\n":
+                    self._f.write("\n")  # fence off a torn line
+
+    def write(self, record: dict) -> None:
+        self._f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._f.flush()
+        os.fsync(self._f.fileno())
+
+    def close(self) -> None:
+        self._f.close()
+
+
+async def run_job(runtime, job, data_root, semaphore, timeout) -> dict:
+    data_dir = job.get("data_dir") or os.path.join(data_root, job["hospital_id"])
+    record = {"job_id": job["job_id"], "hospital_id": job["hospital_id"]}
+    async with semaphore:
+        start = time.perf_counter()
+        with run_context(job["job_id"]), use_data_dir(data_dir):
+            try:
+                if not os.path.isdir(data_dir):
+                    raise FileNotFoundError(f"no data directory {data_dir}")
+                state = job_state(job)
+                async with asyncio.timeout(timeout):
+                    report = await runtime.run(job_prompt(job), user_id=job["hospital_id"], state=state)
+                record.update(status="ok", report=report)
+            except TimeoutError:
+                record.update(status="timeout", error=f"no result after {timeout:.0f}s")
+            except Exception as e:
+                logger.exception("Batch job %s failed", job["job_id"])
+                record.update(status="error", error=f"{type(e).__name__}: {e}")
+        record["tokens"] = token_budget.usage(job["job_id"], pop=True)
+        record["duration_s"] = round(time.perf_counter() - start, 3)
+    metrics.counter("batch_jobs_total", "Finished batch jobs").inc(status=record["status"])
+    return record
+
+
+async def run_batch(args) -> int:
+    jobs = load_jobs(args.jobs)
+    done = set() if args.restart else completed_jobs(args.out)
+    pending = [job for job in jobs if job["job_id"] not in done]
+    print(f"{len(jobs)} jobs, {len(jobs) - len(pending)} already done, {len(pending)} to run", file=sys.stderr)
+
+    runtime = OrchestratorRuntime(get_hospital_orchestrator(args.mode, args.output_mode))
+    semaphore = asyncio.Semaphore(args.concurrency)
+    writer = ResultWriter(args.out, args.restart)
+    failed = 0
+    try:
+        tasks = [
+            asyncio.create_task(run_job(runtime, job, args.data_root, semaphore, args.job_timeout))
+            for job in pending
+        ]
+        for finished in asyncio.as_completed(tasks):
+            record = await finished
+            writer.write(record)
+            failed += record["status"] != "ok"
+            print(f"[{record['status']}] {record['job_id']} ({record['duration_s']}s)", file=sys.stderr)
+    finally:
+        writer.close()
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("jobs", help="JSONL file of jobs")
+    parser.add_argument("--out", help="results JSONL (default: <jobs>.results.jsonl)")
+    parser.add_argument("--data-root", default="data/hospitals", help="parent of the per-hospital data directories")
+    parser.add_argument("--concurrency", type=int, default=4, help="jobs running at once")
+    parser.add_argument("--qps", type=float, default=GEMINI_QPS or 2.0, help="Gemini requests per second, all jobs combined")
+    parser.add_argument("--burst", type=int, help="requests allowed at once before --qps applies")
+    parser.add_argument("--job-timeout", type=float, default=600.0, help="seconds per job")
+    parser.add_argument("--mode", default=ORCHESTRATOR_MODE, choices=["agent", "workflow"])
+    parser.add_argument("--output-mode", default=OUTPUT_MODE, choices=["text", "structured"])
+    parser.add_argument("--restart", action="store_true", help="ignore and overwrite previous results")
+    parser.add_argument("--metrics", metavar="PATH", help="write a metrics snapshot after the batch")
+    args = parser.parse_args()
+    args.out = args.out or os.path.splitext(args.jobs)[0] + ".results.jsonl"
+
+    model_rate_limiter.configure(args.qps, args.burst)
+    status = asyncio.run(run_batch(args))
+    if args.metrics:
+        metrics.dump(args.metrics)
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
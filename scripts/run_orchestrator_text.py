@@ -5,43 +5,93 @@ Simple runner to invoke the orchestrator and print a plain-text report.
 Usage:
     source .venv/bin/activate
     python scripts/run_orchestrator_text.py "Plan for the next 7 days — expected Diwali crowds and high pollution levels in Delhi"
+
+    # Print each report section as soon as its agent finishes, token by token
+    # in workflow mode (in agent mode each section appears whole)
+    python scripts/run_orchestrator_text.py --stream --mode workflow "Plan for the next 7 days"
+
+    # Also write per-agent latency/token metrics (JSON, or Prometheus text for *.prom)
+    python scripts/run_orchestrator_text.py --metrics metrics.json "Plan for the next 7 days"
+
+    # Print this run's prompt/completion tokens per agent (to stderr)
+    python scripts/run_orchestrator_text.py --tokens "Plan for the next 7 days"
+
+    # Specialists return validated JSON; the report is rendered without a synthesis model call
+    python scripts/run_orchestrator_text.py --output-mode structured "Plan for the next 7 days"
+
+    # Tail a live admissions CSV (date,total_admissions,icu_admissions) while planning;
+    # --persist-feed also appends its rows to historical_admissions.csv
+    python scripts/run_orchestrator_text.py --feed data/admissions_feed.csv "Plan for the next 7 days"
 """
-import sys
+import argparse
 import asyncio
-import inspect
+import sys
+import time
 
 from src.agents.builder import get_hospital_orchestrator
+from src.agents.runtime import OrchestratorRuntime
+from src.agents.streaming import SectionPrinter, section_updates
+from src.agents.token_budget import format_usage, token_budget
+from src.config import ORCHESTRATOR_MODE, OUTPUT_MODE
+from src.observability.logger import run_context
+from src.observability.metrics import metrics
+from src.tools.admissions_feed import following
+
+
+async def stream_report(runtime: OrchestratorRuntime, prompt: str, structured: bool = False) -> None:
+    printer = SectionPrinter(sys.stdout)
+    start = time.perf_counter()
+    first = True
+    try:
+        async for update in section_updates(runtime.events(prompt, stream=True), structured=structured):
+            if first and update.text.strip():
+                metrics.histogram(
+                    "time_to_first_output_seconds", "Time from request to first streamed report text"
+                ).observe(time.perf_counter() - start)
+                first = False
+            printer.feed(update)
+    finally:
+        printer.finish()
+
+
+async def with_feed(coro, path: str, persist: bool):
+    async with following(path, persist=persist):
+        return await coro
 
 
 def main():
-    prompt = " ".join(sys.argv[1:]) if len(sys.argv) > 1 else (
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("prompt", nargs="*")
+    parser.add_argument("--mode", default=ORCHESTRATOR_MODE, choices=["agent", "workflow"])
+    parser.add_argument("--output-mode", default=OUTPUT_MODE, choices=["text", "structured"])
+    parser.add_argument("--stream", action="store_true", help="print sections incrementally as agents finish")
+    parser.add_argument("--metrics", metavar="PATH", help="write a metrics snapshot after the run")
+    parser.add_argument("--tokens", action="store_true", help="print per-agent token usage after the run")
+    parser.add_argument("--feed", metavar="PATH", help="admissions CSV to tail into the live store during the run")
+    parser.add_argument("--persist-feed", action="store_true", help="also append the feed's rows to the history CSV")
+    args = parser.parse_args()
+
+    prompt = " ".join(args.prompt) if args.prompt else (
         "Plan for the next 7 days — expected Diwali crowds and high pollution levels in Delhi"
     )
 
     # Build orchestrator (this configures the Gemini client)
-    orchestrator = get_hospital_orchestrator()
+    runtime = OrchestratorRuntime(get_hospital_orchestrator(args.mode, args.output_mode))
 
-    # Call the agent. The ADK may expose a synchronous or asynchronous call.
-    try:
-        result = orchestrator.run(prompt)
-    except TypeError:
-        # Some ADK versions require run_async or return coroutine
-        result = getattr(orchestrator, "run", None)
-        if result is None:
-            print("The orchestrator does not expose a 'run' method in this environment.")
-            sys.exit(1)
-        result = result(prompt)
-
-    if inspect.isawaitable(result):
-        out = asyncio.run(result)
-    else:
-        out = result
-
-    # Print whatever the agent returned (likely plain-text). If it's an object, print repr.
-    try:
-        print(out)
-    except Exception:
-        print(repr(out))
+    def run(coro):
+        return asyncio.run(with_feed(coro, args.feed, args.persist_feed) if args.feed else coro)
+
+    with run_context() as run_id:
+        if args.stream:
+            run(stream_report(runtime, prompt, structured=args.output_mode == "structured"))
+        else:
+            print(run(runtime.run(prompt)))
+
+    if args.tokens:
+        print(format_usage(token_budget.usage(run_id, pop=True)), file=sys.stderr)
+
+    if args.metrics:
+        metrics.dump(args.metrics)
 
 
 if __name__ == "__main__":
@@ -1,5 +1,8 @@
 # src/agents/advisory_agent.py
 from google.adk.agents import LlmAgent
+from .callbacks import specialist_callbacks
+from .model_policy import policy_model
+from .schemas import AdvisoryPlan, json_output_rules
 
 ADVISORY_SCHEMA_DESCRIPTION = """
 You output a JSON dictionary with:
@@ -12,14 +15,22 @@ You output a JSON dictionary with:
 - "internal_notes": short text for hospital leadership only.
 """
 
-def build_advisory_agent() -> LlmAgent:
+TEXT_OUTPUT_RULES = """
+- Produce human-readable advisories formatted as plain text. Provide channel-specific short messages (sms/email/website/social) and short internal notes for leadership.
+- Do NOT output raw JSON.
+""".strip()
+
+def build_advisory_agent(structured: bool = False) -> LlmAgent:
     """
-    Agent that turns surge forecast into patient advisory messaging.
+    Agent that turns surge forecast into patient advisory messaging (JSON
+    validated against AdvisoryPlan with structured=True).
     """
+    output_rules = json_output_rules(ADVISORY_SCHEMA_DESCRIPTION) if structured else TEXT_OUTPUT_RULES
     agent = LlmAgent(
-        model="gemini-2.0-flash",
+        model=policy_model("advisory_agent"),
         name="advisory_agent",
         description="Creates patient-facing advisories based on surge risk.",
+        output_schema=AdvisoryPlan if structured else None,
                 instruction=f"""
 You are the communications officer for the hospital.
 
@@ -33,9 +44,9 @@ Task:
 
 Tone and output format:
 - Use a reassuring, honest tone. Avoid panic.
-- Produce human-readable advisories formatted as plain text. Provide channel-specific short messages (sms/email/website/social) and short internal notes for leadership.
-- Do NOT output raw JSON.
+{output_rules}
 
 """.strip(),
+        **specialist_callbacks(),
     )
     return agent
@@ -1,10 +1,35 @@
 # src/agents/builder.py
-from ..llm_setup import configure_genai
-from .orchestrator import build_orchestrator_agent
+from __future__ import annotations
 
-def get_hospital_orchestrator():
+import functools
+
+from .. import config
+from ..observability.logger import configure_logging
+
+def get_hospital_orchestrator(mode: str | None = None, output_mode: str | None = None):
     """
-    Convenience function to configure the LLM client and build the orchestrator.
+    Convenience function to configure logging and the LLM client and build
+    the orchestrator.
+
+    mode="agent" builds the LLM-driven orchestrator; mode="workflow" builds the
+    forecast → parallel specialists → synthesis pipeline. output_mode="structured"
+    has the specialists return validated JSON and renders the report from it
+    without a synthesis model call. Either defaults to its setting
+    (ORCHESTRATOR_MODE / OUTPUT_MODE), read on the call, not at import.
+
+    The agent tree is built on the first call and reused afterwards; ADK
+    agents hold no per-run state, so one instance serves every run.
     """
+    return _build(mode or config.ORCHESTRATOR_MODE, output_mode or config.OUTPUT_MODE)
+
+@functools.cache
+def _build(mode: str, output_mode: str):
+    # Deferred: google.adk / google.genai dominate cold-start import time.
+    from ..llm_setup import configure_genai
+    from .orchestrator import build_orchestrator_agent, build_orchestrator_workflow
+
+    configure_logging(config.LOG_FILE, config.LOG_LEVEL)
     configure_genai()
-    return build_orchestrator_agent()
+    if mode == "workflow":
+        return build_orchestrator_workflow(output_mode=output_mode)
+    return build_orchestrator_agent(output_mode=output_mode)
@@ -0,0 +1,55 @@
+# src/agents/callbacks.py
+"""
+Callback bundles shared by every agent builder, so cross-cutting concerns
+(metrics, response caching, rate limiting, token budgets) are wired in one place.
+"""
+from src.observability import instrumentation
+
+from .prefetch import load_snapshots
+from .rate_limit import model_rate_limiter
+from .response_cache import response_cache
+from .token_budget import token_budget
+
+
+def agent_callbacks() -> dict:
+    """Instrumentation for any agent (timings, per-run token usage) and the shared QPS limit."""
+    return dict(
+        before_agent_callback=instrumentation.before_agent,
+        after_agent_callback=instrumentation.after_agent,
+        before_model_callback=[model_rate_limiter.before_model, instrumentation.before_model],
+        after_model_callback=[instrumentation.after_model, token_budget.after_model],
+        on_model_error_callback=instrumentation.on_model_error,
+        before_tool_callback=instrumentation.before_tool,
+        after_tool_callback=instrumentation.after_tool,
+        on_tool_error_callback=instrumentation.on_tool_error,
+    )
+
+
+def specialist_callbacks() -> dict:
+    """agent_callbacks() plus the pre-fetched snapshots, handoff compression and the response cache."""
+    callbacks = agent_callbacks()
+    callbacks["before_agent_callback"] = [load_snapshots, instrumentation.before_agent]
+    # The handoff is compressed before anything keys on the request. A cache
+    # hit short-circuits the model call, so it comes next: only misses wait
+    # for a QPS slot, and the model timer starts after the wait.
+    callbacks["before_model_callback"] = [
+        token_budget.before_model,
+        response_cache.before_model,
+        model_rate_limiter.before_model,
+        instrumentation.before_model,
+    ]
+    callbacks["after_model_callback"] = [
+        instrumentation.after_model,
+        token_budget.after_model,
+        response_cache.after_model,
+    ]
+    callbacks["on_model_error_callback"] = [instrumentation.on_model_error, response_cache.on_model_error]
+    return callbacks
+
+
+def workflow_callbacks() -> dict:
+    """Agent-level timing only, for non-LLM agents (sequential / fan-out)."""
+    return dict(
+        before_agent_callback=instrumentation.before_agent,
+        after_agent_callback=instrumentation.after_agent,
+    )
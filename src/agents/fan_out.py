@@ -0,0 +1,86 @@
+# src/agents/fan_out.py
+"""
+Concurrent fan-out with per-branch timeouts and partial results.
+
+Like ADK's ParallelAgent, every sub-agent runs on its own branch and its
+events are forwarded one at a time (each branch waits until its event has
+been consumed, so tool-call events land in the session before the next
+model call). Unlike ParallelAgent, a branch that fails or exceeds
+`branch_timeout` is cancelled without taking the others down: its
+`output_key` is filled with a short "unavailable" note so the synthesis
+step still runs, and `fan_out_status` records what happened per branch.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import AsyncGenerator
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+
+from src.observability.logger import logger
+
+_DONE = object()
+
+
+class FanOutAgent(BaseAgent):
+    """Runs sub-agents concurrently; tolerates branch failures and timeouts."""
+
+    branch_timeout: float = 90.0
+
+    def _branch_ctx(self, ctx: InvocationContext, sub_agent: BaseAgent) -> InvocationContext:
+        branch_ctx = ctx.model_copy()
+        suffix = f"{self.name}.{sub_agent.name}"
+        branch_ctx.branch = f"{ctx.branch}.{suffix}" if ctx.branch else suffix
+        return branch_ctx
+
+    def _state_event(self, ctx: InvocationContext, state_delta: dict) -> Event:
+        return Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta=state_delta),
+        )
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        queue: asyncio.Queue = asyncio.Queue()
+        status: dict[str, str] = {}
+
+        async def run_branch(sub_agent: BaseAgent) -> None:
+            try:
+                async with asyncio.timeout(self.branch_timeout):
+                    async for event in sub_agent.run_async(self._branch_ctx(ctx, sub_agent)):
+                        consumed = asyncio.Event()
+                        await queue.put((sub_agent, event, consumed))
+                        await consumed.wait()
+                status[sub_agent.name] = "ok"
+            except TimeoutError:
+                status[sub_agent.name] = f"timed out after {self.branch_timeout:.0f}s"
+            except Exception as e:  # a failing branch must not sink its siblings
+                status[sub_agent.name] = f"failed: {type(e).__name__}: {e}"
+            finally:
+                await queue.put((sub_agent, _DONE, None))
+
+        tasks = [asyncio.create_task(run_branch(sub)) for sub in self.sub_agents]
+        try:
+            remaining = len(tasks)
+            while remaining:
+                sub_agent, event, consumed = await queue.get()
+                if event is _DONE:
+                    remaining -= 1
+                    if status.get(sub_agent.name) != "ok":
+                        logger.warning("Branch %s %s", sub_agent.name, status[sub_agent.name])
+                        key = getattr(sub_agent, "output_key", None) or f"{sub_agent.name}_output"
+                        yield self._state_event(
+                            ctx, {key: f"[unavailable: {sub_agent.name} {status[sub_agent.name]}]"}
+                        )
+                    continue
+                yield event
+                consumed.set()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        yield self._state_event(ctx, {"fan_out_status": dict(status)})
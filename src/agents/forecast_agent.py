@@ -1,7 +1,13 @@
 # src/agents/forecast_agent.py
 from google.adk.agents import LlmAgent
+from .callbacks import specialist_callbacks
+from .model_policy import policy_model
+from .schemas import SurgeForecast, json_output_rules
 from src.tools.hospital_data_adk_tool import HospitalAdmissionsTool
+from src.tools.occupancy_sim_tool import OccupancySimTool
 from src.tools.pollution_api_tool import PollutionForecastTool
+from src.tools.scenario_sweep_tool import ScenarioSweepTool
+from src.tools.surge_forecast_tool import SurgeBaselineTool
 
 FORECAST_SCHEMA_DESCRIPTION = """
 You output a JSON dictionary with:
@@ -10,23 +16,38 @@ You output a JSON dictionary with:
     - "date": ISO date string, e.g. "2025-11-15".
     - "surge_risk": one of ["low", "medium", "high", "critical"].
     - "expected_admissions": approximate integer count for total patients.
+    - "expected_icu_admissions": optional integer count of ICU admissions.
     - "main_drivers": list of strings, e.g. ["festival", "pollution", "flu-season"].
 - "notes": short free-text reasoning.
 """
 
-def build_forecast_agent() -> LlmAgent:
+TEXT_OUTPUT_RULES = """
+- Produce a clear human-readable plain-text forecast with a short heading, a 1-2 sentence summary, and a per-day bullet list for the horizon.
+- Under each date, include: risk level (low/medium/high/critical), expected admissions (approx.), and main drivers.
+- Explicitly list assumptions at the end of the forecast.
+- Do NOT output raw JSON. Use headings and bullets for readability.
+""".strip()
+
+def build_forecast_agent(structured: bool = False) -> LlmAgent:
     """
     Build an LLM agent responsible for forecasting patient surges.
 
-    Later we will attach tools:
+    With structured=True it answers with JSON validated against
+    SurgeForecast instead of prose.
+
+    Tools:
+      - numeric surge baseline (history + festival calendar + PM2.5)
+      - Monte Carlo scenario sweep (quantiles, probability of exceeding capacity)
+      - discrete-event bed/ICU occupancy simulation
       - hospital historical admissions tool
-      - pollution / weather / festival tools
-    For now it only uses its own reasoning.
+      - pollution forecast tool
     """
+    output_rules = json_output_rules(FORECAST_SCHEMA_DESCRIPTION) if structured else TEXT_OUTPUT_RULES
     agent = LlmAgent(
-        model="gemini-2.0-flash",
+        model=policy_model("forecast_agent"),
         name="forecast_agent",
         description="Forecasts hospital patient surges based on events like festivals, pollution spikes, or epidemics.",
+        output_schema=SurgeForecast if structured else None,
         instruction=f"""
       You are an operations analytics assistant for a large urban hospital.
 
@@ -36,17 +57,41 @@ def build_forecast_agent() -> LlmAgent:
       - the hospital is in a large Indian metro with strong festival effects
 
       Guidance for output:
-      - Produce a clear human-readable plain-text forecast with a short heading, a 1-2 sentence summary, and a per-day bullet list for the horizon.
-      - Under each date, include: risk level (low/medium/high/critical), expected admissions (approx.), and main drivers.
-      - Explicitly list assumptions at the end of the forecast.
-      - Do NOT output raw JSON. Use headings and bullets for readability.
+      {output_rules}
+
+      Start from the computed baseline (per-day expected admissions and surge risk from history, the
+      festival calendar and PM2.5). Narrate those numbers and only adjust them for drivers the baseline
+      cannot see (e.g. epidemic hints in the request); state every adjustment and why.
 
-      When you need recent admissions data, call tool `hospital_admissions_tool` (e.g. `{"days":14}`) before predicting surges.
-      When location coordinates are provided, call `pollution_forecast_tool` to incorporate PM2.5/AQI.
+      Pre-fetched data (use it directly; do not call a tool to fetch it again):
+      Recent admissions: {{admissions_snapshot?}}
+      Baseline forecast: {{surge_baseline_snapshot?}}
+
+      Tools are a fallback only:
+      - Call `surge_baseline_func` (horizon_days, start_date, lat/lon) if the baseline above is missing or
+        its horizon, start date or location does not match the request (e.g. coordinates were given).
+      - Call `hospital_admissions_func` only if the admissions above are missing or you need more days.
+      - Call `pollution_forecast_async` only if you need raw PM2.5/AQI beyond what the baseline includes.
       If a tool fails, continue with a best-effort textual forecast and note the missing data.
 
+      What-if questions and uncertainty:
+      For scenarios such as "what if AQI hits 400" or "what if the festival shifts a day", or when the
+      request asks how likely a capacity breach is, call `scenario_sweep_func` once (e.g. pm25_override
+      for an AQI level, festival_shift_days, capacity if given) instead of forecasting each scenario
+      separately. Report the p10/p50/p90 range and the probability of exceeding capacity per day, and
+      name the day with the highest p90.
+
+      Beds and ICU:
+      Daily admissions are not occupancy. When the request asks about beds, ICU capacity or lengths of
+      stay, call `occupancy_sim_func` once with your per-day expected admissions (and ICU admissions) and
+      report the p50/p90 bed and ICU occupancy per day and the first day the ICU is likely full.
+
       """.strip(),
-        tools=[HospitalAdmissionsTool(),
-        PollutionForecastTool()]
+        tools=[SurgeBaselineTool(),
+        ScenarioSweepTool(),
+        OccupancySimTool(),
+        HospitalAdmissionsTool(),
+        PollutionForecastTool()],
+        **specialist_callbacks(),
     )
     return agent
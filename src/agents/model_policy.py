@@ -0,0 +1,421 @@
+# src/agents/model_policy.py
+"""
+Latency SLOs and failure handling for model calls.
+
+Every agent builder takes its model from `policy_model(agent_name)`: a
+PolicyLlm that wraps the primary Gemini model and, per model call,
+
+  - keeps to the agent's deadline (AGENT_SLOS, overridable with
+    MODEL_DEADLINES) across all attempts, and abandons a single attempt
+    that has not answered within the per-attempt timeout;
+  - retries transient failures (timeouts, 5xx, 408, 429) with jittered
+    exponential backoff;
+  - hedges: when an attempt has not answered within the p95 of the agent's
+    recent latencies, a duplicate request goes out and the first answer wins;
+  - falls back to a cheaper model (MODEL_FALLBACK) when the primary is out of
+    attempts, and then to the last good answer to the same prompt;
+  - circuit-breaks: after MODEL_BREAKER_FAILURES consecutive failures a model
+    is skipped for MODEL_BREAKER_COOLDOWN_SECONDS, then probed with one call.
+
+Retries, hedges and fallback calls each take a slot from the shared rate
+limiter. Degraded answers carry custom_metadata["degraded"] ("fallback" or
+"last_good") and are not stored in the response cache. src/eval/fault_model.py
+and src/eval/policy_bench.py exercise all of this offline.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncGenerator
+
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.models.registry import LLMRegistry
+
+from src.config import (
+    MODEL_BREAKER_COOLDOWN_SECONDS,
+    MODEL_BREAKER_FAILURES,
+    MODEL_DEADLINES,
+    MODEL_FALLBACK,
+    MODEL_POLICY_ENABLED,
+    MODEL_PRIMARY,
+    MODEL_RETRIES,
+)
+from src.observability.logger import logger
+from src.observability.metrics import metrics
+
+from .rate_limit import model_rate_limiter
+from .response_cache import ResponseCache, _normalize_contents
+
+# (deadline, per-attempt timeout) in seconds. An orchestrator turn is one
+# model call; the specialists it calls through AgentTools have their own.
+AGENT_SLOS = {
+    "hospital_orchestrator": (60.0, 30.0),
+    "report_synthesizer": (45.0, 25.0),
+    "forecast_agent": (40.0, 20.0),
+    "staffing_agent": (30.0, 15.0),
+    "supply_agent": (30.0, 15.0),
+    "advisory_agent": (25.0, 12.0),
+}
+DEFAULT_SLO = (30.0, 15.0)
+LATENCY_WINDOW = 200
+
+
+@dataclass(frozen=True)
+class ModelPolicy:
+    """One agent's latency SLO and failure handling."""
+
+    deadline: float                  # whole call: attempts, backoff and fallback
+    attempt_timeout: float           # one attempt, to its first response
+    retries: int = 2                 # per model, after the first attempt
+    backoff: float = 0.5             # base of the jittered exponential backoff
+    hedge_quantile: float = 0.95
+    hedge_min_samples: int = 20      # no hedging until this many latencies are known
+    hedge_floor: float = 0.25        # never hedge sooner than this
+    fallback_model: str | None = None
+    last_good: bool = True
+
+
+def policy_for(agent_name: str) -> ModelPolicy:
+    deadline, attempt_timeout = AGENT_SLOS.get(agent_name, DEFAULT_SLO)
+    if agent_name in MODEL_DEADLINES:
+        override = MODEL_DEADLINES[agent_name]
+        deadline, attempt_timeout = override, override * attempt_timeout / deadline
+    return ModelPolicy(
+        deadline=deadline,
+        attempt_timeout=attempt_timeout,
+        retries=MODEL_RETRIES,
+        fallback_model=MODEL_FALLBACK,
+    )
+
+
+class ModelUnavailable(RuntimeError):
+    """No model answered within the deadline and there was no last good answer."""
+
+
+class LatencyTracker:
+    """Recent time-to-first-response samples per (agent, model)."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.window = window
+        self._samples: dict[tuple[str, str], deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, key: tuple[str, str], seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=self.window)).append(seconds)
+
+    def quantile(self, key: tuple[str, str], q: float, min_samples: int = 1) -> float | None:
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if len(samples) < max(1, min_samples):
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure breaker for one model: open after `failures`
+    failures in a row, half-open (one probe call) after `cooldown` seconds.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failures: int = MODEL_BREAKER_FAILURES,
+        cooldown: float = MODEL_BREAKER_COOLDOWN_SECONDS,
+    ):
+        self.name = name
+        self.failures = max(1, failures)
+        self.cooldown = cooldown
+        self._count = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "open" if time.monotonic() - self._opened_at < self.cooldown else "half_open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probing or time.monotonic() - self._opened_at < self.cooldown:
+                return False
+            self._probing = True
+            return True
+
+    def record(self, ok: bool | None) -> None:
+        """Outcome of a call: True/False, or None when it was abandoned or the request was bad."""
+        with self._lock:
+            if ok is None:
+                self._probing = False
+                return
+            if ok:
+                if self._opened_at is not None:
+                    logger.info("Circuit for %s closed", self.name)
+                self._count, self._opened_at, self._probing = 0, None, False
+                return
+            self._count += 1
+            if self._probing or (self._opened_at is None and self._count >= self.failures):
+                if not self._probing:
+                    logger.warning("Circuit for %s opened after %d failures", self.name, self._count)
+                    metrics.counter("model_circuit_open_total", "Times a model's circuit opened").inc(model=self.name)
+                self._opened_at, self._probing = time.monotonic(), False
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker(model: str) -> CircuitBreaker:
+    with _breakers_lock:
+        if model not in _breakers:
+            _breakers[model] = CircuitBreaker(model)
+        return _breakers[model]
+
+
+latency_tracker = LatencyTracker()
+# Last good answer per prompt: no TTL and no snapshot versions in the key, so
+# it still answers after the response cache has expired or the data moved on.
+last_good = ResponseCache(ttl_seconds=float("inf"), max_entries=256, path=None, enabled=True)
+
+
+def last_good_key(agent_name: str, llm_request: LlmRequest) -> str:
+    config = llm_request.config
+    payload = [
+        agent_name,
+        str(config.system_instruction) if config else None,
+        _normalize_contents(llm_request.contents),
+    ]
+    blob = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def reset() -> None:
+    """Forget latencies, circuit state and last good answers."""
+    latency_tracker.clear()
+    with _breakers_lock:
+        _breakers.clear()
+    last_good.clear()
+
+
+def _retryable(error: BaseException) -> bool:
+    """Timeouts, 5xx, 408 and 429 are worth another attempt; other 4xx are not."""
+    code = getattr(error, "code", None)
+    return not (isinstance(code, int) and 400 <= code < 500 and code not in (408, 429))
+
+
+def _mark(response: LlmResponse, degraded: str | None) -> LlmResponse:
+    if degraded:
+        response.custom_metadata = {**(response.custom_metadata or {}), "degraded": degraded}
+    return response
+
+
+class PolicyLlm(BaseLlm):
+    """`model` (the primary) called under `policy`; see the module docstring."""
+
+    model: str
+    agent_name: str
+    policy: ModelPolicy
+    primary: BaseLlm | None = None       # resolved from `model` when not given
+    fallback: BaseLlm | None = None      # resolved from policy.fallback_model when not given
+
+    def _models(self) -> list[BaseLlm]:
+        if self.primary is None:
+            self.primary = LLMRegistry.new_llm(self.model)
+        if self.fallback is None and self.policy.fallback_model:
+            self.fallback = LLMRegistry.new_llm(self.policy.fallback_model)
+        return [m for m in (self.primary, self.fallback) if m is not None]
+
+    @property
+    def capabilities(self):
+        return self._models()[0].capabilities
+
+    def connect(self, llm_request: LlmRequest):
+        return self._models()[0].connect(llm_request)
+
+    def _event(self, event: str) -> None:
+        metrics.counter("model_policy_events_total", "Retries, hedges, timeouts and fallbacks").inc(
+            agent=self.agent_name, event=event
+        )
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        policy, loop = self.policy, asyncio.get_running_loop()
+        deadline = loop.time() + policy.deadline
+        error: BaseException | None = None
+        slot_used = False  # the first call's QPS slot was taken by the before-model callback
+
+        for model in self._models():
+            is_primary = model is self.primary
+            request = llm_request if is_primary else llm_request.model_copy(update={"model": model.model})
+            for attempt in range(policy.retries + 1):
+                if not breaker(model.model).allow():
+                    self._event("circuit_open")
+                    break
+                if attempt:
+                    self._event("retry")
+                    backoff = random.uniform(0, policy.backoff * 2 ** (attempt - 1))
+                    await asyncio.sleep(min(backoff, max(0.0, deadline - loop.time())))
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                if slot_used:
+                    await model_rate_limiter.acquire()
+                slot_used = True
+                try:
+                    first, rest = await self._first_response(
+                        model, request, stream, min(policy.attempt_timeout, remaining)
+                    )
+                except asyncio.TimeoutError as e:
+                    error = e
+                    self._event("timeout")
+                    continue
+                except Exception as e:
+                    if not _retryable(e):
+                        raise
+                    error = e
+                    self._event("error")
+                    logger.warning("%s: %s call failed: %s", self.agent_name, model.model, e)
+                    continue
+
+                degraded = None if is_primary else "fallback"
+                if degraded:
+                    self._event("fallback")
+                    logger.warning("%s: answered by fallback model %s", self.agent_name, model.model)
+                async for response in self._rest(first, rest, llm_request, deadline, degraded):
+                    yield response
+                return
+
+        body = last_good.get(last_good_key(self.agent_name, llm_request)) if policy.last_good else None
+        if body is not None:
+            self._event("last_good")
+            logger.warning("%s: no model answered (%s); serving the last good answer", self.agent_name, error)
+            yield _mark(LlmResponse.model_validate_json(body), "last_good")
+            return
+        self._event("unavailable")
+        raise ModelUnavailable(
+            f"{self.agent_name}: no model answered within {policy.deadline:g}s ({error!r})"
+        ) from error
+
+    async def _first_response(
+        self, model: BaseLlm, request: LlmRequest, stream: bool, timeout: float
+    ) -> tuple[LlmResponse, AsyncGenerator[LlmResponse, None]]:
+        """
+        First response of `model` and the generator for the rest, hedged with
+        a duplicate request once the attempt is slower than the agent's p95.
+        """
+        loop = asyncio.get_running_loop()
+        circuit = breaker(model.model)
+        key = (self.agent_name, model.model)
+
+        async def attempt():
+            started = loop.time()
+            responses = model.generate_content_async(request, stream=stream)
+            try:
+                first = await responses.__anext__()
+            except StopAsyncIteration:
+                circuit.record(False)
+                raise RuntimeError(f"{model.model} returned no response") from None
+            except asyncio.CancelledError:
+                # Abandoned (lost the race or timed out): still a latency sample,
+                # or the p95 would only ever see the fast calls.
+                latency_tracker.observe(key, loop.time() - started)
+                circuit.record(None)
+                await responses.aclose()
+                raise
+            except Exception as e:
+                circuit.record(False if _retryable(e) else None)
+                await responses.aclose()
+                raise
+            latency_tracker.observe(key, loop.time() - started)
+            circuit.record(True)
+            return first, responses
+
+        policy = self.policy
+        end = loop.time() + timeout
+        hedge_after = latency_tracker.quantile(key, policy.hedge_quantile, policy.hedge_min_samples)
+        hedge_at = None if hedge_after is None else loop.time() + max(hedge_after, policy.hedge_floor)
+        tasks = {asyncio.create_task(attempt())}
+        error: BaseException | None = None
+        try:
+            while True:
+                wait_until = end if hedge_at is None else min(end, hedge_at)
+                done, _ = await asyncio.wait(
+                    tasks, timeout=max(0.0, wait_until - loop.time()), return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    tasks.discard(task)
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+                if not tasks:
+                    raise error
+                if loop.time() >= end:
+                    raise asyncio.TimeoutError(f"{model.model} did not answer within {timeout:.2f}s")
+                if hedge_at is not None and loop.time() >= hedge_at:
+                    hedge_at = None
+                    if circuit.allow():
+                        self._event("hedge")
+                        await model_rate_limiter.acquire()
+                        tasks.add(asyncio.create_task(attempt()))
+        finally:
+            for task in tasks:
+                task.cancel()
+            for result in await asyncio.gather(*tasks, return_exceptions=True):
+                if isinstance(result, tuple):
+                    await result[1].aclose()
+
+    async def _rest(
+        self,
+        first: LlmResponse,
+        rest: AsyncGenerator[LlmResponse, None],
+        llm_request: LlmRequest,
+        deadline: float,
+        degraded: str | None,
+    ) -> AsyncGenerator[LlmResponse, None]:
+        """Yield the winning attempt's responses, remembering its final answer."""
+        loop = asyncio.get_running_loop()
+        response = first
+        try:
+            while True:
+                if not response.partial and not response.error_code and response.content is not None:
+                    self._remember(llm_request, response)
+                yield _mark(response, degraded)
+                try:
+                    response = await asyncio.wait_for(rest.__anext__(), max(0.0, deadline - loop.time()))
+                except StopAsyncIteration:
+                    return
+        finally:
+            await rest.aclose()
+
+    def _remember(self, llm_request: LlmRequest, response: LlmResponse) -> None:
+        if not self.policy.last_good:
+            return
+        stored = response.model_copy(deep=True)
+        for part in stored.content.parts or []:
+            if part.function_call is not None:
+                part.function_call.id = None  # ADK assigns fresh ids per call
+        last_good.put(last_good_key(self.agent_name, llm_request), stored.model_dump_json(exclude_none=True))
+
+
+def policy_model(agent_name: str) -> BaseLlm | str:
+    """The model for an agent: MODEL_PRIMARY under the agent's policy (or bare, with the policy off)."""
+    if not MODEL_POLICY_ENABLED:
+        return MODEL_PRIMARY
+    return PolicyLlm(model=MODEL_PRIMARY, agent_name=agent_name, policy=policy_for(agent_name))
@@ -1,23 +1,187 @@
 # src/agents/orchestrator.py
 
-from google.adk.agents import LlmAgent
+import asyncio
+
+from google.adk.agents import LlmAgent, SequentialAgent
 from google.adk.tools import AgentTool  # You can also add CodeExecutionTool if you want
 
 from .forecast_agent import build_forecast_agent
 from .staffing_agent import build_staffing_agent
 from .supply_agent import build_supply_agent
 from .advisory_agent import build_advisory_agent
+from .fan_out import FanOutAgent
+from .model_policy import policy_model
+from .prefetch import gather_snapshots, session
+from .report import (
+    REPORT_SECTIONS, ReportRendererAgent, parse_section, peak_day, render_when_complete, structured_complete,
+)
+from .token_budget import trim_memories
+from .callbacks import agent_callbacks, workflow_callbacks
 
-from src.memory.session_store import SessionStore
 from src.memory.memory_bank import MemoryBank
-from src.observability.logger import logger
+from src.config import BRANCH_TIMEOUT_SECONDS, OUTPUT_MODE
+from src.observability.logger import bind_run_id, current_run_id, logger, log_payload, unbind_run_id
+
+# Long-term memory; the per-run session store (pre-fetched snapshots) lives
+# in .prefetch.
+_memory_bank: MemoryBank | None = None
+
+
+def get_memory_bank() -> MemoryBank:
+    """Long-term memory, opened on first use rather than at import."""
+    global _memory_bank
+    if _memory_bank is None:
+        _memory_bank = MemoryBank()
+    return _memory_bank
+
+
+def set_memory_bank(bank: MemoryBank | None) -> None:
+    """Use `bank` as long-term memory (None: the default, reopened on next use)."""
+    global _memory_bank
+    _memory_bank = bank
+
+
+def __getattr__(name):
+    # Backwards compatible `from src.agents.orchestrator import memory_bank`.
+    if name == "memory_bank":
+        return get_memory_bank()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+async def prefetch_tool_context(callback_context) -> None:
+    """
+    Pre-fetch stage, run before the orchestrator's first model call: gathers
+    every tool snapshot concurrently and stores it under the run's namespace
+    in the session store, from which the specialists load it.
+    """
+    state = callback_context.state
+    snapshots = await gather_snapshots(
+        horizon_days=int(state.get("horizon_days") or 7),
+        lat=state.get("lat"),
+        lon=state.get("lon"),
+        start_date=state.get("start_date"),
+    )
+    for key, text in snapshots.items():
+        session.set(key, text)
+    return None
+
+
+# Memories fetched per run before trimming to MEMORY_TOKEN_BUDGET.
+MEMORY_CANDIDATES = 5
+
+
+async def recall_past_events(callback_context) -> None:
+    """Puts the most relevant long-term memories, trimmed to the token budget, in state["past_events"]."""
+    content = callback_context.user_content
+    query = " ".join(p.text for p in (content.parts or []) if p.text) if content else ""
+    try:
+        memories = await asyncio.to_thread(get_memory_bank().retrieve_related, query, MEMORY_CANDIDATES)
+    except Exception as e:
+        logger.warning("Memory recall failed: %s", e)
+        memories = []
+    callback_context.state["past_events"] = "\n".join(f"- {line}" for line in trim_memories(memories)) or "none"
+    return None
+
+
+# invocation_id -> token of the run id bound by bind_run()
+_bound_runs: dict[str, object] = {}
+
+
+def bind_run(callback_context) -> None:
+    """
+    before_agent callback of the root: an invocation started outside
+    run_context() (`adk run` / `adk web`) gets its own run id, so its logs,
+    session state and token usage are kept apart from other runs.
+    """
+    if current_run_id() == "-":
+        _bound_runs[callback_context.invocation_id] = bind_run_id(callback_context.invocation_id[-12:])
+    return None
+
+
+def release_run(callback_context) -> None:
+    """after_agent callback of the root: drops the run's session state and unbinds its run id."""
+    session.clear()
+    token = _bound_runs.pop(callback_context.invocation_id, None)
+    if token is not None:
+        unbind_run_id(token)
+    return None
+
+
+def _as_list(callback) -> list:
+    return list(callback) if isinstance(callback, list) else [callback]
+
 
-# Session + long-term memory instances (shared for orchestrations)
-session = SessionStore()
-memory_bank = MemoryBank()
+def _with_run_scope(callbacks: dict) -> dict:
+    callbacks["before_agent_callback"] = [bind_run, *_as_list(callbacks["before_agent_callback"])]
+    callbacks["after_agent_callback"] = [*_as_list(callbacks["after_agent_callback"]), release_run]
+    return callbacks
 
 
-def build_orchestrator_agent() -> LlmAgent:
+def reset_sections(callback_context) -> None:
+    """
+    before_agent callback of the root: drops the previous turn's specialist
+    outputs, so a follow-up in the same session is planned afresh instead of
+    being answered (and remembered) from the last turn's report.
+    """
+    state = callback_context.state
+    for key, _ in REPORT_SECTIONS:
+        if state.get(key) is not None:
+            state[key] = None
+    return None
+
+
+def _with_prefetch(callbacks: dict) -> dict:
+    callbacks["before_agent_callback"] = [
+        callbacks["before_agent_callback"],
+        reset_sections,
+        prefetch_tool_context,
+        recall_past_events,
+    ]
+    return callbacks
+
+
+async def remember_structured_outcome(callback_context) -> None:
+    """after_agent callback (structured mode): stores the run's outcome in long-term memory."""
+    state = callback_context.state
+    if structured_complete(state):
+        await asyncio.to_thread(
+            remember_outcome, state["forecast"], state["staffing_plan"], state["supply_plan"], state["advisories"]
+        )
+    return None
+
+
+def _with_memory(callbacks: dict) -> dict:
+    callbacks["after_agent_callback"] = [callbacks["after_agent_callback"], remember_structured_outcome]
+    return callbacks
+
+
+REPORT_FORMAT = """
+The report must include:
+    - An executive summary (2-4 sentences) for leadership.
+    - Labeled sections with clear headings: "Surge Forecast", "Staffing Plan", "Supply Plan", "Patient Advisories".
+    - Explicitly listed assumptions and any key risk notes.
+    - Concrete action items and timelines where applicable.
+
+Formatting rules:
+- Use plain text only (no raw JSON). Use headings, short paragraphs, and bullets.
+- Keep the executive summary concise and place it at the top.
+- Under each labeled section, include succinct bullet points and short rationale.
+""".strip()
+
+
+def _specialists(structured: bool) -> list[LlmAgent]:
+    """The four specialists, each writing its output to the section's state key."""
+    agents = [
+        build_forecast_agent(structured),
+        build_staffing_agent(structured),
+        build_supply_agent(structured),
+        build_advisory_agent(structured),
+    ]
+    for agent, key in zip(agents, ("forecast", "staffing_plan", "supply_plan", "advisories")):
+        agent.output_key = key
+    return agents
+
+
+def build_orchestrator_agent(output_mode: str = OUTPUT_MODE, remember: bool = True) -> LlmAgent:
     """
     Top-level orchestrator agent.
 
@@ -27,55 +191,64 @@ def build_orchestrator_agent() -> LlmAgent:
       - Plans supplies
       - Generates patient advisories
 
-    It delegates to specialist agents via AgentTool.
+    It delegates to specialist agents via AgentTool. With
+    output_mode="structured" the specialists return validated JSON, the
+    report is rendered from it instead of by a final model turn, and (with
+    `remember`) the outcome is stored in long-term memory.
     """
-    forecast_agent = build_forecast_agent()
-    staffing_agent = build_staffing_agent()
-    supply_agent = build_supply_agent()
-    advisory_agent = build_advisory_agent()
+    structured = output_mode == "structured"
+    forecast_agent, staffing_agent, supply_agent, advisory_agent = _specialists(structured)
+    kind = "JSON" if structured else "text"
+    if structured:
+        synthesis = (
+            "5. Once all four have answered, the report is rendered from their outputs automatically;\n"
+            "    do not write it yourself."
+        )
+    else:
+        synthesis = f"5. Synthesize everything into a single, plain-text report.\n{REPORT_FORMAT}"
 
-    logger.info("Building hospital orchestrator agent")
+    callbacks = _with_prefetch(agent_callbacks())
+    if structured:
+        callbacks["before_model_callback"] = [render_when_complete, *callbacks["before_model_callback"]]
+        if remember:
+            callbacks = _with_memory(callbacks)
+    callbacks = _with_run_scope(callbacks)
+
+    logger.info("Building hospital orchestrator agent (%s output)", output_mode)
 
     orchestrator = LlmAgent(
-        model="gemini-2.0-flash",
+        model=policy_model("hospital_orchestrator"),
         name="hospital_orchestrator",
         description=(
             "Coordinates forecasting, staffing, supply, and advisories "
             "for managing unpredictable hospital surges."
         ),
-        instruction="""
+        instruction=f"""
 You are the Chief Operations Orchestrator for a large urban hospital.
 
 Your mission:
 Given a request like "plan for the coming week" plus optional context
 (e.g. festival schedule, pollution alerts, early epidemic signals), you must:
 
-1. Ask the forecast_agent (via tools) to produce a human-readable surge forecast.
-2. Feed that forecast to staffing_agent to get a staffing plan (text).
-3. Feed the same forecast to supply_agent to get a supply plan (text).
+1. Ask the forecast_agent (via tools) to produce a surge forecast.
+2. Feed that forecast to staffing_agent to get a staffing plan ({kind}).
+3. Feed the same forecast to supply_agent to get a supply plan ({kind}).
 4. Feed the forecast (and optionally the staffing/supply outputs) to
-    advisory_agent to generate patient advisories (text).
-5. Synthesize everything into a single, plain-text report. The report must include:
-    - An executive summary (2-4 sentences) for leadership.
-    - Labeled sections with clear headings: "Surge Forecast", "Staffing Plan", "Supply Plan", "Patient Advisories".
-    - Explicitly listed assumptions and any key risk notes.
-    - Concrete action items and timelines where applicable.
-
-Formatting rules:
-- Use plain text only (no raw JSON). Use headings, short paragraphs, and bullets.
-- Keep the executive summary concise and place it at the top.
-- Under each labeled section, include succinct bullet points and short rationale.
+    advisory_agent to generate patient advisories ({kind}).
+{synthesis}
 
 LONG-TERM MEMORY
-If relevant past surge events exist in long-term memory, incorporate them as contextual notes
-but do not print raw memory JSON; instead summarize notable lessons learned.
+Relevant past surge events:
+{{past_events?}}
+If any are relevant, incorporate them as contextual notes; summarize notable lessons learned
+rather than repeating them verbatim.
 
 TOOLS
 You have access to these tools (as AgentTools):
-- forecast_agent: produces surge forecasts (text)
-- staffing_agent: produces staffing plans (text)
-- supply_agent: produces supply / stock plans (text)
-- advisory_agent: produces patient advisory messages (text)
+- forecast_agent: produces surge forecasts ({kind})
+- staffing_agent: produces staffing plans ({kind})
+- supply_agent: produces supply / stock plans ({kind})
+- advisory_agent: produces patient advisory messages ({kind})
 
 Always call these tools rather than inventing deeply detailed plans yourself.
           """.strip(),
@@ -86,34 +259,165 @@ Always call these tools rather than inventing deeply detailed plans yourself.
             AgentTool(agent=advisory_agent),
             # You can add CodeExecutionTool() here later if needed.
         ],
+        **callbacks,
     )
 
     return orchestrator
 
 
+def build_orchestrator_workflow(
+    branch_timeout: float = BRANCH_TIMEOUT_SECONDS,
+    output_mode: str = OUTPUT_MODE,
+    remember: bool = True,
+) -> SequentialAgent:
+    """
+    Workflow variant of the orchestrator with a fixed execution plan:
+
+      1. forecast_agent runs first (output stored in state["forecast"]).
+      2. staffing_agent, supply_agent and advisory_agent only depend on the
+         forecast, so they run concurrently, each with its own timeout.
+         A branch that fails or times out leaves an "[unavailable: ...]"
+         note in its state key instead of aborting the run.
+      3. A synthesis agent merges the four outputs into the final report.
+         With output_mode="structured" the specialists return validated
+         JSON and the report is rendered from it without a model call.
+
+    End-to-end latency is forecast + slowest specialist + synthesis instead
+    of the sum of every LLM chain.
+    """
+    structured = output_mode == "structured"
+    forecast_agent, staffing_agent, supply_agent, advisory_agent = _specialists(structured)
+
+    logger.info("Building hospital orchestrator workflow (%s output)", output_mode)
+
+    specialists = FanOutAgent(
+        name="specialist_fan_out",
+        description="Runs staffing, supply and advisory planning concurrently.",
+        sub_agents=[staffing_agent, supply_agent, advisory_agent],
+        branch_timeout=branch_timeout,
+        **workflow_callbacks(),
+    )
+
+    if structured:
+        synthesis_agent = ReportRendererAgent(
+            name="report_synthesizer",
+            description="Renders the leadership report from the specialists' structured outputs.",
+            **workflow_callbacks(),
+        )
+    else:
+        synthesis_agent = _build_synthesis_agent()
+
+    callbacks = _with_prefetch(workflow_callbacks())
+    if structured and remember:
+        callbacks = _with_memory(callbacks)
+    callbacks = _with_run_scope(callbacks)
+    return SequentialAgent(
+        name="hospital_orchestrator",
+        description=(
+            "Coordinates forecasting, staffing, supply, and advisories "
+            "for managing unpredictable hospital surges."
+        ),
+        sub_agents=[forecast_agent, specialists, synthesis_agent],
+        **callbacks,
+    )
+
+
+def _build_synthesis_agent() -> LlmAgent:
+    return LlmAgent(
+        model=policy_model("report_synthesizer"),
+        name="report_synthesizer",
+        description="Merges specialist outputs into one leadership report.",
+        include_contents="none",
+        instruction=f"""
+You are the Chief Operations Orchestrator for a large urban hospital.
+Your specialists have already produced their outputs; do not invent new plans.
+
+Surge forecast:
+{{forecast}}
+
+Staffing plan:
+{{staffing_plan}}
+
+Supply plan:
+{{supply_plan}}
+
+Patient advisories:
+{{advisories}}
+
+Relevant past surge events (summarize lessons learned, if any apply):
+{{past_events?}}
+
+Synthesize these into a single, plain-text report.
+If a section is marked "[unavailable: ...]", say so in that section and list it as a risk.
+{REPORT_FORMAT}
+        """.strip(),
+        **agent_callbacks(),
+    )
+
+
 def remember_outcome(forecast, staffing, supply, advisories) -> None:
     """
     Store the outcome of a completed orchestration cycle into long-term memory.
 
-    This is intended to be called by the runtime AFTER the orchestrator and
-    all specialist agents have produced their outputs.
+    Called after every specialist has produced its output (automatically in
+    structured mode). Structured outputs (dicts or JSON, see
+    src/agents/schemas.py) give the memory its summary, tags and outcomes;
+    prose outputs are stored as they are.
     """
     try:
-        notes = forecast.get("notes", "") if isinstance(forecast, dict) else ""
+        f = parse_section("forecast", forecast)
+        staff = parse_section("staffing_plan", staffing)
+        sup = parse_section("supply_plan", supply)
+        adv = parse_section("advisories", advisories)
+
         tags = []
-        if "festival" in notes.lower():
-            tags.append("festival")
-        if not tags:
-            tags.append("general")
+        if f is not None and f.daily_forecast:
+            peak = peak_day(f)
+            summary = (
+                f"{f.horizon_days}-day surge plan from {f.daily_forecast[0].date}: peak ~{peak.expected_admissions} "
+                f"admissions on {peak.date} ({peak.surge_risk} risk). {f.notes}"
+            ).strip()
+            for day in f.daily_forecast:
+                for driver in day.main_drivers:
+                    tags += [part.strip().lower() for part in driver.split(":") if part.strip()]
+                if day.surge_risk in ("high", "critical"):
+                    tags.append(f"{day.surge_risk}-risk")
+        else:
+            summary = forecast if isinstance(forecast, str) else ""
+            if "festival" in summary.lower():
+                tags.append("festival")
+        tags = [tag for tag in dict.fromkeys(tags) if tag != "baseline"] or ["general"]
+
+        if staff is not None and staff.per_day_plan:
+            staffing_outcome = {
+                "peak_additional_doctors": max(d.recommended_additional_doctors for d in staff.per_day_plan),
+                "peak_additional_nurses": max(d.recommended_additional_nurses for d in staff.per_day_plan),
+                "peak_support_staff": max(d.recommended_support_staff for d in staff.per_day_plan),
+                "escalation_plan": staff.escalation_plan,
+            }
+        else:
+            staffing_outcome = staffing
+        if sup is not None:
+            supply_outcome = {
+                "orders": ", ".join(
+                    f"{i.category} {i.recommended_order_quantity} ({i.priority})"
+                    for i in sup.per_category_plan if i.recommended_order_quantity
+                ),
+                "ordering_timeline": sup.ordering_timeline,
+            }
+        else:
+            supply_outcome = supply
 
         entry = {
-            "event_summary": notes,
-            "staffing_outcome": staffing,
-            "supply_outcome": supply,
+            "event_summary": summary,
+            "staffing_outcome": staffing_outcome,
+            "supply_outcome": supply_outcome,
             "success_indicators": "pending - evaluation needed",
             "tags": tags,
         }
-        memory_bank.add_memory(entry)
-        logger.info("Saved outcome to memory_bank: %s", entry)
+        if adv is not None:
+            entry["advisory_channels"] = sorted({a.channel for a in adv.patient_advisories})
+        get_memory_bank().add_memory(entry)
+        log_payload("Saved outcome to memory_bank", entry)
     except Exception as e:
         logger.error("Failed to save outcome to memory_bank: %s", e)
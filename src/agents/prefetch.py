@@ -0,0 +1,165 @@
+# src/agents/prefetch.py
+"""
+Pre-fetch stage: every data tool's snapshot, gathered once per run.
+
+The specialists used to spend a model → tool → model round trip each just to
+read the roster, inventory or admissions history. Those reads (and the
+numeric baselines derived from them) do not depend on anything the LLM says,
+so they are gathered concurrently before the first model call, rendered as
+compact text and kept in the run's SessionStore namespace. Each specialist's
+before_agent callback copies them into its state, where its instruction
+picks them up through optional `{key?}` placeholders. The tools stay
+attached as a fallback (e.g. for a different horizon or location).
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Callable
+
+from src.memory.session_store import SessionStore
+from src.observability.logger import logger
+from src.observability.metrics import metrics
+from src.tools.hospital_data_adk_tool import hospital_admissions_func
+from src.tools.inventory_tool import inventory_func
+from src.tools.roster_tool import staff_roster_func
+from src.tools.staffing_calculator_tool import staffing_plan_func
+from src.tools.supply_planner_tool import supply_plan_func
+from src.tools.surge_forecast_tool import surge_baseline_func
+
+# state key -> tool the specialist should call if the snapshot is missing
+SNAPSHOT_TOOLS = {
+    "roster_snapshot": "staff_roster_func",
+    "inventory_snapshot": "inventory_func",
+    "admissions_snapshot": "hospital_admissions_func",
+    "surge_baseline_snapshot": "surge_baseline_func",
+    "staffing_baseline_snapshot": "staffing_plan_func",
+    "supply_baseline_snapshot": "supply_plan_func",
+}
+ADMISSIONS_DAYS = 14
+
+# Pre-fetched snapshots, one namespace per run id; the root orchestrator
+# clears its run's namespace when it finishes.
+session = SessionStore()
+
+
+def _pairs(values: dict[str, Any]) -> str:
+    return ", ".join(f"{k}={v}" for k, v in values.items())
+
+
+def format_admissions(result: dict[str, Any]) -> str:
+    rows = sorted(result["admissions"], key=lambda r: r["date"])
+    if not rows:
+        return "no admissions history"
+    stats = result["rolling_stats"]
+    return (
+        f"{rows[0]['date']}..{rows[-1]['date']} (oldest→newest) "
+        f"total: {','.join(str(r['total_admissions']) for r in rows)}; "
+        f"icu: {','.join(str(r['icu_admissions']) for r in rows)}; "
+        f"mean 7d/28d: {stats['mean_7d']:g}/{stats['mean_28d']:g}, ICU ratio 28d: {stats['icu_ratio_28d']:.1%}"
+    )
+
+
+def format_baseline(forecast: dict[str, Any]) -> str:
+    days = [
+        f"{d['date']} {d['surge_risk']} {d['expected_admissions']} (icu {d['expected_icu_admissions']}) "
+        f"[{', '.join(d['main_drivers'])}]"
+        for d in forecast["daily_forecast"]
+    ]
+    return forecast["notes"] + "\n" + "\n".join(days)
+
+
+def format_staffing(plan: dict[str, Any]) -> str:
+    days = [
+        f"{d['date']} {d['risk_level']}: +{d['recommended_additional_doctors']} doctors, "
+        f"+{d['recommended_additional_nurses']} nurses, +{d['recommended_support_staff']} support"
+        for d in plan["per_day_plan"]
+    ]
+    return "\n".join(days + [f"escalation: {plan['escalation_plan']}"])
+
+
+def format_supply(plan: dict[str, Any]) -> str:
+    items = [
+        f"{p['item']}: {p['current_stock_level']}, order {p['recommended_order_quantity']}"
+        + (f" by {p['order_by']}" if p.get("order_by") else "")
+        + f" ({p['priority']})"
+        for p in plan["per_category_plan"]
+    ]
+    return "\n".join(items + [f"timeline: {plan['ordering_timeline']}"])
+
+
+def load_snapshots(callback_context) -> None:
+    """before_agent callback of the specialists: puts the run's pre-fetched snapshots in state."""
+    state = callback_context.state
+    for key, text in session.items().items():
+        if key in SNAPSHOT_TOOLS and state.get(key) != text:
+            state[key] = text
+    return None
+
+
+async def _snapshot(key: str, fetch: Callable, render: Callable[[Any], str]) -> tuple[str, str]:
+    try:
+        result = fetch()
+        if asyncio.iscoroutine(result):
+            result = await result
+        return key, render(result)
+    except Exception as e:
+        logger.warning("Pre-fetch of %s failed: %s", key, e)
+        return key, f"unavailable ({type(e).__name__}); call {SNAPSHOT_TOOLS[key]} instead"
+
+
+def baseline_load(forecast: dict[str, Any]) -> dict[str, Any]:
+    """staffing_plan_func / supply_plan_func arguments for the surge baseline's per-day load."""
+    days = forecast["daily_forecast"]
+    return {
+        "expected_admissions": [d["expected_admissions"] for d in days],
+        "expected_icu_admissions": [d["expected_icu_admissions"] for d in days],
+        "start_date": days[0]["date"],
+        "horizon_days": len(days),
+    }
+
+
+async def gather_snapshots(
+    horizon_days: int = 7,
+    lat: float | None = None,
+    lon: float | None = None,
+    start_date: str | None = None,
+) -> dict[str, str]:
+    """All tool snapshots, fetched concurrently and rendered as compact text."""
+
+    def threaded(fn, *args, **kwargs):
+        return lambda: asyncio.to_thread(fn, *args, **kwargs)
+
+    async def plans() -> list[tuple[str, str]]:
+        # The staffing and supply baselines are computed from the surge
+        # baseline's numbers (PM2.5 included when lat/lon are given), so a
+        # forecast that keeps the baseline matches them and the specialists
+        # can use them as they are.
+        load: dict[str, Any] = {"start_date": start_date, "horizon_days": horizon_days}
+        risk_levels = None
+
+        async def surge():
+            nonlocal load, risk_levels
+            forecast = await surge_baseline_func(horizon_days=horizon_days, lat=lat, lon=lon, start_date=start_date)
+            if forecast["daily_forecast"]:
+                load = baseline_load(forecast)
+                risk_levels = [d["surge_risk"] for d in forecast["daily_forecast"]]
+            return forecast
+
+        surge_snapshot = await _snapshot("surge_baseline_snapshot", surge, format_baseline)
+        return [surge_snapshot, *await asyncio.gather(
+            _snapshot(
+                "staffing_baseline_snapshot",
+                threaded(staffing_plan_func, risk_levels=risk_levels, **load),
+                format_staffing,
+            ),
+            _snapshot("supply_baseline_snapshot", threaded(supply_plan_func, **load), format_supply),
+        )]
+
+    with metrics.timer("prefetch_duration_seconds"):
+        *reads, baselines = await asyncio.gather(
+            _snapshot("roster_snapshot", threaded(staff_roster_func), _pairs),
+            _snapshot("inventory_snapshot", threaded(inventory_func), _pairs),
+            _snapshot("admissions_snapshot", threaded(hospital_admissions_func, ADMISSIONS_DAYS), format_admissions),
+            plans(),
+        )
+    return dict(reads + baselines)
@@ -0,0 +1,65 @@
+# src/agents/rate_limit.py
+"""
+Token-bucket limiter for Gemini requests.
+
+Wired in as a before-model callback on every LLM agent, so all model calls
+in the process (every hospital in a batch, every specialist branch) share
+one QPS budget. Cache hits short-circuit before it and cost nothing.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+
+from src.config import GEMINI_QPS
+from src.observability.metrics import metrics
+
+
+class RateLimiter:
+    """
+    `rate` requests per second with bursts of up to `burst`. rate <= 0
+    disables limiting.
+
+    Callers reserve a slot under a plain lock (the bucket may go into debt)
+    and then sleep until their slot, so waiters are served in arrival order
+    and the limiter works across event loops and threads.
+    """
+
+    def __init__(self, rate: float = 0.0, burst: int | None = None):
+        self._lock = threading.Lock()
+        self.configure(rate, burst)
+
+    def configure(self, rate: float, burst: int | None = None) -> None:
+        with self._lock:
+            self.rate = rate
+            self.burst = max(1, burst if burst is not None else round(rate) or 1)
+            self._tokens = float(self.burst)
+            self._updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """Take one token; returns how long the caller must wait for it."""
+        with self._lock:
+            if self.rate <= 0:
+                return 0.0
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            metrics.histogram("rate_limit_wait_seconds", "Time model calls waited for a QPS slot").observe(delay)
+            await asyncio.sleep(delay)
+
+    async def before_model(self, callback_context: CallbackContext, llm_request: LlmRequest) -> None:
+        await self.acquire()
+        return None
+
+
+model_rate_limiter = RateLimiter(GEMINI_QPS)
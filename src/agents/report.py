@@ -0,0 +1,230 @@
+# src/agents/report.py
+"""
+Deterministic plain-text report from the specialists' structured outputs.
+
+In structured mode (OUTPUT_MODE=structured) the specialists return
+schema-validated JSON (src/agents/schemas.py) and the leadership report is
+rendered here instead of by one more LLM pass over all four outputs:
+
+  - workflow mode: ReportRendererAgent takes the synthesizer's place;
+  - agent mode: `render_when_complete` runs before each orchestrator model
+    call and answers with the rendered report as soon as all four outputs
+    are in session state.
+
+Sections keep the titles and the per-day line format of the prose reports
+("- 2025-12-01: high risk, ~245 admissions, drivers: festival"), so the
+streaming printer and the handoff compression treat both alike.
+"""
+from __future__ import annotations
+
+from typing import Any, AsyncGenerator
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.models import LlmResponse
+from google.genai import types
+from pydantic import BaseModel, ValidationError
+
+from .schemas import SECTION_MODELS, AdvisoryPlan, StaffingPlan, SupplyPlan, SurgeForecast
+
+REPORT_SECTIONS = (
+    ("forecast", "Surge Forecast"),
+    ("staffing_plan", "Staffing Plan"),
+    ("supply_plan", "Supply Plan"),
+    ("advisories", "Patient Advisories"),
+)
+_RISK_ORDER = {"low": 0, "medium": 1, "high": 2, "critical": 3}
+CHANNEL_LABELS = {"sms": "SMS", "email": "Email", "website_banner": "Website", "social_media": "Social"}
+
+
+def parse_section(key: str, value: Any) -> BaseModel | None:
+    """The typed model for a section's state value (dict or JSON text), or None."""
+    model = SECTION_MODELS[key]
+    try:
+        if isinstance(value, model):
+            return value
+        if isinstance(value, dict):
+            return model.model_validate(value)
+        if isinstance(value, str) and value.lstrip().startswith("{"):
+            return model.model_validate_json(value)
+    except ValidationError:
+        pass
+    return None
+
+
+def forecast_lines(forecast: SurgeForecast) -> list[str]:
+    lines = []
+    for day in forecast.daily_forecast:
+        icu = f" (ICU ~{day.expected_icu_admissions})" if day.expected_icu_admissions is not None else ""
+        drivers = f", drivers: {', '.join(day.main_drivers)}" if day.main_drivers else ""
+        lines.append(f"- {day.date}: {day.surge_risk} risk, ~{day.expected_admissions} admissions{icu}{drivers}")
+    return lines
+
+
+def render_forecast(forecast: SurgeForecast) -> str:
+    return "\n".join(([forecast.notes] if forecast.notes else []) + forecast_lines(forecast))
+
+
+def render_staffing(plan: StaffingPlan) -> str:
+    lines = [
+        f"- {day.date} ({day.risk_level}): +{day.recommended_additional_doctors} doctors, "
+        f"+{day.recommended_additional_nurses} nurses, +{day.recommended_support_staff} support"
+        + (f"; {day.notes}" if day.notes else "")
+        for day in plan.per_day_plan
+    ]
+    if plan.escalation_plan:
+        lines.append(f"Escalation plan: {plan.escalation_plan}")
+    return "\n".join(lines)
+
+
+def render_supply(plan: SupplyPlan) -> str:
+    lines = []
+    for item in sorted(plan.per_category_plan, key=lambda i: -_RISK_ORDER[i.priority]):
+        stock = f"stock {item.current_stock_level}, " if item.current_stock_level else ""
+        lines.append(
+            f"- {item.category} [{item.priority}]: order {item.recommended_order_quantity} "
+            f"({stock}{item.recommended_buffer_days} days buffer)" + (f"; {item.notes}" if item.notes else "")
+        )
+    if plan.ordering_timeline:
+        lines.append(f"Ordering timeline: {plan.ordering_timeline}")
+    return "\n".join(lines)
+
+
+def render_advisories(plan: AdvisoryPlan) -> str:
+    lines = [plan.overall_risk_summary] if plan.overall_risk_summary else []
+    for advisory in sorted(plan.patient_advisories, key=lambda a: -_RISK_ORDER[a.priority]):
+        channel = CHANNEL_LABELS.get(advisory.channel, advisory.channel)
+        lines.append(f"- [{channel} → {advisory.target_group}, {advisory.priority}] {advisory.message}")
+    if plan.internal_notes:
+        lines.append(f"Internal notes (leadership only): {plan.internal_notes}")
+    return "\n".join(lines)
+
+
+RENDERERS = {
+    "forecast": render_forecast,
+    "staffing_plan": render_staffing,
+    "supply_plan": render_supply,
+    "advisories": render_advisories,
+}
+
+
+def render_section(key: str, value: Any) -> str:
+    """One section's body: rendered when it parses, otherwise the value as text."""
+    parsed = parse_section(key, value)
+    if parsed is not None:
+        return RENDERERS[key](parsed)
+    return str(value) if value not in (None, "") else "[unavailable: no output]"
+
+
+def peak_day(forecast: SurgeForecast):
+    return max(forecast.daily_forecast, key=lambda d: (d.expected_admissions, _RISK_ORDER[d.surge_risk]))
+
+
+def _executive_summary(sections: dict[str, BaseModel | None]) -> list[str]:
+    forecast, staffing, supply, advisories = (sections[key] for key, _ in REPORT_SECTIONS)
+    lines = []
+    if forecast is not None and forecast.daily_forecast:
+        days = forecast.daily_forecast
+        peak = peak_day(forecast)
+        elevated = [d for d in days if _RISK_ORDER[d.surge_risk] >= _RISK_ORDER["high"]]
+        drivers = list(dict.fromkeys(x for d in elevated or days for x in d.main_drivers if x != "baseline"))
+        lines.append(
+            f"Over {days[0].date}..{days[-1].date}, admissions peak at ~{peak.expected_admissions} on "
+            f"{peak.date} ({peak.surge_risk} risk); {len(elevated)} of {len(days)} days are high or critical"
+            + (f", driven by {', '.join(drivers[:3])}." if drivers else ".")
+        )
+    if staffing is not None and staffing.per_day_plan:
+        busiest = max(
+            staffing.per_day_plan,
+            key=lambda d: d.recommended_additional_doctors + d.recommended_additional_nurses + d.recommended_support_staff,
+        )
+        lines.append(
+            f"Peak extra staffing: +{busiest.recommended_additional_doctors} doctors, "
+            f"+{busiest.recommended_additional_nurses} nurses, +{busiest.recommended_support_staff} support "
+            f"on {busiest.date}."
+        )
+    if supply is not None:
+        urgent = [i for i in supply.per_category_plan if i.priority in ("high", "critical") and i.recommended_order_quantity]
+        if urgent:
+            lines.append(
+                "Priority orders: " + ", ".join(f"{i.category} ({i.recommended_order_quantity})" for i in urgent) + "."
+            )
+    if advisories is not None:
+        channels = sorted({CHANNEL_LABELS.get(a.channel, a.channel) for a in advisories.patient_advisories})
+        lines.append(f"{len(advisories.patient_advisories)} patient advisories ready ({', '.join(channels)}).")
+    return lines
+
+
+def render_report(state: dict[str, Any]) -> str:
+    """The leadership report from session state (structured or prose section values)."""
+    sections = {key: parse_section(key, state.get(key)) for key, _ in REPORT_SECTIONS}
+    out = ["Executive Summary"] + (_executive_summary(sections) or ["No specialist output was available."])
+
+    for key, title in REPORT_SECTIONS:
+        out += ["", title, render_section(key, state.get(key))]
+
+    staffing, supply = sections["staffing_plan"], sections["supply_plan"]
+    assumptions = list(dict.fromkeys(
+        (staffing.assumptions if staffing else []) + (supply.assumptions if supply else [])
+    ))
+    if assumptions:
+        out += ["", "Assumptions"] + [f"- {a}" for a in assumptions]
+
+    risks = [
+        f"- {title}: {state.get(key) or 'no output'}"
+        for key, title in REPORT_SECTIONS
+        if sections[key] is None and isinstance(state.get(key), str) and state[key].startswith("[unavailable")
+    ]
+    forecast = sections["forecast"]
+    if forecast is not None:
+        risks += [f"- {d.date}: {d.surge_risk} surge risk" for d in forecast.daily_forecast if d.surge_risk == "critical"]
+    if risks:
+        out += ["", "Key Risks"] + risks
+
+    actions = []
+    if staffing is not None and staffing.escalation_plan:
+        actions.append(f"- Staffing: {staffing.escalation_plan}")
+    if supply is not None and supply.ordering_timeline:
+        actions.append(f"- Supplies: {supply.ordering_timeline}")
+    advisories = sections["advisories"]
+    if advisories is not None and any(a.priority == "high" for a in advisories.patient_advisories):
+        actions.append("- Communications: send the high-priority advisories today.")
+    if actions:
+        out += ["", "Action Items"] + actions
+
+    past = state.get("past_events")
+    if past and past != "none":
+        out += ["", "Past Events", past]
+    return "\n".join(out)
+
+
+def structured_complete(state) -> bool:
+    """All four specialist outputs are in state and validate."""
+    return all(parse_section(key, state.get(key)) is not None for key, _ in REPORT_SECTIONS)
+
+
+def render_when_complete(callback_context, llm_request) -> LlmResponse | None:
+    """
+    before_model callback for the agent-mode orchestrator: once every
+    specialist has answered, the report is rendered here and the model's
+    synthesis turn is skipped.
+    """
+    state = callback_context.state
+    if not structured_complete(state):
+        return None
+    report = render_report(state.to_dict())
+    return LlmResponse(content=types.Content(role="model", parts=[types.Part(text=report)]), turn_complete=True)
+
+
+class ReportRendererAgent(BaseAgent):
+    """Workflow step that renders the report from state; no model call."""
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        report = render_report(ctx.session.state)
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=report)]),
+        )
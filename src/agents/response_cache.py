@@ -0,0 +1,226 @@
+# src/agents/response_cache.py
+"""
+Content-addressed cache for specialist model calls.
+
+Wired into the specialist agents as before/after model callbacks. The key is a
+SHA-256 over:
+  - the model name, system instruction and tool names (model/instruction version),
+  - the normalized conversation contents (whitespace-collapsed text, function
+    calls/responses without their random ids),
+  - the paths and snapshot versions of the CSV files the tools read (so
+    each hospital data directory gets its own entries).
+
+A hit returns the stored LlmResponse and the LLM call is skipped, so
+re-planning with an unchanged forecast, roster and inventory costs no tokens.
+Entries expire after a TTL, live in an in-memory LRU, and are persisted to a
+SQLite file so they survive restarts.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+
+from src.config import RESPONSE_CACHE_ENABLED, RESPONSE_CACHE_PATH, RESPONSE_CACHE_TTL_SECONDS
+from src.observability.logger import logger
+from src.observability.metrics import metrics
+from src.tools.inventory_tool import INVENTORY_CSV
+from src.tools.admissions_store import ADMISSIONS_CSV
+from src.tools.data_paths import data_path
+from src.tools.roster_tool import ROSTER_CSV
+from src.tools.supply_planner_tool import SUPPLY_PARAMS_CSV
+from src.tools.snapshot_cache import snapshot_cache
+
+# Bump when the key layout or stored format changes.
+CACHE_FORMAT_VERSION = 1
+SNAPSHOT_FILES = (ROSTER_CSV, INVENTORY_CSV, ADMISSIONS_CSV, SUPPLY_PARAMS_CSV)
+
+
+def _normalize_contents(contents) -> list[Any]:
+    normalized = []
+    for content in contents:
+        parts = []
+        for part in content.parts or []:
+            if part.text is not None:
+                if part.thought:
+                    continue
+                parts.append({"text": " ".join(part.text.split())})
+            elif part.function_call is not None:
+                parts.append({"call": part.function_call.name, "args": part.function_call.args or {}})
+            elif part.function_response is not None:
+                parts.append({"result": part.function_response.name, "response": part.function_response.response or {}})
+        normalized.append([content.role, parts])
+    return normalized
+
+
+def snapshot_versions() -> dict[str, str]:
+    versions = {}
+    for path in map(data_path, SNAPSHOT_FILES):
+        try:
+            versions[path] = snapshot_cache.version(path)
+        except OSError:
+            versions[path] = "missing"
+    return versions
+
+
+def request_key(llm_request: LlmRequest) -> str:
+    config = llm_request.config
+    payload = {
+        "v": CACHE_FORMAT_VERSION,
+        "model": llm_request.model,
+        "instruction": str(config.system_instruction) if config else None,
+        "tools": sorted(llm_request.tools_dict),
+        "contents": _normalize_contents(llm_request.contents),
+        "snapshots": snapshot_versions(),
+    }
+    blob = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+class ResponseCache:
+    """In-memory LRU with TTL, backed by an optional SQLite file."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = RESPONSE_CACHE_TTL_SECONDS,
+        max_entries: int = 512,
+        max_disk_entries: int = 5000,
+        path: str | None = RESPONSE_CACHE_PATH,
+        enabled: bool = RESPONSE_CACHE_ENABLED,
+    ):
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._memory: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        # Keys of misses awaiting their model response. Normally popped by
+        # after_model / on_model_error; the cap covers calls that never get
+        # either (e.g. a branch cancelled on timeout).
+        self._pending: OrderedDict[tuple[str, str], str] = OrderedDict()
+        self.max_pending = 1024
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+
+    # ---- storage -------------------------------------------------------
+
+    def _conn(self) -> sqlite3.Connection | None:
+        if self._db is None and self.path:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, created REAL NOT NULL, body TEXT NOT NULL)"
+            )
+        return self._db
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[0] <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    return entry[1]
+                del self._memory[key]
+            db = self._conn()
+            if db is None:
+                return None
+            row = db.execute("SELECT created, body FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[0] > self.ttl_seconds:
+                return None
+            self._remember(key, row[0], row[1])
+            return row[1]
+
+    def put(self, key: str, body: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, body)
+            db = self._conn()
+            if db is None:
+                return
+            db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?)", (key, now, body))
+            db.execute(
+                "DELETE FROM responses WHERE created < ? OR key NOT IN "
+                "(SELECT key FROM responses ORDER BY created DESC LIMIT ?)",
+                (now - self.ttl_seconds, self.max_disk_entries),
+            )
+
+    def _remember(self, key: str, created: float, body: str) -> None:
+        self._memory[key] = (created, body)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            db = self._conn()
+            if db is not None:
+                db.execute("DELETE FROM responses")
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._memory)}
+
+    # ---- ADK callbacks -------------------------------------------------
+
+    def before_model(self, callback_context: CallbackContext, llm_request: LlmRequest) -> LlmResponse | None:
+        if not self.enabled:
+            return None
+        key = request_key(llm_request)
+        body = self.get(key)
+        if body is not None:
+            with self._lock:
+                self.hits += 1
+            metrics.counter("response_cache_hits_total", "Model calls served from cache").inc(
+                agent=callback_context.agent_name
+            )
+            logger.info("Response cache hit for %s", callback_context.agent_name)
+            return LlmResponse.model_validate_json(body)
+        with self._lock:
+            self.misses += 1
+            self._pending[(callback_context.invocation_id, callback_context.agent_name)] = key
+            while len(self._pending) > self.max_pending:
+                self._pending.popitem(last=False)
+        return None
+
+    def _pop_pending(self, callback_context: CallbackContext) -> str | None:
+        with self._lock:
+            return self._pending.pop((callback_context.invocation_id, callback_context.agent_name), None)
+
+    def after_model(self, callback_context: CallbackContext, llm_response: LlmResponse) -> LlmResponse | None:
+        if llm_response.partial:
+            return None
+        key = self._pop_pending(callback_context)
+        if llm_response.error_code or llm_response.content is None:
+            return None
+        if key is None or (llm_response.custom_metadata or {}).get("degraded"):
+            return None  # fallback / last-good answers (src/agents/model_policy.py) are not cached
+        stored = llm_response.model_copy(deep=True)
+        for part in stored.content.parts or []:
+            if part.function_call is not None:
+                part.function_call.id = None  # ADK assigns fresh ids per call
+        self.put(key, stored.model_dump_json(exclude_none=True))
+        return None
+
+    def on_model_error(
+        self, callback_context: CallbackContext, llm_request: LlmRequest, error: Exception
+    ) -> LlmResponse | None:
+        self._pop_pending(callback_context)
+        return None  # the error propagates as before
+
+
+response_cache = ResponseCache()
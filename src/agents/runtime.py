@@ -0,0 +1,70 @@
+# src/agents/runtime.py
+"""
+Runs an orchestrator outside `adk run`.
+
+One OrchestratorRuntime wraps a single agent tree and runner; every call to
+`run()` gets its own session and, unless the caller already opened a
+`run_context()`, its own run id (log correlation, per-run session state and
+token usage), so many requests (e.g. one per hospital) can run concurrently
+against the same orchestrator.
+"""
+from __future__ import annotations
+
+from typing import Any, AsyncIterator
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.events import Event
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from src.observability.logger import current_run_id, run_context
+
+APP_NAME = "hospital_surge_app"
+
+
+def final_text(event) -> str:
+    """Visible text of a final-response event ('' for anything else)."""
+    if not event.is_final_response() or event.content is None:
+        return ""
+    return "".join(p.text or "" for p in event.content.parts or [] if not p.thought)
+
+
+class OrchestratorRuntime:
+    def __init__(self, agent: BaseAgent, app_name: str = APP_NAME):
+        self.app_name = app_name
+        self.runner = InMemoryRunner(agent=agent, app_name=app_name)
+
+    async def events(
+        self,
+        prompt: str,
+        user_id: str = "operator",
+        state: dict[str, Any] | None = None,
+        stream: bool = False,
+    ) -> AsyncIterator[Event]:
+        """
+        Run one request in a fresh session, yielding ADK events as they happen.
+        With stream=True, model text also arrives as partial (token) events.
+        """
+        sessions = self.runner.session_service
+        session = await sessions.create_session(app_name=self.app_name, user_id=user_id, state=state)
+        message = types.Content(role="user", parts=[types.Part(text=prompt)])
+        run_config = RunConfig(streaming_mode=StreamingMode.SSE if stream else StreamingMode.NONE)
+        run_id = current_run_id()
+        with run_context(None if run_id == "-" else run_id):
+            try:
+                async for event in self.runner.run_async(
+                    user_id=user_id, session_id=session.id, new_message=message, run_config=run_config
+                ):
+                    yield event
+            finally:
+                await sessions.delete_session(app_name=self.app_name, user_id=user_id, session_id=session.id)
+
+    async def run(self, prompt: str, user_id: str = "operator", state: dict[str, Any] | None = None) -> str:
+        """Run one request in a fresh session and return the final report text."""
+        report = ""
+        async for event in self.events(prompt, user_id=user_id, state=state):
+            # In workflow mode every step ends in a final response; the
+            # synthesizer's comes last.
+            report = final_text(event) or report
+        return report
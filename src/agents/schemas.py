@@ -0,0 +1,92 @@
+# src/agents/schemas.py
+"""
+Typed models of the specialists' structured output.
+
+With OUTPUT_MODE=structured each specialist is given one of these as its
+`output_schema`: ADK asks the model for JSON in that shape and validates the
+final answer, so what lands in session state (and comes back from an
+AgentTool) is a checked dict instead of prose. Field names follow the
+*_SCHEMA_DESCRIPTION constants next to each agent builder.
+"""
+from __future__ import annotations
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+Risk = Literal["low", "medium", "high", "critical"]
+
+
+class DailyForecast(BaseModel):
+    date: str = Field(description='ISO date, e.g. "2025-11-15".')
+    surge_risk: Risk
+    expected_admissions: int = Field(ge=0)
+    expected_icu_admissions: int | None = Field(default=None, ge=0)
+    main_drivers: list[str] = Field(default_factory=list)
+
+
+class SurgeForecast(BaseModel):
+    horizon_days: int = Field(ge=1)
+    daily_forecast: list[DailyForecast]
+    notes: str = ""
+
+
+class DailyStaffing(BaseModel):
+    date: str
+    risk_level: Risk
+    recommended_additional_doctors: int
+    recommended_additional_nurses: int
+    recommended_support_staff: int
+    notes: str = ""
+
+
+class StaffingPlan(BaseModel):
+    assumptions: list[str] = Field(default_factory=list)
+    per_day_plan: list[DailyStaffing]
+    escalation_plan: str = ""
+
+
+class CategorySupply(BaseModel):
+    category: str
+    current_stock_level: str | None = None
+    recommended_buffer_days: int = Field(ge=0)
+    recommended_order_quantity: int = Field(ge=0)
+    priority: Risk
+    notes: str = ""
+
+
+class SupplyPlan(BaseModel):
+    assumptions: list[str] = Field(default_factory=list)
+    per_category_plan: list[CategorySupply]
+    ordering_timeline: str = ""
+
+
+class PatientAdvisory(BaseModel):
+    channel: Literal["sms", "email", "website_banner", "social_media"]
+    target_group: str
+    message: str
+    priority: Literal["low", "medium", "high"]
+
+
+class AdvisoryPlan(BaseModel):
+    overall_risk_summary: str
+    patient_advisories: list[PatientAdvisory]
+    internal_notes: str = ""
+
+
+def json_output_rules(schema_description: str) -> str:
+    """Output-format instructions for a specialist in structured mode."""
+    return (
+        schema_description.strip()
+        + "\nReply with that JSON object only: no prose, no code fences. Put assumptions and caveats"
+        " in the free-text fields."
+    )
+
+
+# workflow output_key -> model of what the specialist writes there
+SECTION_MODELS: dict[str, type[BaseModel]] = {
+    "forecast": SurgeForecast,
+    "staffing_plan": StaffingPlan,
+    "supply_plan": SupplyPlan,
+    "advisories": AdvisoryPlan,
+}
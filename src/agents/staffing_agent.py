@@ -1,6 +1,11 @@
 # src/agents/staffing_agent.py
 from google.adk.agents import LlmAgent
+from .callbacks import specialist_callbacks
+from .model_policy import policy_model
+from .schemas import StaffingPlan, json_output_rules
+from src.tools.occupancy_sim_tool import OccupancySimTool
 from src.tools.roster_tool import StaffRosterTool
+from src.tools.staffing_calculator_tool import StaffingPlanTool
 
 STAFFING_SCHEMA_DESCRIPTION = """
 You output a JSON dictionary with:
@@ -16,34 +21,60 @@ You output a JSON dictionary with:
   (on-call staff, partner hospitals, elective surgery postponement, etc.).
 """
 
-def build_staffing_agent() -> LlmAgent:
+TEXT_OUTPUT_RULES = """
+- Provide a short list of assumptions.
+- Present the plan as plain text with headings and bullets; include an "Escalation Plan" section with concrete steps.
+- Do NOT output raw JSON.
+""".strip()
+
+def build_staffing_agent(structured: bool = False) -> LlmAgent:
     """
     Agent that turns a surge forecast + current staffing snapshot
-    into a concrete staffing plan.
+    into a concrete staffing plan (JSON validated against StaffingPlan
+    with structured=True).
+
+    Tools:
+      - staffing calculator (per-day headcount from ratios and the roster)
+      - staff roster snapshot
+      - discrete-event bed/ICU occupancy simulation
     """
+    output_rules = json_output_rules(STAFFING_SCHEMA_DESCRIPTION) if structured else TEXT_OUTPUT_RULES
     agent = LlmAgent(
-        model="gemini-2.0-flash",
+        model=policy_model("staffing_agent"),
         name="staffing_agent",
         description="Plans staffing adjustments based on surge forecast.",
+        output_schema=StaffingPlan if structured else None,
         instruction=f"""
     You are the workforce planner for a hospital.
 
     Input:
     - A textual surge forecast produced by forecast_agent.
-    - A description of current baseline staffing levels (via staff_roster_tool).
+    - Computed staffing numbers (via staffing_plan_func) and baseline staffing levels (via staff_roster_func).
 
     Task:
     - Produce a human-readable, per-day staffing plan. For each day include:
       - date, risk level (low/medium/high/critical), recommended additional doctors/nurses/support staff, and brief notes.
 
     Rules and output format:
-    - Provide a short list of assumptions.
-    - Present the plan as plain text with headings and bullets; include an "Escalation Plan" section with concrete steps.
-    - Do NOT output raw JSON.
+    {output_rules}
+
+    Pre-fetched data:
+    Baseline roster: {{roster_snapshot?}}
+    Plan computed for the numeric baseline forecast:
+    {{staffing_baseline_snapshot?}}
+
+    Do not do the headcount arithmetic yourself. If the forecast's per-day expected admissions match the
+    baseline plan above, use that plan directly. Otherwise call `staffing_plan_func` once for the whole
+    horizon, passing the forecast's per-day expected admissions (and expected ICU admissions, risk levels
+    and the first date when given). Present the numbers as they are and explain them (drivers, busiest
+    shifts, escalation); only call `staff_roster_func` if the roster above is missing.
 
-    Always call `staff_roster_tool` before computing the staffing plan so that your output is based on real baseline staffing numbers.
+    If any day is high or critical, call `occupancy_sim_func` with the same per-day admissions (and ICU
+    admissions) and plan ICU nursing around the p90 ICU occupancy; name the first day the ICU is likely
+    full (and expected ICU boarders on wards) in the Escalation Plan.
 
     """.strip(),
-        tools=[StaffRosterTool()],
+        tools=[StaffingPlanTool(), StaffRosterTool(), OccupancySimTool()],
+        **specialist_callbacks(),
     )
     return agent
\ No newline at end of file
@@ -0,0 +1,145 @@
+# src/agents/streaming.py
+"""
+Turns the orchestrator's ADK event stream into report sections.
+
+Each specialist owns one section of the report. In workflow mode its events
+reach the runner directly, so with SSE streaming its text arrives token by
+token and the section is complete at its final response. In agent mode the
+specialists run inside AgentTools, so a section arrives whole when the
+orchestrator receives that tool's result. Either way the forecast section is
+on screen once the forecast agent is done, not when the whole report is.
+
+Structured outputs (OUTPUT_MODE=structured) are JSON, so with
+`structured=True` partial text is not streamed and each section is shown
+rendered (src/agents/report.py) when it completes.
+"""
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from typing import AsyncIterator, TextIO
+
+from google.adk.events import Event
+
+from .report import render_section
+
+# (agent name, workflow output_key, section title), in report order.
+SECTIONS = [
+    ("forecast_agent", "forecast", "Surge Forecast"),
+    ("staffing_agent", "staffing_plan", "Staffing Plan"),
+    ("supply_agent", "supply_plan", "Supply Plan"),
+    ("advisory_agent", "advisories", "Patient Advisories"),
+]
+REPORT_TITLE = "Leadership Report"
+
+_TITLE_BY_AGENT = {agent: title for agent, _, title in SECTIONS}
+_KEY_BY_AGENT = {agent: key for agent, key, _ in SECTIONS}
+_TITLE_BY_KEY = {key: title for _, key, title in SECTIONS}
+# Authors whose final text is the synthesized report.
+_REPORT_AUTHORS = {"hospital_orchestrator", "report_synthesizer"}
+
+
+@dataclass
+class SectionUpdate:
+    section: str
+    text: str    # new text for the section since its previous update
+    final: bool  # the section is complete
+
+
+def _visible_text(event: Event) -> str:
+    if event.content is None:
+        return ""
+    return "".join(p.text or "" for p in event.content.parts or [] if not p.thought)
+
+
+async def section_updates(events: AsyncIterator[Event], structured: bool = False) -> AsyncIterator[SectionUpdate]:
+    streamed: dict[str, str] = {}  # author -> text already emitted from partial events
+    async for event in events:
+        # Agent mode: a specialist's whole output comes back as a tool result
+        # (a dict for structured output).
+        for response in event.get_function_responses():
+            title = _TITLE_BY_AGENT.get(response.name)
+            if title is not None:
+                payload = response.response or {}
+                result = payload.get("result", payload)  # dict results are not wrapped
+                yield SectionUpdate(title, render_section(_KEY_BY_AGENT[response.name], result), True)
+
+        # Workflow mode: a failed/timed-out branch only leaves a note in state.
+        for key, value in (event.actions.state_delta or {}).items():
+            if key in _TITLE_BY_KEY and isinstance(value, str) and value.startswith("[unavailable"):
+                yield SectionUpdate(_TITLE_BY_KEY[key], value, True)
+
+        title = _TITLE_BY_AGENT.get(event.author) or (REPORT_TITLE if event.author in _REPORT_AUTHORS else None)
+        if title is None:
+            continue
+        text = _visible_text(event)
+        if structured and event.author in _KEY_BY_AGENT:
+            if event.is_final_response() and not event.partial:
+                yield SectionUpdate(title, render_section(_KEY_BY_AGENT[event.author], text), True)
+            continue
+        if event.partial:
+            if text:
+                streamed[event.author] = streamed.get(event.author, "") + text
+                yield SectionUpdate(title, text, False)
+        elif event.is_final_response():
+            # The closing event repeats the streamed chunks; emit only the rest.
+            seen = streamed.pop(event.author, "")
+            yield SectionUpdate(title, text[len(seen):] if text.startswith(seen) else text, True)
+        elif streamed.pop(event.author, None):
+            # An intermediate turn (e.g. text before a tool call) ended; close
+            # it so concurrent sections are not held back behind it.
+            yield SectionUpdate(title, "", True)
+
+
+class SectionPrinter:
+    """
+    Writes sections to a terminal as they arrive. Concurrent sections would
+    interleave, so one section streams live at a time; the others are
+    buffered and printed, in arrival order, once the live one completes.
+    """
+
+    def __init__(self, out: TextIO = sys.stdout):
+        self.out = out
+        self.active: str | None = None
+        self.pending: dict[str, list] = {}  # title -> [buffered text, complete]
+
+    def feed(self, update: SectionUpdate) -> None:
+        # Nothing is buffered while no section is live (see _drain).
+        if self.active is None:
+            self._open(update.section)
+        if update.section == self.active:
+            self._write(update.text)
+            if update.final:
+                self._close()
+        else:
+            buffered = self.pending.setdefault(update.section, ["", False])
+            buffered[0] += update.text
+            buffered[1] = buffered[1] or update.final
+
+    def finish(self) -> None:
+        """Flush everything, including sections that never completed."""
+        while self.active is not None:
+            self._close()
+
+    def _open(self, title: str) -> None:
+        self.active = title
+        self._write(f"\n=== {title} ===\n")
+
+    def _close(self) -> None:
+        self._write("\n")
+        self.active = None
+        self._drain()
+
+    def _drain(self) -> None:
+        while self.pending and self.active is None:
+            title = next(iter(self.pending))
+            text, complete = self.pending.pop(title)
+            self._open(title)
+            self._write(text)
+            if complete:
+                self._write("\n")
+                self.active = None
+
+    def _write(self, text: str) -> None:
+        self.out.write(text)
+        self.out.flush()
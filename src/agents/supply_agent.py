@@ -1,6 +1,10 @@
 # src/agents/supply_agent.py
 from google.adk.agents import LlmAgent
+from .callbacks import specialist_callbacks
+from .model_policy import policy_model
+from .schemas import SupplyPlan, json_output_rules
 from src.tools.inventory_tool import InventoryTool
+from src.tools.supply_planner_tool import SupplyPlanTool
 
 SUPPLY_SCHEMA_DESCRIPTION = """
 You output a JSON dictionary with:
@@ -15,21 +19,34 @@ You output a JSON dictionary with:
 - "ordering_timeline": short text outlining when to place orders.
 """
 
-def build_supply_agent() -> LlmAgent:
+TEXT_OUTPUT_RULES = """
+- Produce a plain-text supply plan with headings and bullets. For each category include current stock, recommended buffer days, recommended order quantity, priority, and short rationale.
+- Include an "Ordering Timeline" section with clear next steps.
+- Do NOT output raw JSON.
+""".strip()
+
+def build_supply_agent(structured: bool = False) -> LlmAgent:
     """
-    Agent that recommends supply orders based on surge forecast.
+    Agent that recommends supply orders based on surge forecast (JSON
+    validated against SupplyPlan with structured=True).
+
+    Tools:
+      - supply planner (burn rates, days of cover, reorder points, order quantities)
+      - inventory snapshot
     """
+    output_rules = json_output_rules(SUPPLY_SCHEMA_DESCRIPTION) if structured else TEXT_OUTPUT_RULES
     agent = LlmAgent(
-        model="gemini-2.0-flash",
+        model=policy_model("supply_agent"),
         name="supply_agent",
         description="Plans medical supplies and consumables for forecasted surges.",
+        output_schema=SupplyPlan if structured else None,
         instruction=f"""
     You are responsible for pharmacy and consumable stock planning
     for a multi-specialty hospital.
 
     Input:
     - A textual surge forecast from forecast_agent.
-    - A snapshot of current critical stock levels (via inventory_tool).
+    - Computed per-item projections (via supply_plan_func) and current stock levels (via inventory_func).
 
     Task:
     - Recommend buffer stock and incremental orders for key categories likely to be impacted by surges.
@@ -41,13 +58,21 @@ def build_supply_agent() -> LlmAgent:
     - common antibiotics / antivirals
 
     Output format:
-    - Produce a plain-text supply plan with headings and bullets. For each category include current stock, recommended buffer days, recommended order quantity, priority, and short rationale.
-    - Include an "Ordering Timeline" section with clear next steps.
-    - Do NOT output raw JSON.
+    {output_rules}
+
+    Pre-fetched data:
+    Current stock: {{inventory_snapshot?}}
+    Plan computed for the numeric baseline forecast:
+    {{supply_baseline_snapshot?}}
 
-    Call `inventory_tool` to get current stock levels and compute recommended orders.
+    Do not estimate consumption, buffer days or order quantities yourself. If the forecast's per-day
+    expected admissions match the baseline and no budget is given, use the plan above directly.
+    Otherwise call `supply_plan_func` once, passing the forecast's per-day expected admissions (and
+    expected ICU admissions, the first date and any budget mentioned in the request). Present the
+    numbers as they are and explain them; only call `inventory_func` if the stock above is missing.
 
     """.strip(),
-        tools=[InventoryTool()],
+        tools=[SupplyPlanTool(), InventoryTool()],
+        **specialist_callbacks(),
     )
     return agent
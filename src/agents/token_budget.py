@@ -0,0 +1,320 @@
+# src/agents/token_budget.py
+"""
+Token budgets for what flows between agents.
+
+Three things grow with history and nothing used to bound them:
+
+  - handoffs: the forecast (and sometimes the staffing/supply plans) that
+    reach staffing_agent, supply_agent and advisory_agent, either as the
+    AgentTool request (agent mode) or as the forecast agent's output in the
+    shared conversation (workflow mode);
+  - long-term memories recalled into the orchestrator's instruction;
+  - per-run token spend, which was only visible process-wide.
+
+`token_budget.before_model` runs first on every specialist model call. It
+measures each incoming handoff (the AgentTool request, or another agent's
+output relayed as "[agent] said:"; the operator's own message is never
+touched) and, when one is over HANDOFF_TOKEN_BUDGET, rewrites it into the
+compact form of
+FORECAST_SCHEMA_DESCRIPTION (one line per run of days with the same risk
+and drivers) with the other sections clipped to what is left.
+`trim_memories` packs recalled memories into MEMORY_TOKEN_BUDGET, and
+`token_budget.after_model` keeps per-run, per-agent prompt/completion
+totals (see `usage()`), keyed on the run id (bound per orchestration by
+OrchestratorRuntime or the root orchestrator) or, for a call made outside
+any run, its invocation id. Tokens are estimated at ~4 characters each.
+Structured (JSON) handoffs are rendered as prose lines first, so they
+compress the same way.
+"""
+from __future__ import annotations
+
+import json
+import re
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Any
+
+from src.config import HANDOFF_TOKEN_BUDGET, MEMORY_TOKEN_BUDGET
+from src.observability.logger import current_run_id
+from src.observability.metrics import metrics
+
+from .report import REPORT_SECTIONS, RENDERERS, parse_section
+
+CHARS_PER_TOKEN = 4
+TOKEN_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768)
+# Per-run usage is kept for this many runs (oldest dropped first).
+MAX_TRACKED_RUNS = 1024
+# Per-field cap when rendering a memory, so one huge outcome cannot fill the budget.
+MEMORY_FIELD_TOKENS = 40
+
+SECTION_TITLES = ("Surge Forecast", "Staffing Plan", "Supply Plan", "Patient Advisories")
+_HEADING = re.compile(r"^\s*#*\s*(" + "|".join(SECTION_TITLES) + r")\b", re.IGNORECASE)
+_DAY = re.compile(r"(?P<start>\d{4}-\d{2}-\d{2})(?:\s*(?:to|–|\.\.)\s*(?P<end>\d{4}-\d{2}-\d{2}))?")
+_RISK = re.compile(r"\b(low|medium|high|critical)\b", re.IGNORECASE)
+_ADMISSIONS = re.compile(r"~?\s*(\d+(?:\s*[-–]\s*\d+)?)\s*(?:admissions|patients)|~\s*(\d+(?:\s*[-–]\s*\d+)?)")
+_DRIVERS = re.compile(r"drivers?:\s*(.+)$", re.IGNORECASE)
+# Another agent's output relayed into a shared conversation: "[agent] said:",
+# the quoted text and ADK's quote markers (kept as they are).
+_RELAYED = re.compile(r"^(\[[^\]\n]+\] said:\n(?:<<<[A-Z_]+>>>\n)?)(.*?)((?:\n<<<[A-Z_]+>>>)?)$", re.DOTALL)
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN) if text else 0
+
+
+def clip(text: str, tokens: int) -> str:
+    """`text` cut to about `tokens` tokens at a word boundary."""
+    limit = max(tokens, 0) * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text[:limit].rsplit(None, 1)[0] if " " in text[:limit] else text[:limit]
+    return cut.rstrip(" ,;:") + " …"
+
+
+def clip_lines(lines: list[str], tokens: int) -> list[str]:
+    """Leading lines of `lines` that fit in `tokens` (the last one clipped)."""
+    kept, left = [], tokens
+    for line in lines:
+        if left <= 0 or (estimate_tokens(line) > left and left < 8):
+            break
+        kept.append(clip(line, left))
+        left -= estimate_tokens(line) + 1
+    if len(kept) < len(lines):
+        kept.append(f"… ({len(lines) - len(kept)} more lines)")
+    return kept
+
+
+def _forecast_day(line: str) -> dict[str, str] | None:
+    day, risk = _DAY.search(line), _RISK.search(line)
+    if not day or not risk:
+        return None
+    rest = line[day.end():]
+    admissions = _ADMISSIONS.search(rest)
+    drivers = _DRIVERS.search(rest)
+    return {
+        "date": day["start"] + (f"..{day['end']}" if day["end"] else ""),
+        "surge_risk": risk[1].lower(),
+        "expected_admissions": re.sub(r"\s+", "", next(g for g in admissions.groups() if g)) if admissions else "?",
+        "main_drivers": ", ".join(d.strip() for d in drivers[1].rstrip(".").split(",")) if drivers else "",
+    }
+
+
+def compact_forecast(lines: list[str], tokens: int) -> list[str] | None:
+    """
+    A forecast's lines in the compact FORECAST_SCHEMA_DESCRIPTION form, or
+    None if no per-day lines were recognised.
+    """
+    days, notes = [], []
+    for line in lines:
+        day = _forecast_day(line)
+        if day:
+            days.append(day)
+        elif line.strip():
+            notes.append(line.strip().lstrip("-• "))
+    if not days:
+        return None
+
+    rows: list[list[Any]] = []  # [first date, last date, risk, drivers, admissions...]
+    for day in days:
+        last = rows[-1] if rows else None
+        single = ".." not in day["date"]
+        if last and single and ".." not in last[0] and last[2:4] == [day["surge_risk"], day["main_drivers"]]:
+            last[1] = day["date"]
+            last.append(day["expected_admissions"])
+        else:
+            rows.append([day["date"], day["date"], day["surge_risk"], day["main_drivers"], day["expected_admissions"]])
+
+    horizon = sum(
+        len(row) - 4 if ".." not in row[0]
+        else (date.fromisoformat(row[0][12:]) - date.fromisoformat(row[0][:10])).days + 1
+        for row in rows
+    )
+    out = [
+        f"horizon_days={horizon}",
+        "daily_forecast (date: surge_risk expected_admissions [main_drivers]):",
+    ]
+    for first, last, risk, drivers, *admissions in rows:
+        span = first if first == last else f"{first}..{last}"
+        out.append(f"{span}: {risk} {','.join(admissions)}" + (f" [{drivers}]" if drivers else ""))
+    used = sum(estimate_tokens(line) + 1 for line in out)
+    if notes:
+        out.append("notes: " + clip(" ".join(notes), max(tokens - used, 16)))
+    return out
+
+
+def _sections(text: str) -> list[tuple[str, list[str]]]:
+    """(title, non-blank lines) per section; text before the first heading has title ''."""
+    sections: list[tuple[str, list[str]]] = [("", [])]
+    for line in text.splitlines():
+        match = _HEADING.match(line)
+        if match:
+            sections.append((match[1].title(), [line.strip()]))
+        elif line.strip():
+            sections[-1][1].append(line)
+    return [(title, lines) for title, lines in sections if lines]
+
+
+def expand_structured(text: str) -> str:
+    """`text` with an embedded specialist JSON output replaced by its rendered section."""
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end < start:
+        return text
+    try:
+        value = json.loads(text[start:end + 1])
+    except ValueError:
+        return text
+    for key, title in REPORT_SECTIONS:
+        parsed = parse_section(key, value)
+        if parsed is not None:
+            return f"{text[:start]}\n{title}\n{RENDERERS[key](parsed)}\n{text[end + 1:]}"
+    return text
+
+
+def compress_handoff(text: str, tokens: int) -> str:
+    """
+    `text` rewritten to fit about `tokens` tokens: the ask is kept, the
+    forecast becomes its compact per-day form, and every other section is
+    clipped to an equal share of what is left. Returns `text` unchanged when
+    it already fits or nothing shorter could be produced.
+    """
+    if estimate_tokens(text) <= tokens:
+        return text
+    out: list[list[str] | None] = []
+    clipped: list[tuple[int, list[str]]] = []
+    for title, lines in _sections(expand_structured(text)):
+        if title in ("", "Surge Forecast"):
+            # Before the first heading, the forecast (if any) starts at its first day line.
+            start = 1 if title else next((i for i, l in enumerate(lines) if _forecast_day(l)), len(lines))
+            head = [clip(l.strip(), tokens // 4) for l in lines[:start]]
+            compact = compact_forecast(lines[start:], tokens // 2)
+            if compact is not None:
+                out.append(head + compact)
+                continue
+        clipped.append((len(out), lines))
+        out.append(None)
+
+    used = sum(estimate_tokens(l) + 1 for lines in out if lines for l in lines)
+    for i, lines in clipped:
+        out[i] = clip_lines([l.strip() for l in lines], max((tokens - used) // len(clipped), 16))
+    compressed = "\n".join(line for lines in out for line in lines)
+    return compressed if len(compressed) < len(text) else text
+
+
+def format_memory(entry: dict[str, Any]) -> str:
+    """One line per memory, every field capped at MEMORY_FIELD_TOKENS."""
+    def field(value: Any) -> str:
+        if isinstance(value, dict):
+            value = "; ".join(f"{k}: {v}" for k, v in value.items() if not isinstance(v, (dict, list)))
+        elif isinstance(value, list):
+            value = ", ".join(map(str, value))
+        return clip(" ".join(str(value).split()), MEMORY_FIELD_TOKENS)
+
+    tags = entry.get("tags") or []
+    parts = [f"[{', '.join(map(str, tags))}]" if tags else "", field(entry.get("event_summary", ""))]
+    for key, label in (("staffing_outcome", "staffing"), ("supply_outcome", "supply"), ("success_indicators", "outcome")):
+        if entry.get(key):
+            parts.append(f"{label}: {field(entry[key])}")
+    return " ".join(p for p in parts if p)
+
+
+def trim_memories(memories: list[dict[str, Any]], tokens: int | None = None) -> list[str]:
+    """Most relevant memories first, rendered compactly, as many as fit in `tokens`."""
+    budget = MEMORY_TOKEN_BUDGET if tokens is None else tokens
+    lines, used = [], 0
+    for entry in memories:
+        line = format_memory(entry)
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            break
+        lines.append(line)
+        used += cost
+    return lines
+
+
+class TokenBudget:
+    """Handoff compression and per-run, per-agent token accounting."""
+
+    def __init__(self, handoff_tokens: int = HANDOFF_TOKEN_BUDGET):
+        self.handoff_tokens = handoff_tokens
+        self._runs: OrderedDict[str, dict[str, dict[str, int]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _compress(self, text: str, request: set[str]) -> str | None:
+        """The handoff in `text`, compressed; None when `text` is not a handoff."""
+        relayed = _RELAYED.match(text)
+        if relayed is not None:
+            head, body, tail = relayed.groups()
+            compressed = compress_handoff(body, self.handoff_tokens) if self.handoff_tokens > 0 else body
+            return text if compressed is body else head + compressed + tail
+        if text in request:
+            return compress_handoff(text, self.handoff_tokens) if self.handoff_tokens > 0 else text
+        return None
+
+    def before_model(self, callback_context, llm_request) -> None:
+        first_call = not any(content.role == "model" for content in llm_request.contents)
+        agent = callback_context.agent_name
+        # Under AgentTool a specialist is the root of its own runner and its
+        # user message is the caller's request; otherwise (workflow mode) the
+        # user message is the operator's prompt.
+        request = set()
+        if callback_context._invocation_context.agent.parent_agent is None and callback_context.user_content:
+            request = {p.text for p in callback_context.user_content.parts or [] if p.text}
+        for content in llm_request.contents:
+            if content.role != "user":
+                continue
+            for part in content.parts or []:
+                if not part.text or part.thought:
+                    continue
+                compressed = self._compress(part.text, request)
+                if compressed is None:
+                    continue
+                if first_call:
+                    handoff = metrics.histogram("handoff_tokens", "Estimated tokens per handoff", buckets=TOKEN_BUCKETS)
+                    handoff.observe(estimate_tokens(part.text), agent=agent, stage="received")
+                    handoff.observe(estimate_tokens(compressed), agent=agent, stage="sent")
+                    if compressed is not part.text:
+                        metrics.counter("handoff_compressions_total", "Handoffs compressed to the budget").inc(
+                            agent=agent
+                        )
+                part.text = compressed
+        return None
+
+    def after_model(self, callback_context, llm_response) -> None:
+        usage = llm_response.usage_metadata
+        if llm_response.partial or usage is None:
+            return None
+        run_id = current_run_id()
+        if run_id == "-":
+            run_id = callback_context.invocation_id  # never one shared bucket for unbound calls
+        with self._lock:
+            run = self._runs.setdefault(run_id, {})
+            self._runs.move_to_end(run_id)
+            while len(self._runs) > MAX_TRACKED_RUNS:
+                self._runs.popitem(last=False)
+            totals = run.setdefault(callback_context.agent_name, {"prompt": 0, "completion": 0})
+            totals["prompt"] += usage.prompt_token_count or 0
+            totals["completion"] += usage.candidates_token_count or 0
+        return None
+
+    def usage(self, run_id: str | None = None, pop: bool = False) -> dict[str, dict[str, int]]:
+        """Prompt/completion tokens per agent for one run (default: the current run)."""
+        run_id = run_id or current_run_id()
+        with self._lock:
+            run = self._runs.pop(run_id, {}) if pop else self._runs.get(run_id, {})
+            return {agent: dict(totals) for agent, totals in run.items()}
+
+
+def format_usage(usage: dict[str, dict[str, int]]) -> str:
+    """A small per-agent token table."""
+    rows = [f"{'agent':24s} {'prompt':>8s} {'completion':>10s}"]
+    for agent, totals in sorted(usage.items()):
+        rows.append(f"{agent:24s} {totals['prompt']:8d} {totals['completion']:10d}")
+    rows.append(
+        f"{'total':24s} {sum(t['prompt'] for t in usage.values()):8d} "
+        f"{sum(t['completion'] for t in usage.values()):10d}"
+    )
+    return "\n".join(rows)
+
+
+token_budget = TokenBudget()
@@ -1,8 +1,103 @@
+"""
+Settings read from the environment (and .env).
+
+Nothing happens at import time: .env is loaded and a setting is parsed the
+first time any setting is accessed (`from src.config import X` or
+`config.X`), then cached as a normal module attribute.
+"""
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+_env_loaded = False
+
+
+def _load_env():
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
+
+
+def _optional_path(value: str):
+    return value or None
+
+
+def _optional_str(value: str):
+    return value or None
+
+
+def _flag(value: str) -> bool:
+    return value != "0"
+
+
+def _agent_seconds(value: str) -> dict[str, float]:
+    """"forecast_agent=30,staffing_agent=20" -> {"forecast_agent": 30.0, ...}"""
+    pairs = (item.split("=", 1) for item in value.split(",") if "=" in item)
+    return {name.strip(): float(seconds) for name, seconds in pairs}
+
+
+# name -> (default, parser applied to the raw env value)
+_SETTINGS = {
+    "GEMINI_API_KEY": (None, str),
+    "HOSPITAL_DB_URL": (None, str),
+    "POLLUTION_API_KEY": (None, str),
+    "POLLUTION_API_URL": ("https://api.openweathermap.org/data/2.5/air_pollution/forecast", str),
+
+    # "agent": LLM orchestrator calls specialists as tools, one at a time.
+    # "workflow": forecast first, then staffing/supply/advisory concurrently.
+    "ORCHESTRATOR_MODE": ("agent", str),
+    "BRANCH_TIMEOUT_SECONDS": (90.0, float),
+    # "text": specialists write prose and an LLM synthesizes the report.
+    # "structured": specialists return schema-validated JSON (src/agents/schemas.py)
+    # and the report is rendered without a model call (src/agents/report.py).
+    "OUTPUT_MODE": ("text", str),
+
+    # Content-addressed cache for specialist model calls (src/agents/response_cache.py).
+    "RESPONSE_CACHE_ENABLED": (True, _flag),
+    "RESPONSE_CACHE_TTL_SECONDS": (6 * 60 * 60.0, float),
+    "RESPONSE_CACHE_PATH": ("data/.cache/responses.sqlite", _optional_path),
+
+    # Process-wide Gemini request rate (src/agents/rate_limit.py); 0 = unlimited.
+    "GEMINI_QPS": (0.0, float),
+
+    # Model-call policy (src/agents/model_policy.py): deadlines, retries,
+    # hedging, fallback and circuit breaking around every agent's model.
+    # MODEL_DEADLINES overrides per-agent deadlines, e.g.
+    # "forecast_agent=30,hospital_orchestrator=90"; an empty
+    # MODEL_FALLBACK disables the fallback model.
+    "MODEL_POLICY_ENABLED": (True, _flag),
+    "MODEL_PRIMARY": ("gemini-2.0-flash", str),
+    "MODEL_FALLBACK": ("gemini-2.0-flash-lite", _optional_str),
+    "MODEL_RETRIES": (2, int),
+    "MODEL_DEADLINES": ({}, _agent_seconds),
+    "MODEL_BREAKER_FAILURES": (5, int),
+    "MODEL_BREAKER_COOLDOWN_SECONDS": (30.0, float),
+
+    # Per-run session state (src/memory/session_store.py); set
+    # SESSION_STORE_PATH (e.g. data/.cache/sessions.sqlite) to share it
+    # between worker processes.
+    "SESSION_TTL_SECONDS": (60 * 60.0, float),
+    "SESSION_MAX_ENTRIES": (4096, int),
+    "SESSION_STORE_PATH": (None, _optional_path),
+
+    # Estimated-token budgets (src/agents/token_budget.py): a specialist's
+    # incoming handoff is compressed above HANDOFF_TOKEN_BUDGET (0 = never),
+    # recalled long-term memories are trimmed to MEMORY_TOKEN_BUDGET.
+    "HANDOFF_TOKEN_BUDGET": (256, int),
+    "MEMORY_TOKEN_BUDGET": (200, int),
+
+    "LOG_FILE": ("data/agent.log", str),
+    "LOG_LEVEL": ("INFO", str),
+}
+
 
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-HOSPITAL_DB_URL = os.getenv("HOSPITAL_DB_URL")
-POLLUTION_API_KEY = os.getenv("POLLUTION_API_KEY")
+def __getattr__(name):
+    try:
+        default, parse = _SETTINGS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    _load_env()
+    raw = os.getenv(name)
+    value = default if raw is None else parse(raw)
+    globals()[name] = value
+    return value
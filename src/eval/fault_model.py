@@ -0,0 +1,77 @@
+# src/eval/fault_model.py
+"""
+Stand-in for Gemini that injects latency and errors, for exercising the
+model-call policy (src/agents/model_policy.py) offline.
+
+Per call it draws, from a seeded RNG so runs repeat:
+
+  - latency: lognormal around `latency` seconds (spread `jitter`), times
+    `tail_factor` with probability `tail_prob` (a slow outlier);
+  - a hang (never answers) with probability `hang_prob`;
+  - an error with probability `error_rate`, raised after the latency the way
+    a server error would arrive, carrying `error_code` (503 by default).
+
+The fields can be changed between calls (e.g. error_rate=1.0 for an outage).
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+from typing import AsyncGenerator
+
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.genai import types
+from pydantic import PrivateAttr
+
+
+class InjectedFault(RuntimeError):
+    """Error raised by FaultModel; `code` mimics the API error's HTTP status."""
+
+    def __init__(self, code: int = 503):
+        super().__init__(f"injected fault ({code})")
+        self.code = code
+
+
+class FaultModel(BaseLlm):
+    model: str = "fault"
+    text: str = "ok"
+    latency: float = 0.05
+    jitter: float = 0.3
+    tail_prob: float = 0.0
+    tail_factor: float = 20.0
+    hang_prob: float = 0.0
+    error_rate: float = 0.0
+    error_code: int = 503
+    seed: int = 0
+    calls: int = 0
+    _rng: random.Random = PrivateAttr()
+
+    def model_post_init(self, context) -> None:
+        self._rng = random.Random(self.seed)
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.calls += 1
+        rng = self._rng
+        delay = self.latency * rng.lognormvariate(0.0, self.jitter)
+        if rng.random() < self.tail_prob:
+            delay *= self.tail_factor
+        hang = rng.random() < self.hang_prob
+        fail = rng.random() < self.error_rate
+
+        if hang:
+            await asyncio.Event().wait()
+        await asyncio.sleep(delay)
+        if fail:
+            raise InjectedFault(self.error_code)
+
+        if stream:
+            half = len(self.text) // 2
+            for chunk in (self.text[:half], self.text[half:]):
+                yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=chunk)]), partial=True)
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text=self.text)]),
+            model_version=self.model,
+            turn_complete=True,
+        )
@@ -0,0 +1,110 @@
+# src/eval/import_bench.py
+"""
+Import-time (cold start) benchmark.
+
+Imports each target module in a fresh interpreter several times and reports
+the median wall time, plus the slowest imports from `python -X importtime`.
+With --baseline, fails (exit 1) when a target got slower than the stored
+number by more than --tolerance.
+
+    python -m src.eval.import_bench
+    python -m src.eval.import_bench --baseline src/eval/import_baseline.json --update-baseline
+    python -m src.eval.import_bench --baseline src/eval/import_baseline.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+TARGETS = [
+    "src.config",
+    "src.observability.logger",
+    "src.tools.roster_tool",
+    "src.agents.builder",
+    "hospital_surge_app",
+]
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+
+
+def measure(module: str, repeat: int = 5) -> float:
+    """Median seconds to start an interpreter and import `module`, minus bare startup."""
+    def timed(code: str) -> float:
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            _run(code)
+            samples.append(time.perf_counter() - start)
+        return statistics.median(samples)
+
+    return max(0.0, timed(f"import {module}") - timed("pass"))
+
+
+def slowest_imports(module: str, top: int = 8) -> list[tuple[str, float]]:
+    """(package, cumulative seconds) for the slowest imports of `module`."""
+    stderr = _run(f"import {module}", "-X", "importtime").stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if len(name) - len(name.lstrip()) == 1:  # top-level imports only
+            rows.append((name.strip(), int(cumulative) / 1e6))
+    return sorted(rows, key=lambda r: r[1], reverse=True)[:top]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Cold-start import benchmark")
+    parser.add_argument("modules", nargs="*", default=TARGETS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", help="JSON file of {module: seconds}")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown ratio (0.5 = +50%%)")
+    parser.add_argument("--detail", action="store_true", help="show the slowest imports per module")
+    args = parser.parse_args(argv)
+
+    results = {m: measure(m, args.repeat) for m in args.modules}
+    baseline = {}
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    failed = []
+    for module, seconds in results.items():
+        ref = baseline.get(module)
+        status = ""
+        if ref is not None:
+            # Small absolute slack so sub-10ms modules don't flap.
+            if seconds > ref * (1 + args.tolerance) + 0.01:
+                failed.append(module)
+                status = f"  REGRESSION (baseline {ref * 1000:.0f} ms)"
+            else:
+                status = f"  (baseline {ref * 1000:.0f} ms)"
+        print(f"{module:32s} {seconds * 1000:8.1f} ms{status}")
+        if args.detail:
+            for name, cumulative in slowest_imports(module):
+                print(f"    {name:40s} {cumulative * 1000:8.1f} ms")
+
+    if args.baseline and args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({m: round(s, 4) for m, s in results.items()}, f, indent=2)
+        print(f"baseline written to {args.baseline}")
+        return 0
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+# src/eval/policy_bench.py
+"""
+Offline check of the model-call policy (src/agents/model_policy.py).
+
+Each scenario sends --calls requests (over 20 distinct prompts, --concurrency
+at a time) to a FaultModel (src/eval/fault_model.py) twice: once bare, with
+only the deadline as a timeout, and once through a PolicyLlm with a fault
+model as fallback. Per scenario it reports success rate, share of degraded
+(fallback / last-good) answers, p50 / p99 latency, model calls per request
+and the policy events (retries, hedges, timeouts, fallbacks, open circuits).
+
+  slow_tail     5% of calls 25x slower          hedging cuts the p99
+  flaky         20% of calls fail with a 503    jittered retries
+  hangs         5% of calls never answer        attempt timeout, retry / hedge
+  outage        primary always fails            fallback model, circuit opens
+  total_outage  both models fail                last good answers
+
+Exits 1 when a scenario misses its expectation.
+
+    python -m src.eval.policy_bench
+    python -m src.eval.policy_bench outage --calls 100
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+from google.adk.models import LlmRequest
+from google.genai import types
+
+from src.agents import model_policy
+from src.agents.model_policy import ModelPolicy, PolicyLlm
+from src.eval.fault_model import FaultModel
+from src.observability.metrics import metrics
+
+PROMPTS = 20
+BENCH_POLICY = ModelPolicy(
+    deadline=1.0,
+    attempt_timeout=0.3,
+    retries=2,
+    backoff=0.01,
+    hedge_floor=0.01,
+    fallback_model="fault-lite",
+)
+
+# name -> primary / fallback FaultModel fields, whether to warm the last-good
+# answers with healthy models first, and what the policy run must achieve.
+SCENARIOS = {
+    "slow_tail": dict(primary=dict(tail_prob=0.05, tail_factor=25), expect=dict(success=1.0, p99_below_bare=True)),
+    "flaky": dict(primary=dict(error_rate=0.2), expect=dict(success=0.99)),
+    "hangs": dict(primary=dict(hang_prob=0.05), expect=dict(success=0.99)),
+    "outage": dict(primary=dict(error_rate=1.0), expect=dict(success=1.0, circuit_open=True)),
+    "total_outage": dict(
+        primary=dict(error_rate=1.0), fallback=dict(error_rate=1.0), warm=True, expect=dict(success=1.0)
+    ),
+}
+
+
+def _request(i: int) -> LlmRequest:
+    text = f"plan for the coming week, hospital {i % PROMPTS}"
+    return LlmRequest(model="fault-primary", contents=[types.Content(role="user", parts=[types.Part(text=text)])])
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(q * (len(ordered) - 1)))]
+
+
+async def _drive(llm, calls: int, concurrency: int, deadline: float) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    ok = degraded = 0
+
+    async def one(i: int) -> None:
+        nonlocal ok, degraded
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                responses = await asyncio.wait_for(_collect(llm, _request(i)), deadline)
+            except Exception:
+                responses = []
+            latencies.append(time.perf_counter() - start)
+            if responses:
+                ok += 1
+                degraded += bool((responses[-1].custom_metadata or {}).get("degraded"))
+
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    return {
+        "success": ok / calls,
+        "degraded": degraded / calls,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+    }
+
+
+async def _collect(llm, request: LlmRequest) -> list:
+    return [r async for r in llm.generate_content_async(request)]
+
+
+def _events() -> dict[str, int]:
+    counts: dict[str, int] = {}
+    for series in metrics.snapshot().get("model_policy_events_total", {}).get("series", []):
+        event = series["labels"]["event"]
+        counts[event] = counts.get(event, 0) + int(series["value"])
+    return dict(sorted(counts.items()))
+
+
+async def bench_scenario(name: str, spec: dict, calls: int, concurrency: int) -> tuple[dict, list[str]]:
+    def models() -> tuple[FaultModel, FaultModel]:
+        return (
+            FaultModel(model="fault-primary", latency=0.02, **spec.get("primary", {})),
+            FaultModel(model="fault-lite", latency=0.01, seed=1, **spec.get("fallback", {})),
+        )
+
+    primary, _ = models()
+    # Without a policy a failed or hung call has nothing to fall back on.
+    bare = await _drive(primary, calls, concurrency, BENCH_POLICY.deadline * 1.5)
+
+    model_policy.reset()
+    metrics.reset()
+    primary, fallback = models()
+    llm = PolicyLlm(model="fault-primary", agent_name=name, policy=BENCH_POLICY, primary=primary, fallback=fallback)
+    if spec.get("warm"):
+        faults = (primary.error_rate, fallback.error_rate)
+        primary.error_rate = fallback.error_rate = 0.0
+        await _drive(llm, PROMPTS, concurrency, BENCH_POLICY.deadline * 1.5)
+        primary.error_rate, fallback.error_rate = faults
+        primary.calls = fallback.calls = 0
+        metrics.reset()
+    policy = await _drive(llm, calls, concurrency, BENCH_POLICY.deadline * 1.5)
+    policy["model_calls"] = (primary.calls + fallback.calls) / calls
+    policy["events"] = _events()
+    policy["circuit_opened"] = bool(metrics.snapshot().get("model_circuit_open_total", {}).get("series"))
+
+    expect, problems = spec["expect"], []
+    if policy["success"] < expect["success"]:
+        problems.append(f"success {policy['success']:.1%} < {expect['success']:.0%}")
+    if expect.get("p99_below_bare") and policy["p99_ms"] >= bare["p99_ms"]:
+        problems.append(f"p99 {policy['p99_ms']:.0f} ms not below bare {bare['p99_ms']:.0f} ms")
+    if expect.get("circuit_open") and not policy["circuit_opened"]:
+        problems.append("circuit never opened")
+    return {"bare": bare, "policy": policy}, problems
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Offline fault-injection check of the model-call policy")
+    parser.add_argument("scenarios", nargs="*", help=f"scenario names (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    failed = False
+    for name in args.scenarios or SCENARIOS:
+        result, problems = asyncio.run(bench_scenario(name, SCENARIOS[name], args.calls, args.concurrency))
+        bare, policy = result["bare"], result["policy"]
+        print(
+            f"{name:13s} bare   ok {bare['success']:6.1%}  p50 {bare['p50_ms']:6.1f} ms  p99 {bare['p99_ms']:6.1f} ms"
+        )
+        print(
+            f"{'':13s} policy ok {policy['success']:6.1%}  p50 {policy['p50_ms']:6.1f} ms  "
+            f"p99 {policy['p99_ms']:6.1f} ms  degraded {policy['degraded']:5.1%}  "
+            f"calls/req {policy['model_calls']:.2f}"
+        )
+        print(f"{'':13s} {policy['events']}")
+        for problem in problems:
+            failed = True
+            print(f"{'':13s} FAILED {problem}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
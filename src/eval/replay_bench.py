@@ -0,0 +1,233 @@
+# src/eval/replay_bench.py
+"""
+Offline orchestration benchmark.
+
+Runs each scenario in src/eval/scenarios/ through build_orchestrator_agent()
+with every model replaced by a ReplayModel (src/eval/replay_model.py). Tools
+run for real on the local data; the pollution API is served by the stub
+server. No Gemini key or network access is needed. A scenario's optional
+"output_mode" ("text" or "structured") selects how the specialists answer;
+optional "followups" are further prompts sent in the same session after
+"prompt" (each must reach the model again rather than reuse the last turn).
+Per scenario it reports:
+
+  - p50 / p95 end-to-end latency over --runs runs (after --warmup runs)
+  - tool calls per run, in total and per tool
+  - estimated prompt / completion tokens per run
+  - peak Python heap during one run (tracemalloc)
+
+By default recorded model latencies are not slept for (--time-scale 0), so
+the latency numbers are the orchestration, tool and callback overhead.
+With --baseline, exits 1 when a scenario regressed against the stored run.
+Memories (seeded from data/memory.json) and the response cache live in a
+temporary directory, so a run leaves the repo's data untouched.
+
+    python -m src.eval.replay_bench
+    python -m src.eval.replay_bench --baseline src/eval/replay_baseline.json
+    python -m src.eval.replay_bench --baseline src/eval/replay_baseline.json --update-baseline
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from google.genai import types
+
+from src.agents.orchestrator import build_orchestrator_agent, set_memory_bank
+from src.agents.response_cache import response_cache
+from src.agents.runtime import OrchestratorRuntime, final_text
+from src.eval.replay_model import install_replay
+from src.eval.stub_pollution_server import StubPollutionServer
+from src.memory.memory_bank import MemoryBank
+from src.observability.metrics import metrics
+from src.tools.pollution_client import pollution_client
+
+SCENARIO_DIR = os.path.join(os.path.dirname(__file__), "scenarios")
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "replay_baseline.json")
+
+# Allowed growth before a metric counts as a regression.
+LATENCY_SLACK_SECONDS = 0.005
+TOKEN_TOLERANCE = 0.05
+MEMORY_SLACK_KIB = 256
+
+
+def load_scenarios(names: list[str] | None = None) -> list[dict]:
+    scenarios = []
+    for path in sorted(glob.glob(os.path.join(SCENARIO_DIR, "*.json"))):
+        with open(path) as f:
+            scenario = json.load(f)
+        if not names or scenario["name"] in names:
+            scenarios.append(scenario)
+    return scenarios
+
+
+def _counter_series(name: str) -> list[dict]:
+    return metrics.snapshot().get(name, {}).get("series", [])
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(q * (len(ordered) - 1)))]
+
+
+def _model_calls() -> int:
+    return sum(int(series["value"]) for series in _counter_series("model_calls_total"))
+
+
+async def run_conversation(runtime: OrchestratorRuntime, prompts: list[str], state: dict | None) -> str:
+    """Send `prompts` in order in one session and return the last report."""
+    sessions = runtime.runner.session_service
+    session = await sessions.create_session(app_name=runtime.app_name, user_id="bench", state=state)
+    report = ""
+    try:
+        for turn, prompt in enumerate(prompts, 1):
+            calls = _model_calls()
+            message = types.Content(role="user", parts=[types.Part(text=prompt)])
+            async for event in runtime.runner.run_async(user_id="bench", session_id=session.id, new_message=message):
+                report = final_text(event) or report
+            if _model_calls() == calls:
+                raise RuntimeError(f"turn {turn} made no model calls (answered from an earlier turn's state)")
+    finally:
+        await sessions.delete_session(app_name=runtime.app_name, user_id="bench", session_id=session.id)
+    return report
+
+
+async def bench_scenario(scenario: dict, runs: int, warmup: int, time_scale: float) -> dict:
+    # Memories written by one run would change the next run's prompt.
+    agent = build_orchestrator_agent(output_mode=scenario.get("output_mode", "text"), remember=False)
+    runtime = OrchestratorRuntime(install_replay(agent, scenario["transcript"], time_scale))
+
+    async def run_once() -> str:
+        pollution_client.invalidate()  # every run pays for its pollution lookup
+        metrics.reset()
+        if scenario.get("followups"):
+            prompts = [scenario["prompt"], *scenario["followups"]]
+            return await run_conversation(runtime, prompts, scenario.get("state"))
+        return await runtime.run(scenario["prompt"], user_id="bench", state=scenario.get("state"))
+
+    latencies = []
+    for i in range(warmup + runs):
+        start = time.perf_counter()
+        report = await run_once()
+        if i >= warmup:
+            latencies.append(time.perf_counter() - start)
+    if not report:
+        raise RuntimeError(f"{scenario['name']}: replay produced no report")
+
+    # Counts are deterministic, so the last run's metrics stand for every run.
+    tools: dict[str, int] = {}
+    for series in _counter_series("tool_calls_total"):
+        tool = series["labels"]["tool"]
+        tools[tool] = tools.get(tool, 0) + int(series["value"])
+    tokens = {"prompt": 0, "completion": 0}
+    for series in _counter_series("model_tokens_total"):
+        tokens[series["labels"]["kind"]] += int(series["value"])
+
+    tracemalloc.start()
+    try:
+        await run_once()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "p50_s": round(statistics.median(latencies), 4),
+        "p95_s": round(_percentile(latencies, 0.95), 4),
+        "tool_calls": sum(tools.values()),
+        "tool_calls_by_tool": dict(sorted(tools.items())),
+        "prompt_tokens": tokens["prompt"],
+        "completion_tokens": tokens["completion"],
+        "peak_kib": round(peak / 1024),
+    }
+
+
+def regressions(result: dict, ref: dict, tolerance: float) -> list[str]:
+    problems = []
+    for key in ("p50_s", "p95_s"):
+        if result[key] > ref[key] * (1 + tolerance) + LATENCY_SLACK_SECONDS:
+            problems.append(f"{key} {result[key] * 1000:.1f} ms > {ref[key] * 1000:.1f} ms")
+    if result["tool_calls"] > ref["tool_calls"]:
+        problems.append(f"tool_calls {result['tool_calls']} > {ref['tool_calls']}")
+    for key in ("prompt_tokens", "completion_tokens"):
+        if result[key] > ref[key] * (1 + TOKEN_TOLERANCE):
+            problems.append(f"{key} {result[key]} > {ref[key]}")
+    if result["peak_kib"] > ref["peak_kib"] * (1 + tolerance) + MEMORY_SLACK_KIB:
+        problems.append(f"peak_kib {result['peak_kib']} > {ref['peak_kib']}")
+    return problems
+
+
+async def run_all(scenarios: list[dict], args) -> dict[str, dict]:
+    results = {}
+    with StubPollutionServer() as server, tempfile.TemporaryDirectory(prefix="replay-bench-") as scratch:
+        pollution_client.base_url = server.url
+        set_memory_bank(MemoryBank(path=os.path.join(scratch, "memory.jsonl")))
+        response_cache.path = os.path.join(scratch, "responses.sqlite")
+        try:
+            for scenario in scenarios:
+                results[scenario["name"]] = await bench_scenario(scenario, args.runs, args.warmup, args.time_scale)
+        finally:
+            set_memory_bank(None)
+            await pollution_client.aclose()
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Offline replay benchmark of the orchestrator")
+    parser.add_argument("scenarios", nargs="*", help="scenario names (default: all)")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--time-scale", type=float, default=0.0, help="multiplier for recorded model latencies")
+    parser.add_argument("--baseline", help=f"baseline JSON (e.g. {os.path.relpath(DEFAULT_BASELINE)})")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed latency/memory growth (0.5 = +50%%)")
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    scenarios = load_scenarios(args.scenarios)
+    if not scenarios:
+        parser.error(f"no scenarios found in {SCENARIO_DIR}")
+
+    # Cached responses would skip the replayed model calls after the first run.
+    response_cache.enabled = False
+    results = asyncio.run(run_all(scenarios, args))
+
+    baseline = {}
+    if args.baseline and os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    failed = False
+    for name, result in results.items():
+        print(
+            f"{name:14s} p50 {result['p50_s'] * 1000:7.1f} ms  p95 {result['p95_s'] * 1000:7.1f} ms  "
+            f"tools {result['tool_calls']:3d}  tokens {result['prompt_tokens']:6d}+{result['completion_tokens']:<5d}  "
+            f"peak {result['peak_kib']:6d} KiB"
+        )
+        print(f"{'':14s} {result['tool_calls_by_tool']}")
+        if name in baseline:
+            for problem in regressions(result, baseline[name], args.tolerance):
+                failed = True
+                print(f"{'':14s} REGRESSION {problem}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline and args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
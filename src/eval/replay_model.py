@@ -0,0 +1,116 @@
+# src/eval/replay_model.py
+"""
+Deterministic stand-in for Gemini that replays a recorded transcript.
+
+A transcript maps each agent name to the model turns that agent produced,
+in order. A turn is either text (the agent's answer) or one or more function
+calls; the tools themselves still run for real against the local data, so
+tool latency and tool output are part of what gets measured:
+
+    {
+      "hospital_orchestrator": [
+        {"call": "forecast_agent", "args": {"request": "..."}, "latency": 0.9},
+        {"text": "...final report...", "latency": 2.4}
+      ],
+      "forecast_agent": [
+        {"calls": [{"call": "surge_baseline_func", "args": {"horizon_days": 7}},
+                   {"call": "hospital_admissions_func", "args": {"days": 14}}]},
+        {"text": "Surge forecast: ..."}
+      ]
+    }
+
+The turn to replay is the number of model turns already in the request, so
+each AgentTool invocation of a specialist starts again at its first turn.
+In a multi-turn session the earlier turns count too, including answers a
+callback produced without the model (e.g. a rendered structured report);
+those need a placeholder entry.
+`latency` (recorded seconds) is slept for, scaled by `time_scale`. Token
+usage is estimated at ~4 characters per token and reported as usage
+metadata, so the normal token metrics work offline.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, AsyncGenerator
+
+from google.adk.agents import BaseAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.genai import types
+
+from src.agents.token_budget import estimate_tokens
+
+
+class ReplayError(RuntimeError):
+    """The transcript has no turn for this request."""
+
+
+def _request_text(llm_request: LlmRequest) -> str:
+    config = llm_request.config
+    pieces = [str(config.system_instruction)] if config and config.system_instruction else []
+    for content in llm_request.contents:
+        for part in content.parts or []:
+            if part.text:
+                pieces.append(part.text)
+            elif part.function_call is not None:
+                pieces.append(json.dumps(part.function_call.args or {}, default=str))
+            elif part.function_response is not None:
+                pieces.append(json.dumps(part.function_response.response or {}, default=str))
+    return "\n".join(pieces)
+
+
+def _turn_parts(turn: dict[str, Any]) -> list[types.Part]:
+    if "text" in turn:
+        return [types.Part(text=turn["text"])]
+    calls = turn.get("calls") or [turn]
+    return [types.Part(function_call=types.FunctionCall(name=c["call"], args=c.get("args", {}))) for c in calls]
+
+
+class ReplayModel(BaseLlm):
+    model: str = "replay"
+    agent_name: str
+    turns: list[dict[str, Any]]
+    time_scale: float = 0.0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        index = sum(1 for content in llm_request.contents if content.role == "model")
+        if index >= len(self.turns):
+            raise ReplayError(f"{self.agent_name}: transcript has no turn {index}")
+        turn = self.turns[index]
+        if turn.get("latency") and self.time_scale:
+            await asyncio.sleep(turn["latency"] * self.time_scale)
+
+        parts = _turn_parts(turn)
+        completion = turn.get("text") or json.dumps(turn.get("calls") or turn, default=str)
+        prompt_tokens = estimate_tokens(_request_text(llm_request))
+        completion_tokens = estimate_tokens(completion)
+        yield LlmResponse(
+            content=types.Content(role="model", parts=parts),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=prompt_tokens,
+                candidates_token_count=completion_tokens,
+                total_token_count=prompt_tokens + completion_tokens,
+            ),
+            turn_complete=True,
+        )
+
+
+def _agents(agent: BaseAgent):
+    yield agent
+    for sub in agent.sub_agents:
+        yield from _agents(sub)
+    for tool in getattr(agent, "tools", []):
+        if isinstance(getattr(tool, "agent", None), BaseAgent):
+            yield from _agents(tool.agent)
+
+
+def install_replay(root: BaseAgent, transcript: dict[str, list[dict]], time_scale: float = 0.0) -> BaseAgent:
+    """Point every LLM agent under `root` (including AgentTool agents) at its transcript."""
+    for agent in _agents(root):
+        if hasattr(agent, "model"):
+            agent.model = ReplayModel(
+                agent_name=agent.name, turns=transcript.get(agent.name, []), time_scale=time_scale
+            )
+    return root
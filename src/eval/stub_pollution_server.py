@@ -0,0 +1,107 @@
+# src/eval/stub_pollution_server.py
+"""
+Local stand-in for the OpenWeatherMap air-pollution forecast endpoint.
+
+Serves deterministic, OWM-shaped payloads so the pollution client can be
+exercised offline. Point the client at it with POLLUTION_API_URL, or use it
+directly:
+
+    with StubPollutionServer() as server:
+        client = PollutionClient(base_url=server.url)
+        ...
+        server.fail = True   # upstream now returns HTTP 503
+
+Run standalone with `python -m src.eval.stub_pollution_server [port]`.
+"""
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+PATH = "/data/2.5/air_pollution/forecast"
+
+
+def stub_payload(lat: float, lon: float, hours: int = 120, start: int = 1_764_547_200) -> dict:
+    """Hourly forecast whose PM2.5 depends only on the coordinates and hour."""
+    base = 60 + (abs(lat) * 7 + abs(lon) * 3) % 120
+    items = []
+    for h in range(hours):
+        pm25 = round(base + 40 * ((h // 24) % 3) + (h % 24) * 1.5, 2)
+        aqi = 1 + min(4, int(pm25 // 50))
+        items.append({
+            "dt": start + h * 3600,
+            "main": {"aqi": aqi},
+            "components": {"pm2_5": pm25, "pm10": round(pm25 * 1.6, 2)},
+        })
+    return {"coord": {"lat": lat, "lon": lon}, "list": items}
+
+
+class StubPollutionServer:
+    def __init__(self, port: int = 0, delay: float = 0.0):
+        self.delay = delay
+        self.fail = False
+        self.requests = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests += 1
+                url = urlparse(self.path)
+                if stub.delay:
+                    time.sleep(stub.delay)
+                if url.path != PATH:
+                    return self._reply(404, {"cod": 404, "message": "not found"})
+                if stub.fail:
+                    return self._reply(503, {"cod": 503, "message": "upstream unavailable"})
+                q = parse_qs(url.query)
+                try:
+                    lat, lon = float(q["lat"][0]), float(q["lon"][0])
+                except (KeyError, ValueError):
+                    return self._reply(400, {"cod": 400, "message": "lat/lon required"})
+                self._reply(200, stub_payload(lat, lon))
+
+            def _reply(self, status: int, body: dict):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{PATH}"
+
+    def start(self) -> "StubPollutionServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubPollutionServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+    server = StubPollutionServer(port=int(sys.argv[1]) if len(sys.argv) > 1 else 8089).start()
+    print(f"Stub pollution API on {server.url}")
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
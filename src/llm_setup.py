@@ -1,5 +1,4 @@
 # src/llm_setup.py
-from google import genai
 from .config import GEMINI_API_KEY
 
 _client = None
@@ -12,6 +11,7 @@ def configure_genai():
         raise RuntimeError("GEMINI_API_KEY is not set in .env")
 
     if _client is None:
+        from google import genai  # deferred: heavy import, only needed here
         _client = genai.Client(api_key=GEMINI_API_KEY)
 
     return _client
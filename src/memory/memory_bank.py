@@ -1,42 +1,63 @@
-# src/memory/session_store.py
 # src/memory/memory_bank.py
 import json
+import threading
 from typing import List, Dict
 import os
 
-MEMORY_FILE = "data/memory.json"
+from .memory_index import MemoryIndex
+from .memory_store import JsonlMemoryStore
+
+MEMORY_FILE = "data/memory.jsonl"
+# Pre-JSONL history (one JSON array, rewritten on every save); imported once.
+LEGACY_MEMORY_FILE = "data/memory.json"
 
 class MemoryBank:
     """
     Stores and retrieves past surge events and their outcomes.
+
+    Memories live in an append-only JSONL file shared safely between
+    processes; nothing is loaded until it is needed. Retrieval goes through
+    an in-memory MemoryIndex that only ever indexes lines it has not seen,
+    including lines appended by other processes.
     """
 
-    def __init__(self):
-        if not os.path.exists(MEMORY_FILE):
-            with open(MEMORY_FILE, "w") as f:
-                json.dump([], f)
-        self._load()
+    def __init__(self, path: str = MEMORY_FILE, legacy_path: str = LEGACY_MEMORY_FILE, use_embeddings: bool = True):
+        self.store = JsonlMemoryStore(path)
+        if not os.path.exists(path) and os.path.exists(legacy_path):
+            self._import_legacy(legacy_path)
+        self.index = MemoryIndex(use_embeddings=use_embeddings)
+        self._indexed_upto = 0
+        self._lock = threading.Lock()
+
+    def _import_legacy(self, legacy_path: str):
+        with open(legacy_path) as f:
+            legacy: List[Dict] = json.load(f)
+        self.store.seed(legacy)
+
+    def _sync_index(self):
+        """Index entries appended since the last sync (by anyone)."""
+        with self._lock:
+            for offset, end, entry in self.store.scan(self._indexed_upto):
+                if entry is not None:
+                    self.index.add(offset, entry)
+                self._indexed_upto = end
 
-    def _load(self):
-        with open(MEMORY_FILE) as f:
-            self.memories: List[Dict] = json.load(f)
+    @property
+    def memories(self) -> List[Dict]:
+        """All memories, oldest first (reads the whole history)."""
+        return [entry for _, entry in self.store.iter_entries()]
 
     def save(self):
-        with open(MEMORY_FILE, "w") as f:
-            json.dump(self.memories, f, indent=2)
+        """Kept for compatibility: add_memory already persists each entry."""
 
     def add_memory(self, entry: Dict):
-        self.memories.append(entry)
-        self.save()
+        self.store.append(entry)
+        self._sync_index()
 
     def retrieve_related(self, context: str, max_items=3) -> List[Dict]:
         """
-        Naive semantic match: prioritizes memories that share keywords with context.
+        Ranks memories by tag matches, IDF-weighted event-summary overlap and
+        (optionally) embedding cosine similarity with the context.
         """
-        context = context.lower()
-        ranked = sorted(
-            self.memories,
-            key=lambda m: sum(1 for k in m.get("tags", []) if k.lower() in context),
-            reverse=True,
-        )
-        return ranked[:max_items]
+        self._sync_index()
+        return [self.store.read_at(offset) for offset in self.index.search(context, max_items)]
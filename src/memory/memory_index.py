@@ -0,0 +1,109 @@
+# src/memory/memory_index.py
+"""
+In-memory retrieval index for MemoryBank.
+
+Two signals, both updated incrementally on every add:
+  - an inverted index over tags and event-summary tokens (tag hits count
+    most, summary overlap is IDF-weighted);
+  - an optional local embedding index: hashed bag-of-words/bigram vectors,
+    L2-normalized rows of a NumPy matrix, scored by cosine similarity.
+
+Search is a few vector ops plus an argpartition top-k, so it stays in the
+millisecond range for tens of thousands of memories.
+"""
+from __future__ import annotations
+
+import math
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9.+_]*")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from in into is it of on or the to with next this that days day week plan".split()
+)
+
+TAG_WEIGHT = 1.0
+SUMMARY_WEIGHT = 0.5
+EMBEDDING_WEIGHT = 0.5
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def _features(tokens: List[str]) -> Iterable[str]:
+    yield from tokens
+    yield from (f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+
+
+class MemoryIndex:
+    def __init__(self, dim: int = 256, use_embeddings: bool = True):
+        self.dim = dim
+        self.use_embeddings = use_embeddings
+        self.doc_ids: List[int] = []
+        self._tag_postings: Dict[str, List[int]] = defaultdict(list)
+        self._tag_tokens: Dict[str, frozenset] = {}
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    def embed(self, text: str) -> np.ndarray:
+        vec = np.zeros(self.dim, dtype=np.float32)
+        for feature in _features(tokenize(text)):
+            h = zlib.crc32(feature.encode())
+            vec[h % self.dim] += 1.0 if (h >> 16) & 1 else -1.0
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def add(self, doc_id: int, entry: Dict) -> None:
+        """Index one memory; `doc_id` is whatever the caller uses to fetch it back."""
+        row = len(self.doc_ids)
+        self.doc_ids.append(doc_id)
+
+        tags = [str(t).lower() for t in entry.get("tags", [])]
+        for tag in dict.fromkeys(tags):
+            self._tag_postings[tag].append(row)
+            self._tag_tokens.setdefault(tag, frozenset(tokenize(tag)))
+
+        summary = str(entry.get("event_summary", ""))
+        for token in set(tokenize(summary)):
+            self._postings[token].append(row)
+
+        if self.use_embeddings:
+            if row == len(self._vectors):
+                grown = np.zeros((max(64, 2 * row), self.dim), dtype=np.float32)
+                grown[:row] = self._vectors
+                self._vectors = grown
+            self._vectors[row] = self.embed(summary + " " + " ".join(tags))
+
+    def search(self, context: str, k: int = 3) -> List[int]:
+        """doc_ids of the k best matches, best first."""
+        n = len(self.doc_ids)
+        if n == 0 or k <= 0:
+            return []
+        query = set(tokenize(context))
+        scores = np.zeros(n)
+
+        for tag, tag_tokens in self._tag_tokens.items():
+            if tag_tokens and tag_tokens <= query:
+                np.add.at(scores, self._tag_postings[tag], TAG_WEIGHT)
+
+        for token in query:
+            rows = self._postings.get(token)
+            if rows:
+                idf = math.log(1 + n / len(rows))
+                np.add.at(scores, rows, SUMMARY_WEIGHT * idf / math.log(1 + n))
+
+        if self.use_embeddings:
+            scores += EMBEDDING_WEIGHT * np.maximum(self._vectors[:n] @ self.embed(context), 0.0)
+
+        k = min(k, n)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((top, -scores[top]))]
+        return [self.doc_ids[i] for i in top]
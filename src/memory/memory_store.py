@@ -0,0 +1,107 @@
+# src/memory/memory_store.py
+"""
+Append-only JSONL storage for long-term memories.
+
+- One JSON object per line; add = a single O_APPEND write + fsync, so a
+  write costs O(entry) instead of rewriting the whole history.
+- Appends take an exclusive flock, so several processes can share the file
+  without clobbering each other. Readers need no lock: they only consume
+  newline-terminated lines, and each line is written in one write().
+- A torn trailing line (crash mid-write) is skipped on read and fenced off
+  with a newline before the next append.
+- Entries are streamed from disk; nothing has to be held in memory.
+"""
+from __future__ import annotations
+
+import json
+import os
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: single-process use only
+    fcntl = None
+
+
+@contextmanager
+def _locked(fd: int):
+    if fcntl is None:
+        yield
+        return
+    fcntl.flock(fd, fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class JsonlMemoryStore:
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def append(self, entry: Dict) -> int:
+        """Durably append one entry; returns its byte offset in the file."""
+        line = (json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n").encode()
+        fd = os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            with _locked(fd):
+                end = os.lseek(fd, 0, os.SEEK_END)
+                if end and os.pread(fd, 1, end - 1) != b"\n":
+                    os.write(fd, b"\n")  # fence off a torn previous write
+                    end += 1
+                os.write(fd, line)
+                os.fsync(fd)
+                return end
+        finally:
+            os.close(fd)
+
+    def seed(self, entries) -> None:
+        """Write `entries` only if the file is still empty (one-time migration)."""
+        fd = os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            with _locked(fd):
+                if os.lseek(fd, 0, os.SEEK_END) == 0:
+                    os.write(fd, b"".join(
+                        (json.dumps(e, ensure_ascii=False, separators=(",", ":")) + "\n").encode()
+                        for e in entries
+                    ))
+                    os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def scan(self, start: int = 0) -> Iterator[Tuple[int, int, Optional[Dict]]]:
+        """
+        Yield (offset, end, entry) for every complete line from `start` on;
+        entry is None for lines that do not parse. `end` is where the next
+        scan should resume.
+        """
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            offset = start
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # torn write still in progress or from a crash
+                try:
+                    entry = json.loads(raw)
+                except ValueError:
+                    entry = None
+                yield offset, offset + len(raw), entry
+                offset += len(raw)
+
+    def iter_entries(self, start: int = 0) -> Iterator[Tuple[int, Dict]]:
+        """Yield (offset, entry) for every complete entry from `start` on."""
+        for offset, _, entry in self.scan(start):
+            if entry is not None:
+                yield offset, entry
+
+    def read_at(self, offset: int) -> Dict:
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    def size(self) -> int:
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
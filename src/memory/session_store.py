@@ -1,15 +1,167 @@
+# src/memory/session_store.py
+"""
+Session memory for state produced during an orchestration cycle (the
+pre-fetched tool snapshots, src/agents/prefetch.py).
+
+Values live in namespaces, by default the current run_id (see
+src.observability.logger.run_context; OrchestratorRuntime and, under
+`adk run` / `adk web`, the root orchestrator bind one per run), so concurrent
+orchestrations never see or overwrite each other's keys. Each entry expires `ttl_seconds` after it was
+written, and at most `max_entries` are held in memory (least recently used
+dropped first). Every operation takes one short lock and never awaits, so the
+store is safe from threads and asyncio tasks alike.
+
+With `path`, entries live in a local SQLite file (WAL mode) instead, so
+worker processes on the same machine share and reuse session state; values
+then have to be JSON-serializable and come back as plain JSON types, and
+the entry cap is not applied (expired rows are deleted on every write).
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from src.config import SESSION_MAX_ENTRIES, SESSION_STORE_PATH, SESSION_TTL_SECONDS
+from src.observability.logger import current_run_id
+
+
 class SessionStore:
-    """
-    Lightweight session memory for storing state during one orchestration cycle.
-    """
-    def __init__(self):
-        self.state = {}
+    """Namespaced key/value state with TTL expiry, an LRU cap and an optional SQLite backend."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = SESSION_TTL_SECONDS,
+        max_entries: int = SESSION_MAX_ENTRIES,
+        path: str | None = SESSION_STORE_PATH,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.path = path
+        # (namespace, key) -> (expires_at, value)
+        self._memory: OrderedDict[tuple[str, str], tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+
+    # ---- storage -------------------------------------------------------
+
+    def _conn(self) -> sqlite3.Connection | None:
+        if self._db is None and self.path:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=10)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS session_state (namespace TEXT NOT NULL, key TEXT NOT NULL, "
+                "expires REAL NOT NULL, value TEXT NOT NULL, PRIMARY KEY (namespace, key))"
+            )
+        return self._db
+
+    def _remember(self, slot: tuple[str, str], expires: float, value: Any) -> None:
+        self._memory[slot] = (expires, value)
+        self._memory.move_to_end(slot)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    @staticmethod
+    def _namespace(namespace: str | None) -> str:
+        return namespace if namespace is not None else current_run_id()
+
+    # ---- public API ----------------------------------------------------
+
+    def set(self, key: str, value: Any, namespace: str | None = None, ttl: float | None = None) -> None:
+        now = time.time()
+        slot = (self._namespace(namespace), key)
+        expires = now + (self.ttl_seconds if ttl is None else ttl)
+        with self._lock:
+            db = self._conn()
+            if db is None:
+                self._remember(slot, expires, value)
+                return
+            db.execute(
+                "INSERT OR REPLACE INTO session_state VALUES (?, ?, ?, ?)",
+                (*slot, expires, json.dumps(value, default=str)),
+            )
+            db.execute("DELETE FROM session_state WHERE expires < ?", (now,))
+
+    def get(self, key: str, default: Any = None, namespace: str | None = None) -> Any:
+        now = time.time()
+        slot = (self._namespace(namespace), key)
+        with self._lock:
+            db = self._conn()
+            if db is not None:
+                row = db.execute(
+                    "SELECT value FROM session_state WHERE namespace = ? AND key = ? AND expires >= ?",
+                    (*slot, now),
+                ).fetchone()
+                return default if row is None else json.loads(row[0])
+            entry = self._memory.get(slot)
+            if entry is None:
+                return default
+            if entry[0] < now:
+                del self._memory[slot]
+                return default
+            self._memory.move_to_end(slot)
+            return entry[1]
+
+    def delete(self, key: str, namespace: str | None = None) -> None:
+        slot = (self._namespace(namespace), key)
+        with self._lock:
+            self._memory.pop(slot, None)
+            db = self._conn()
+            if db is not None:
+                db.execute("DELETE FROM session_state WHERE namespace = ? AND key = ?", slot)
+
+    def items(self, namespace: str | None = None) -> dict[str, Any]:
+        """Every live key/value in one namespace."""
+        now = time.time()
+        ns = self._namespace(namespace)
+        with self._lock:
+            db = self._conn()
+            if db is not None:
+                rows = db.execute(
+                    "SELECT key, value FROM session_state WHERE namespace = ? AND expires >= ?", (ns, now)
+                )
+                return {key: json.loads(value) for key, value in rows}
+            return {
+                key: value
+                for (slot_ns, key), (expires, value) in self._memory.items()
+                if slot_ns == ns and expires >= now
+            }
+
+    @property
+    def state(self) -> dict[str, Any]:
+        """The current namespace's state (a copy)."""
+        return self.items()
 
-    def set(self, key: str, value):
-        self.state[key] = value
+    def clear(self, namespace: str | None = None) -> None:
+        """Drop one namespace (default: the current run's)."""
+        ns = self._namespace(namespace)
+        with self._lock:
+            for slot in [slot for slot in self._memory if slot[0] == ns]:
+                del self._memory[slot]
+            db = self._conn()
+            if db is not None:
+                db.execute("DELETE FROM session_state WHERE namespace = ?", (ns,))
 
-    def get(self, key: str, default=None):
-        return self.state.get(key, default)
+    def purge(self) -> int:
+        """Drop every expired entry; returns how many went."""
+        now = time.time()
+        with self._lock:
+            db = self._conn()
+            if db is not None:
+                return db.execute("DELETE FROM session_state WHERE expires < ?", (now,)).rowcount
+            expired = [slot for slot, (expires, _) in self._memory.items() if expires < now]
+            for slot in expired:
+                del self._memory[slot]
+            return len(expired)
 
-    def clear(self):
-        self.state = {}
\ No newline at end of file
+    def __len__(self) -> int:
+        with self._lock:
+            db = self._conn()
+            if db is not None:
+                return db.execute("SELECT COUNT(*) FROM session_state").fetchone()[0]
+            return len(self._memory)
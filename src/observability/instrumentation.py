@@ -0,0 +1,116 @@
+# src/observability/instrumentation.py
+"""
+ADK callbacks that feed src.observability.metrics.
+
+Attached to every agent by src/agents/callbacks.py, they record:
+  - agent_duration_seconds{agent}           per agent invocation
+  - tool_duration_seconds{agent,tool}       per FunctionTool / AgentTool call
+  - model_call_duration_seconds{agent}      per LLM round trip
+  - model_tokens_total{agent,kind}          prompt / completion tokens
+  - *_calls_total / *_errors_total counters
+
+A call's start time is dropped by its after_* callback, or by the on_*_error
+callback when the model or tool raises; MAX_STARTS bounds what is left by
+calls that get neither (an agent that raises, a cancelled branch).
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from .metrics import metrics
+
+MAX_STARTS = 4096
+
+_starts: OrderedDict[tuple, float] = OrderedDict()
+_lock = threading.Lock()
+
+
+def _begin(key: tuple) -> None:
+    with _lock:
+        _starts[key] = time.perf_counter()
+        _starts.move_to_end(key)
+        while len(_starts) > MAX_STARTS:
+            _starts.popitem(last=False)
+
+
+def _finish(key: tuple) -> float | None:
+    with _lock:
+        start = _starts.pop(key, None)
+    return None if start is None else time.perf_counter() - start
+
+
+def before_agent(callback_context) -> None:
+    _begin(("agent", callback_context.invocation_id, callback_context.agent_name))
+    metrics.counter("agent_calls_total", "Agent invocations").inc(agent=callback_context.agent_name)
+
+
+def after_agent(callback_context) -> None:
+    elapsed = _finish(("agent", callback_context.invocation_id, callback_context.agent_name))
+    if elapsed is not None:
+        metrics.histogram("agent_duration_seconds", "Wall time per agent invocation").observe(
+            elapsed, agent=callback_context.agent_name
+        )
+
+
+def before_model(callback_context, llm_request) -> None:
+    _begin(("model", callback_context.invocation_id, callback_context.agent_name))
+
+
+def after_model(callback_context, llm_response) -> None:
+    if llm_response.partial:
+        return None
+    agent = callback_context.agent_name
+    elapsed = _finish(("model", callback_context.invocation_id, agent))
+    if elapsed is not None:
+        metrics.histogram("model_call_duration_seconds", "Wall time per LLM round trip").observe(elapsed, agent=agent)
+    metrics.counter("model_calls_total", "LLM round trips").inc(agent=agent)
+    if llm_response.error_code:
+        metrics.counter("model_errors_total", "LLM responses carrying an error").inc(agent=agent)
+    usage = llm_response.usage_metadata
+    if usage is not None:
+        tokens = metrics.counter("model_tokens_total", "LLM tokens by kind")
+        tokens.inc(usage.prompt_token_count or 0, agent=agent, kind="prompt")
+        tokens.inc(usage.candidates_token_count or 0, agent=agent, kind="completion")
+    return None
+
+
+def on_model_error(callback_context, llm_request, error: Exception) -> None:
+    agent = callback_context.agent_name
+    elapsed = _finish(("model", callback_context.invocation_id, agent))
+    if elapsed is not None:
+        metrics.histogram("model_call_duration_seconds", "Wall time per LLM round trip").observe(elapsed, agent=agent)
+    metrics.counter("model_calls_total", "LLM round trips").inc(agent=agent)
+    metrics.counter("model_errors_total", "LLM responses carrying an error").inc(agent=agent)
+    return None  # the error propagates
+
+
+def _tool_key(tool, tool_context) -> tuple:
+    return ("tool", tool_context.invocation_id, tool_context.function_call_id or tool.name)
+
+
+def before_tool(tool, args: dict[str, Any], tool_context) -> None:
+    _begin(_tool_key(tool, tool_context))
+
+
+def after_tool(tool, args: dict[str, Any], tool_context, tool_response) -> None:
+    labels = {"agent": tool_context.agent_name, "tool": tool.name}
+    elapsed = _finish(_tool_key(tool, tool_context))
+    if elapsed is not None:
+        metrics.histogram("tool_duration_seconds", "Wall time per tool call").observe(elapsed, **labels)
+    metrics.counter("tool_calls_total", "Tool calls").inc(**labels)
+    if isinstance(tool_response, dict) and tool_response.get("error"):
+        metrics.counter("tool_errors_total", "Tool calls returning an error").inc(**labels)
+    return None
+
+
+def on_tool_error(tool, args: dict[str, Any], tool_context, error: Exception) -> None:
+    labels = {"agent": tool_context.agent_name, "tool": tool.name}
+    elapsed = _finish(_tool_key(tool, tool_context))
+    if elapsed is not None:
+        metrics.histogram("tool_duration_seconds", "Wall time per tool call").observe(elapsed, **labels)
+    metrics.counter("tool_calls_total", "Tool calls").inc(**labels)
+    metrics.counter("tool_errors_total", "Tool calls returning an error").inc(**labels)
+    return None  # the error propagates
@@ -1,16 +1,154 @@
 # src/observability/logger.py
+"""
+Structured, non-blocking logging for the agent runtime.
+
+Importing this module has no side effects: `logger` only gets handlers once
+an entry point calls `configure_logging()`. After that, callers only enqueue
+records (QueueHandler); a background QueueListener thread formats them as
+JSON lines and writes them to a size-rotated file, so disk I/O never blocks
+the request path.
+
+Every record carries the current run's correlation id (`run_id`), set with
+`run_context()`. Large payloads should be passed through `truncate()`, or
+logged with `log_payload()`, which truncates at INFO and only occasionally
+(sampled) emits the full payload at DEBUG.
+"""
+import atexit
+import contextvars
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import random
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
 
 LOG_FILE = "data/agent.log"
-
-# Create directory if missing
-os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
+MAX_FIELD_CHARS = 500
+MAX_LIST_ITEMS = 20
 
 logger = logging.getLogger("hospital_agent")
 logger.setLevel(logging.INFO)
+logger.addHandler(logging.NullHandler())
+
+_run_id = contextvars.ContextVar("run_id", default="-")
+_listener: logging.handlers.QueueListener | None = None
+
+# Standard LogRecord attributes; anything else came in via `extra=`.
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "run_id"}
+
+
+def current_run_id() -> str:
+    return _run_id.get()
+
+
+def bind_run_id(run_id: str | None = None) -> contextvars.Token:
+    """Set the current run id (a fresh one by default); undo with unbind_run_id()."""
+    return _run_id.set(run_id or uuid.uuid4().hex[:12])
+
+
+def unbind_run_id(token: contextvars.Token) -> None:
+    try:
+        _run_id.reset(token)
+    except ValueError:  # unwound in another context (e.g. a generator closed elsewhere)
+        _run_id.set(token.old_value if token.old_value is not contextvars.Token.MISSING else "-")
+
+
+@contextmanager
+def run_context(run_id: str | None = None):
+    """Tag every record logged inside the block (and tasks it spawns) with run_id."""
+    token = bind_run_id(run_id)
+    try:
+        yield _run_id.get()
+    finally:
+        unbind_run_id(token)
+
+
+def truncate(value, limit: int = MAX_FIELD_CHARS):
+    """Bound the size of a payload: long strings are cut, long lists shortened."""
+    if isinstance(value, str):
+        return value if len(value) <= limit else f"{value[:limit]}… [{len(value) - limit} more chars]"
+    if isinstance(value, dict):
+        return {k: truncate(v, limit) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        items = [truncate(v, limit) for v in value[:MAX_LIST_ITEMS]]
+        if len(value) > MAX_LIST_ITEMS:
+            items.append(f"… [{len(value) - MAX_LIST_ITEMS} more items]")
+        return items
+    return value
+
+
+def log_payload(msg: str, payload, level: int = logging.INFO, sample_rate: float = 0.01) -> None:
+    """Log a truncated payload, and the full one at DEBUG for a sample of calls."""
+    logger.log(level, msg, extra={"payload": truncate(payload)})
+    if logger.isEnabledFor(logging.DEBUG) and random.random() < sample_rate:
+        logger.debug(msg + " (full payload)", extra={"payload": payload})
+
+
+class CorrelationFilter(logging.Filter):
+    """Runs in the emitting thread/task, so it sees that context's run id."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.run_id = _run_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        doc = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "run_id": getattr(record, "run_id", "-"),
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED:
+                doc[key] = value
+        return json.dumps(doc, ensure_ascii=False, default=str)
+
+
+def configure_logging(
+    log_file: str = LOG_FILE,
+    level: int | str = logging.INFO,
+    max_bytes: int = 5 * 1024 * 1024,
+    backup_count: int = 3,
+    json_format: bool = True,
+) -> logging.handlers.QueueListener:
+    """
+    Attach the queue → rotating-file pipeline to `logger`. Idempotent: later
+    calls return the running listener.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    if os.path.dirname(log_file):
+        os.makedirs(os.path.dirname(log_file), exist_ok=True)
+    file_handler = logging.handlers.RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count)
+    file_handler.setFormatter(
+        JsonFormatter() if json_format
+        else logging.Formatter("%(asctime)s - %(levelname)s - [%(run_id)s] %(message)s")
+    )
+
+    queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+    queue_handler.addFilter(CorrelationFilter())
+    logger.addHandler(queue_handler)
+    logger.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(queue_handler.queue, file_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
 
-file_handler = logging.FileHandler(LOG_FILE)
-file_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
 
-logger.addHandler(file_handler)
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+        for handler in [h for h in logger.handlers if isinstance(h, logging.handlers.QueueHandler)]:
+            logger.removeHandler(handler)
@@ -1,18 +1,223 @@
 # src/observability/metrics.py
+"""
+Process-wide metrics: labelled counters and fixed-bucket histograms.
+
+All updates take a short per-metric lock and never await, so they are safe
+from threads and from concurrent asyncio tasks alike. Export with
+`metrics.snapshot()` (JSON-friendly dict) or `metrics.render_prometheus()`.
+
+    with metrics.timer("tool_duration_seconds", tool="inventory_func"):
+        ...
+
+    @metrics.timed("forecast_seconds")       # sync or async functions
+    async def run_forecast(): ...
+"""
+import functools
+import inspect
+import itertools
+import json
+import threading
 import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Seconds; spans LLM calls (sub-second to minutes) as well as fast tool calls.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _render_labels(key: tuple, extra: tuple = ()) -> str:
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str = ""):
+        self.name = name
+        self.help = help
+        self._values: dict = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(_label_key(labels), 0.0)
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return [{"labels": dict(k), "value": v} for k, v in self._values.items()]
+
+    def render(self) -> list:
+        with self._lock:
+            return [f"{self.name}{_render_labels(k)} {v:g}" for k, v in self._values.items()]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str = "", buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        # label key -> [per-bucket counts (+Inf last), sum, count]
+        self._series: dict = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][idx] += 1
+            series[1] += value
+            series[2] += 1
+
+    def quantile(self, q: float, **labels) -> float | None:
+        """Bucket-resolution quantile estimate (upper bound of the bucket)."""
+        with self._lock:
+            series = self._series.get(_label_key(labels))
+            if series is None or series[2] == 0:
+                return None
+            target = q * series[2]
+            for bound, cumulative in zip(self.buckets + (float("inf"),), itertools.accumulate(series[0])):
+                if cumulative >= target:
+                    return bound
+        return None
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return [
+                {
+                    "labels": dict(k),
+                    "count": count,
+                    "sum": round(total, 6),
+                    "buckets": dict(zip([str(b) for b in self.buckets] + ["+Inf"], itertools.accumulate(counts))),
+                }
+                for k, (counts, total, count) in self._series.items()
+            ]
+
+    def render(self) -> list:
+        lines = []
+        with self._lock:
+            for key, (counts, total, count) in self._series.items():
+                bounds = [f"{b:g}" for b in self.buckets] + ["+Inf"]
+                for bound, cumulative in zip(bounds, itertools.accumulate(counts)):
+                    lines.append(f"{self.name}_bucket{_render_labels(key, (('le', bound),))} {cumulative}")
+                lines.append(f"{self.name}_sum{_render_labels(key)} {total:g}")
+                lines.append(f"{self.name}_count{_render_labels(key)} {count}")
+        return lines
+
 
 class Metrics:
+    """Registry of named metrics plus timing helpers."""
+
     def __init__(self):
-        self.data = {}
+        self._metrics: dict = {}
+        self._lock = threading.Lock()
+        self._spans: dict = {}
+        self._span_ids = itertools.count(1)
 
-    def start(self, label):
-        self.data[label] = time.time()
+    def _get(self, cls, name: str, help: str, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, **kwargs)
+            elif not isinstance(metric, cls):
+                raise TypeError(f"metric {name!r} is already registered as a {metric.kind}")
+            return metric
 
-    def end(self, label):
-        if label in self.data:
-            duration = time.time() - self.data[label]
-            self.data[label] = duration
-            return duration
-        return None
+    def counter(self, name: str, help: str = "") -> Counter:
+        return self._get(Counter, name, help)
+
+    def histogram(self, name: str, help: str = "", buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help, buckets=buckets)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Observe the wall time of the block into histogram `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.histogram(name).observe(time.perf_counter() - start, **labels)
+
+    def timed(self, name: str, **labels):
+        """Decorator form of timer() for sync and async functions."""
+        def decorate(fn):
+            if inspect.iscoroutinefunction(fn):
+                @functools.wraps(fn)
+                async def async_wrapper(*args, **kwargs):
+                    with self.timer(name, **labels):
+                        return await fn(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.timer(name, **labels):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    # Legacy span API: every start() gets its own id, so repeated or
+    # concurrent spans with the same label no longer overwrite each other.
+    def start(self, label: str) -> int:
+        with self._lock:
+            span_id = next(self._span_ids)
+            self._spans[span_id] = (label, time.perf_counter())
+        return span_id
+
+    def end(self, label, span_id: int | None = None):
+        with self._lock:
+            if span_id is None:
+                # Most recent open span with this label.
+                span_id = next((sid for sid, (lbl, _) in reversed(self._spans.items()) if lbl == label), None)
+            span = self._spans.pop(span_id, None) if span_id is not None else None
+        if span is None:
+            return None
+        duration = time.perf_counter() - span[1]
+        self.histogram("span_duration_seconds").observe(duration, label=label)
+        return duration
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {m.name: {"type": m.kind, "help": m.help, "series": m.snapshot()} for m in metrics}
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for m in metrics:
+            if m.help:
+                lines.append(f"# HELP {m.name} {m.help}")
+            lines.append(f"# TYPE {m.name} {m.kind}")
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str) -> None:
+        """Write a snapshot: Prometheus text for *.prom, JSON otherwise."""
+        with open(path, "w") as f:
+            if path.endswith(".prom"):
+                f.write(self.render_prometheus())
+            else:
+                json.dump(self.snapshot(), f, indent=2)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._metrics.clear()
+            self._spans.clear()
 
 metrics = Metrics()
@@ -0,0 +1,182 @@
+# src/tools/admissions_feed.py
+"""
+Local file-tail source for the admissions feed.
+
+The HIS feed delivers admissions as CSV rows (date,total_admissions,
+icu_admissions). FileTailSource follows such a file the way `tail -F` does:
+each `poll()` returns only the complete rows appended since the previous
+poll, holds back a trailing partial line until it is finished, and starts
+over when the file is truncated or replaced. `follow()` polls it in the
+background and hands the rows to the live admissions store, so everything
+can be exercised offline by appending to a local file. `following()` does
+that for the length of an orchestration (`--feed` on
+scripts/run_orchestrator_text.py).
+
+    python -m src.tools.admissions_feed data/admissions_feed.csv --once --persist
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import csv
+import json
+import os
+from typing import AsyncIterator
+
+from src.observability.logger import logger
+
+from .admissions_store import LiveAdmissionsStore, close_feed, open_feed
+
+FEED_COLUMNS = ["date", "total_admissions", "icu_admissions"]
+DEFAULT_POLL_SECONDS = 1.0
+
+
+class FileTailSource:
+    """New complete CSV rows appended to `path` since the last poll."""
+
+    def __init__(self, path: str, from_end: bool = False):
+        self.path = path
+        self._offset = 0
+        self._inode: int | None = None
+        self._header: list[str] | None = None
+        self._partial = b""
+        if from_end and os.path.exists(path):
+            # Skip what is already there, but still pick up the header.
+            with open(path, "rb") as f:
+                first = f.readline()
+                self._offset = os.fstat(f.fileno()).st_size
+                self._inode = os.fstat(f.fileno()).st_ino
+            self._read_header(first.decode().strip())
+
+    def _read_header(self, line: str) -> bool:
+        """Take `line` as the header if it is one; otherwise assume FEED_COLUMNS."""
+        fields = next(csv.reader([line]), [])
+        is_header = "date" in fields
+        self._header = fields if is_header else list(FEED_COLUMNS)
+        return is_header
+
+    def poll(self) -> list[dict[str, str]]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+        if st.st_ino != self._inode or st.st_size < self._offset:
+            # New file (rotation) or truncated: read it from the top.
+            self._inode, self._offset, self._partial, self._header = st.st_ino, 0, b"", None
+        if st.st_size == self._offset:
+            return []
+
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            chunk = f.read(st.st_size - self._offset)
+        self._offset += len(chunk)
+        *lines, self._partial = (self._partial + chunk).split(b"\n")
+
+        rows = []
+        for raw in lines:
+            line = raw.decode(errors="replace").strip()
+            if not line:
+                continue
+            if self._header is None and self._read_header(line):
+                continue
+            rows.append(dict(zip(self._header, next(csv.reader([line])))))
+        return rows
+
+
+def ingest(source: FileTailSource, feed: LiveAdmissionsStore) -> int:
+    """Move whatever the source has into the feed; returns rows accepted."""
+    rows = source.poll()
+    return feed.append(rows) if rows else 0
+
+
+async def follow(
+    source: FileTailSource,
+    feed: LiveAdmissionsStore | None = None,
+    interval: float = DEFAULT_POLL_SECONDS,
+    stop: asyncio.Event | None = None,
+) -> None:
+    """Poll `source` every `interval` seconds until `stop` is set (default feed: the current data dir's)."""
+    feed = feed or open_feed()
+    while True:
+        try:
+            accepted = await asyncio.to_thread(ingest, source, feed)
+            if accepted:
+                logger.info("Ingested %d admissions rows from %s", accepted, source.path)
+        except OSError as e:
+            logger.warning("Admissions feed %s unreadable: %s", source.path, e)
+        if stop is None:
+            await asyncio.sleep(interval)
+            continue
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+            return
+        except asyncio.TimeoutError:
+            pass
+
+
+@contextlib.asynccontextmanager
+async def following(
+    path: str, interval: float = DEFAULT_POLL_SECONDS, persist: bool = False
+) -> AsyncIterator[LiveAdmissionsStore]:
+    """
+    Tail `path` into the current data dir's live store inside the block: the
+    rows already in the file are ingested before it starts, new ones every
+    `interval` seconds. The feed is closed afterwards, so later reads go back
+    to the CSV (which, with `persist`, holds the ingested rows).
+    """
+    source = FileTailSource(path)
+    feed = open_feed(persist=persist)
+    stop = asyncio.Event()
+    try:
+        accepted = await asyncio.to_thread(ingest, source, feed)
+        logger.info("Following admissions feed %s (%d rows ingested)", path, accepted)
+        task = asyncio.create_task(follow(source, feed, interval, stop))
+        try:
+            yield feed
+        finally:
+            stop.set()
+            await task
+    finally:
+        close_feed(feed.csv_path)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Tail an admissions CSV into the live admissions store.")
+    parser.add_argument("path", help="CSV file the feed appends to")
+    parser.add_argument("--interval", type=float, default=DEFAULT_POLL_SECONDS)
+    parser.add_argument("--from-end", action="store_true", help="skip rows already in the file")
+    parser.add_argument("--once", action="store_true", help="ingest what is there, print the stats and exit")
+    parser.add_argument(
+        "--persist", action="store_true", help="also append accepted rows to the history CSV (kept after exit)"
+    )
+    args = parser.parse_args(argv)
+
+    source = FileTailSource(args.path, from_end=args.from_end)
+    feed = open_feed(persist=args.persist)
+    if args.once:
+        print(f"ingested {ingest(source, feed)} rows")
+        print(json.dumps(feed.summary(), indent=2))
+        return
+
+    async def run() -> None:
+        task = asyncio.create_task(follow(source, feed, args.interval))
+        last = None
+        try:
+            while True:
+                await asyncio.sleep(args.interval)
+                stats = feed.summary()
+                if stats != last:
+                    print(json.dumps(stats))
+                    last = stats
+        finally:
+            task.cancel()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
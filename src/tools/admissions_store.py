@@ -0,0 +1,441 @@
+# src/tools/admissions_store.py
+"""
+Date-indexed, columnar store over <data dir>/historical_admissions.csv.
+
+The CSV is parsed once into three int32 columns (date ordinal, total
+admissions, ICU admissions) and written to a small binary sidecar in a .cache/
+directory next to it. Later opens memory-map the sidecar instead of re-parsing the
+CSV, and the sidecar is only rebuilt when the CSV mtime/size change.
+
+New rows from a live feed go through `open_feed()`: it returns a
+LiveAdmissionsStore seeded from the CSV once, which takes rows with
+`append()` and from then on serves every reader of that CSV in the process
+(`get_admissions_store()` returns it), so fresh data never triggers a
+rescan. Both kinds of store keep RollingStats (7/14/28-day means,
+day-of-week baselines, ICU ratio); appending a row updates them in O(1).
+"""
+from __future__ import annotations
+
+import csv
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date
+from math import sqrt
+from typing import Any, Iterable
+
+from src.observability.logger import logger
+from src.observability.metrics import metrics
+
+from .data_paths import data_path
+from .snapshot_cache import file_stamp, snapshot_cache
+
+ADMISSIONS_CSV = "historical_admissions.csv"
+CACHE_SUBDIR = ".cache"
+
+# magic, format version, source mtime_ns, source size, row count
+_HEADER = struct.Struct("<4sIqqI")
+_MAGIC = b"HSAD"
+_VERSION = 1
+
+# Trailing windows (in daily rows) kept by RollingStats.
+ROLLING_WINDOWS = (7, 14, 28)
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+def _to_ordinal(value: date | str) -> int:
+    if isinstance(value, str):
+        value = date.fromisoformat(value)
+    return value.toordinal()
+
+
+def _parse_csv(csv_path: str) -> tuple[array, array, array]:
+    """
+    Parse the CSV into sorted columns. Several rows for the same date
+    (e.g. one per ward) are summed into a single daily row.
+    """
+    per_day: dict[int, list[int]] = {}
+    with open(csv_path, newline="") as f:
+        for row in csv.DictReader(f):
+            day = _to_ordinal(row["date"])
+            acc = per_day.setdefault(day, [0, 0])
+            acc[0] += int(row["total_admissions"])
+            acc[1] += int(row["icu_admissions"])
+
+    dates, totals, icu = array("i"), array("i"), array("i")
+    for day in sorted(per_day):
+        dates.append(day)
+        totals.append(per_day[day][0])
+        icu.append(per_day[day][1])
+    return dates, totals, icu
+
+
+def _parse_row(row: dict[str, Any]) -> tuple[int, int, int]:
+    """(date ordinal, total, ICU) from a CSV-style row; raises ValueError/KeyError on bad input."""
+    day = row["date"]
+    total, icu = int(row["total_admissions"]), int(row["icu_admissions"])
+    if total < 0 or icu < 0:
+        raise ValueError(f"negative admissions for {day}")
+    return _to_ordinal(day if isinstance(day, date) else str(day).strip()), total, icu
+
+
+@dataclass
+class WindowStats:
+    """Aggregates over the last `days` daily rows."""
+    days: int
+    mean: float
+    std: float
+    icu_ratio: float
+
+    @property
+    def cv(self) -> float:
+        return self.std / self.mean if self.mean else 0.0
+
+
+class RollingStats:
+    """
+    Rolling aggregates over a store's columns: per trailing window the sums
+    of totals, squared totals and ICU, plus per-weekday and all-history sums.
+
+    The store calls `appended()` after adding a newest row and `updated()`
+    after changing a row in place; both are O(1). Anything else (a row
+    inserted before the newest) needs `rebuild()`.
+    """
+
+    def __init__(self, dates, totals, icu, windows: tuple[int, ...] = ROLLING_WINDOWS):
+        self._columns = (dates, totals, icu)
+        self.windows = tuple(sorted(windows))
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Recompute everything from the columns (O(n))."""
+        dates, totals, icu = self._columns
+        n = len(dates)
+        # window -> [sum of totals, sum of squared totals, sum of ICU]
+        self._window = {w: [0, 0, 0] for w in self.windows}
+        # weekday -> [rows, sum of totals, sum of ICU]
+        self._weekday = [[0, 0, 0] for _ in WEEKDAYS]
+        self._total = self._icu = 0
+        for i in range(n):
+            self._add_history(dates[i], totals[i], icu[i], 1)
+            for w, acc in self._window.items():
+                if i >= n - w:
+                    self._add(acc, totals[i], icu[i], 1)
+
+    @staticmethod
+    def _add(acc: list[int], total: int, icu: int, sign: int) -> None:
+        acc[0] += sign * total
+        acc[1] += sign * total * total
+        acc[2] += sign * icu
+
+    def _add_history(self, ordinal: int, total: int, icu: int, sign: int) -> None:
+        weekday = self._weekday[(ordinal - 1) % 7]     # ordinal 1 is a Monday
+        weekday[0] += sign
+        weekday[1] += sign * total
+        weekday[2] += sign * icu
+        self._total += sign * total
+        self._icu += sign * icu
+
+    def appended(self) -> None:
+        """The newest row was just appended."""
+        dates, totals, icu = self._columns
+        n = len(dates)
+        self._add_history(dates[-1], totals[-1], icu[-1], 1)
+        for w, acc in self._window.items():
+            self._add(acc, totals[-1], icu[-1], 1)
+            if n > w:
+                self._add(acc, totals[n - w - 1], icu[n - w - 1], -1)
+
+    def updated(self, i: int, old_total: int, old_icu: int) -> None:
+        """Row `i` changed in place from (old_total, old_icu)."""
+        dates, totals, icu = self._columns
+        n = len(dates)
+        self._add_history(dates[i], old_total, old_icu, -1)
+        self._add_history(dates[i], totals[i], icu[i], 1)
+        for w, acc in self._window.items():
+            if i >= n - w:
+                self._add(acc, old_total, old_icu, -1)
+                self._add(acc, totals[i], icu[i], 1)
+
+    def window(self, days: int) -> WindowStats:
+        """Mean, std and ICU ratio of the last `days` rows (one of `windows`)."""
+        if days not in self._window:
+            raise KeyError(f"window {days} is not tracked (tracked: {self.windows})")
+        total, squares, icu = self._window[days]
+        n = min(days, len(self._columns[0]))
+        if n == 0:
+            return WindowStats(days, 0.0, 0.0, 0.0)
+        mean = total / n
+        return WindowStats(days, mean, sqrt(max(squares / n - mean * mean, 0.0)), icu / max(total, 1))
+
+    def weekday_means(self) -> dict[str, float]:
+        """Mean daily admissions per weekday over the whole history."""
+        return {name: total / rows for name, (rows, total, _) in zip(WEEKDAYS, self._weekday) if rows}
+
+    def summary(self) -> dict[str, Any]:
+        """Everything above, rounded, as tool output."""
+        dates = self._columns[0]
+        n = len(dates)
+        mean = self._total / n if n else 0.0
+        out: dict[str, Any] = {
+            "days": n,
+            "last_date": date.fromordinal(dates[-1]).isoformat() if n else None,
+        }
+        for w in self.windows:
+            out[f"mean_{w}d"] = round(self.window(w).mean, 1)
+        out[f"icu_ratio_{self.windows[-1]}d"] = round(self.window(self.windows[-1]).icu_ratio, 4)
+        out["icu_ratio"] = round(self._icu / max(self._total, 1), 4)
+        out["weekday_mean"] = {k: round(v, 1) for k, v in self.weekday_means().items()}
+        out["weekday_factor"] = {k: round(v / mean, 3) for k, v in self.weekday_means().items()} if mean else {}
+        return out
+
+
+class AdmissionsStore:
+    """
+    Read-only columnar view of daily admissions, sorted oldest → newest.
+
+    Columns are either memoryviews over the mmapped sidecar or plain
+    in-memory arrays when no sidecar could be written.
+    """
+
+    def __init__(self, dates, totals, icu, source_stamp: tuple[int, int]):
+        self.dates = dates
+        self.totals = totals
+        self.icu = icu
+        self.source_stamp = source_stamp
+        self._stats: RollingStats | None = None
+
+    @property
+    def stats(self) -> RollingStats:
+        """Rolling aggregates, computed on first use."""
+        if self._stats is None:
+            self._stats = RollingStats(self.dates, self.totals, self.icu)
+        return self._stats
+
+    def columns(self) -> tuple[Any, Any, Any]:
+        """(dates, totals, ICU) columns; safe to hold while the store is in use."""
+        return self.dates, self.totals, self.icu
+
+    def rolling(self, days: int) -> WindowStats:
+        """Aggregates over the last `days` rows (one of ROLLING_WINDOWS)."""
+        return self.stats.window(days)
+
+    def summary(self) -> dict[str, Any]:
+        """Rolling aggregates as tool output."""
+        return self.stats.summary()
+
+    @classmethod
+    def open(cls, csv_path: str, cache_dir: str | None = None) -> "AdmissionsStore":
+        """Open the store, rebuilding the binary sidecar if the CSV changed."""
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.dirname(csv_path), CACHE_SUBDIR)
+        stamp = file_stamp(csv_path)
+        sidecar = os.path.join(cache_dir, os.path.basename(csv_path) + ".bin")
+
+        store = cls._open_sidecar(sidecar, stamp)
+        if store is not None:
+            return store
+
+        dates, totals, icu = _parse_csv(csv_path)
+        try:
+            cls._write_sidecar(sidecar, stamp, dates, totals, icu)
+        except OSError:
+            # Read-only deployments still work, just without the sidecar.
+            return cls(dates, totals, icu, stamp)
+        return cls._open_sidecar(sidecar, stamp) or cls(dates, totals, icu, stamp)
+
+    @classmethod
+    def _open_sidecar(cls, sidecar: str, stamp: tuple[int, int]) -> "AdmissionsStore | None":
+        try:
+            with open(sidecar, "rb") as f:
+                if os.fstat(f.fileno()).st_size < _HEADER.size:
+                    return None
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        magic, version, mtime_ns, size, count = _HEADER.unpack_from(buf, 0)
+        width = array("i").itemsize
+        if (
+            magic != _MAGIC
+            or version != _VERSION
+            or (mtime_ns, size) != stamp
+            or len(buf) != _HEADER.size + 3 * count * width
+        ):
+            buf.close()
+            return None
+
+        view = memoryview(buf)[_HEADER.size:].cast("i")
+        return cls(view[:count], view[count:2 * count], view[2 * count:], stamp)
+
+    @staticmethod
+    def _write_sidecar(sidecar: str, stamp: tuple[int, int], dates: array, totals: array, icu: array) -> None:
+        os.makedirs(os.path.dirname(sidecar), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(sidecar), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, _VERSION, stamp[0], stamp[1], len(dates)))
+                dates.tofile(f)
+                totals.tofile(f)
+                icu.tofile(f)
+            # Atomic swap: readers holding the old mmap keep the old inode.
+            os.replace(tmp, sidecar)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def _rows(self, lo: int, hi: int, newest_first: bool) -> list[dict[str, Any]]:
+        indices = range(hi - 1, lo - 1, -1) if newest_first else range(lo, hi)
+        return [
+            {
+                "date": date.fromordinal(self.dates[i]).isoformat(),
+                "total_admissions": self.totals[i],
+                "icu_admissions": self.icu[i],
+            }
+            for i in indices
+        ]
+
+    def last(self, days: int) -> list[dict[str, Any]]:
+        """Last N days of admissions, newest → oldest."""
+        if days <= 0:
+            return []
+        n = len(self.dates)
+        return self._rows(max(0, n - days), n, newest_first=True)
+
+    def between(self, start: date | str, end: date | str) -> list[dict[str, Any]]:
+        """Admissions for start..end (inclusive), oldest → newest."""
+        lo = bisect_left(self.dates, _to_ordinal(start))
+        hi = bisect_right(self.dates, _to_ordinal(end))
+        return self._rows(lo, hi, newest_first=False)
+
+
+class LiveAdmissionsStore(AdmissionsStore):
+    """
+    AdmissionsStore over in-memory columns that also accepts new rows.
+
+    Rows for a date already present are added to it (as in the CSV, where a
+    day may have one row per ward); rows for a new newest date are appended.
+    Both are O(1) including the RollingStats update. A row older than the
+    newest date that is missing from the history is inserted in place, which
+    costs O(n). With `persist`, accepted rows are also appended to the CSV.
+    """
+
+    def __init__(self, base: AdmissionsStore, csv_path: str, persist: bool = False):
+        super().__init__(array("i", base.dates), array("i", base.totals), array("i", base.icu), base.source_stamp)
+        self.csv_path = csv_path
+        self.persist = persist
+        self._lock = threading.RLock()
+        self._stats = RollingStats(self.dates, self.totals, self.icu)
+
+    def append(self, rows: Iterable[dict[str, Any]]) -> int:
+        """Ingest rows with date/total_admissions/icu_admissions; returns how many were accepted."""
+        accepted: list[tuple[int, int, int]] = []
+        with self._lock:
+            for row in rows:
+                try:
+                    day, total, icu = _parse_row(row)
+                except (KeyError, TypeError, ValueError) as e:
+                    logger.warning("Skipping admissions row %r: %s", row, e)
+                    metrics.counter("admissions_rows_rejected_total", "Admissions feed rows rejected").inc()
+                    continue
+                self._ingest(day, total, icu)
+                accepted.append((day, total, icu))
+            if accepted and self.persist:
+                with open(self.csv_path, "a", newline="") as f:
+                    writer = csv.writer(f)
+                    for day, total, icu in accepted:
+                        writer.writerow([date.fromordinal(day).isoformat(), total, icu])
+        if accepted:
+            metrics.counter("admissions_rows_ingested_total", "Admissions feed rows ingested").inc(len(accepted))
+        return len(accepted)
+
+    def _ingest(self, day: int, total: int, icu: int) -> None:
+        n = len(self.dates)
+        if n == 0 or day > self.dates[-1]:
+            self.dates.append(day)
+            self.totals.append(total)
+            self.icu.append(icu)
+            self._stats.appended()
+            return
+        i = n - 1 if day == self.dates[-1] else bisect_left(self.dates, day)
+        if self.dates[i] == day:
+            old_total, old_icu = self.totals[i], self.icu[i]
+            self.totals[i] += total
+            self.icu[i] += icu
+            self._stats.updated(i, old_total, old_icu)
+            return
+        self.dates.insert(i, day)
+        self.totals.insert(i, total)
+        self.icu.insert(i, icu)
+        self._stats.rebuild()
+
+    def columns(self) -> tuple[array, array, array]:
+        """Copies of the columns: appends must not find them exported to NumPy."""
+        with self._lock:
+            return array("i", self.dates), array("i", self.totals), array("i", self.icu)
+
+    def last(self, days: int) -> list[dict[str, Any]]:
+        with self._lock:
+            return super().last(days)
+
+    def between(self, start: date | str, end: date | str) -> list[dict[str, Any]]:
+        with self._lock:
+            return super().between(start, end)
+
+    def rolling(self, days: int) -> WindowStats:
+        with self._lock:
+            return self._stats.window(days)
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            return self._stats.summary()
+
+
+_feeds: dict[str, LiveAdmissionsStore] = {}
+_feeds_lock = threading.Lock()
+
+
+def open_feed(csv_path: str | None = None, persist: bool = False) -> LiveAdmissionsStore:
+    """
+    The live store for a CSV (default: the current data dir's), created from
+    the CSV on first use. Until `close_feed()`, every reader of that CSV in
+    this process is served from it. persist=True also turns persistence on
+    for a feed that is already open; it is never turned off here.
+    """
+    path = os.path.abspath(csv_path or data_path(ADMISSIONS_CSV))
+    with _feeds_lock:
+        feed = _feeds.get(path)
+        if feed is None:
+            feed = _feeds[path] = LiveAdmissionsStore(snapshot_cache.get(path, AdmissionsStore.open), path, persist)
+        elif persist and not feed.persist:
+            with feed._lock:
+                feed.persist = True
+        return feed
+
+
+def close_feed(csv_path: str | None = None) -> None:
+    """Stop serving the live store; readers go back to the CSV."""
+    with _feeds_lock:
+        _feeds.pop(os.path.abspath(csv_path or data_path(ADMISSIONS_CSV)), None)
+
+
+def get_admissions_store(csv_path: str | None = None) -> AdmissionsStore:
+    """
+    The live store if a feed is open for the CSV, otherwise the shared store
+    per CSV, reopened only when its mtime/size change.
+    """
+    path = csv_path or data_path(ADMISSIONS_CSV)
+    if _feeds:
+        feed = _feeds.get(os.path.abspath(path))
+        if feed is not None:
+            return feed
+    return snapshot_cache.get(path, AdmissionsStore.open)
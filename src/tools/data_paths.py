@@ -0,0 +1,38 @@
+# src/tools/data_paths.py
+"""
+Where the tools read their CSVs from.
+
+Tools name their files relative to a data directory ("roster.csv", ...) and
+resolve them with `data_path()`. The directory defaults to `data/` and can be
+switched per run with `use_data_dir()`; it is a ContextVar, so concurrent
+runs for different hospitals (each in its own asyncio task) each see their
+own directory, including inside tool threads ADK spawns for them.
+"""
+from __future__ import annotations
+
+import contextvars
+import os
+from contextlib import contextmanager
+
+DATA_DIR = "data"
+
+_data_dir = contextvars.ContextVar("data_dir", default=DATA_DIR)
+
+
+def current_data_dir() -> str:
+    return _data_dir.get()
+
+
+def data_path(name: str) -> str:
+    """Path of a data file in the current run's data directory."""
+    return os.path.join(_data_dir.get(), name)
+
+
+@contextmanager
+def use_data_dir(path: str):
+    """Resolve data files under `path` inside the block (and tasks it spawns)."""
+    token = _data_dir.set(path)
+    try:
+        yield path
+    finally:
+        _data_dir.reset(token)
@@ -2,11 +2,15 @@
 from __future__ import annotations
 from google.adk.tools import FunctionTool
 from typing import Any
-from .hospital_data_tools import read_recent_admissions
+from .hospital_data_tools import read_admissions_stats, read_recent_admissions
 
-def hospital_admissions_func(days: int = 14) -> list[dict[str, Any]]:
-    """Reads recent hospital patient admissions (last N days)."""
-    return read_recent_admissions(days)
+def hospital_admissions_func(days: int = 14) -> dict[str, Any]:
+    """
+    Reads recent hospital patient admissions (last N days, newest first) and
+    rolling statistics: 7/14/28-day mean admissions, ICU ratio and mean
+    admissions per weekday.
+    """
+    return {"admissions": read_recent_admissions(days), "rolling_stats": read_admissions_stats()}
 
 class HospitalAdmissionsTool(FunctionTool):
     """
@@ -1,21 +1,26 @@
 # src/tools/hospital_data_tools.py
-import csv
-from datetime import datetime, timedelta
+from datetime import date
+
+from .admissions_store import get_admissions_store
 
 def read_recent_admissions(days: int = 14):
     """
-    Reads the last N days of admissions from the CSV.
+    Reads the last N days of admissions (the CSV plus any rows ingested
+    through an open feed).
     Returns a list of dicts sorted newest → oldest.
     """
-    rows = []
-    with open("data/historical_admissions.csv") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            rows.append({
-                "date": row["date"],
-                "total_admissions": int(row["total_admissions"]),
-                "icu_admissions": int(row["icu_admissions"])
-            })
-    rows.sort(key=lambda x: x["date"], reverse=True)
+    return get_admissions_store().last(days)
+
+def read_admissions_range(start: date | str, end: date | str):
+    """
+    Reads admissions between two dates (inclusive).
+    Returns a list of dicts sorted oldest → newest.
+    """
+    return get_admissions_store().between(start, end)
 
-    return rows[:days]
+def read_admissions_stats():
+    """
+    Rolling admissions statistics (7/14/28-day means, ICU ratio, weekday
+    baselines), kept up to date as feed rows arrive.
+    """
+    return get_admissions_store().summary()
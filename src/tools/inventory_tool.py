@@ -2,16 +2,23 @@
 from __future__ import annotations
 import csv
 from google.adk.tools import FunctionTool
+from .data_paths import data_path
+from .snapshot_cache import snapshot_cache
 
-def inventory_func() -> dict[str, int]:
-    """Reads inventory levels of critical medical supplies."""
+INVENTORY_CSV = "inventory.csv"
+
+def _load_inventory(path: str) -> dict[str, int]:
     result = {}
-    with open("data/inventory.csv") as f:
+    with open(path) as f:
         reader = csv.DictReader(f)
         for row in reader:
             result[row["item"]] = int(row["units_in_stock"])
     return result
 
+def inventory_func() -> dict[str, int]:
+    """Reads inventory levels of critical medical supplies."""
+    return dict(snapshot_cache.get(data_path(INVENTORY_CSV), _load_inventory))
+
 class InventoryTool(FunctionTool):
     """Reads inventory levels of critical medical supplies."""
     def __init__(self):
@@ -0,0 +1,388 @@
+# src/tools/occupancy_sim_tool.py
+"""
+Discrete-event bed and ICU occupancy simulation.
+
+Daily admission counts say nothing about occupancy: a patient admitted today
+holds a bed for days. This simulates individual patients:
+
+  - arrivals: Poisson number per day (the forecast's expected admissions,
+    or the numeric baseline), spread uniformly over the day; each is an ICU
+    patient with the day's expected ICU share
+  - length of stay: lognormal; ICU patients hold an ICU bed for their ICU
+    stay, then a ward bed for a step-down stay
+  - capacity: an ICU patient arriving to a full ICU boards on a ward bed;
+    a patient arriving to a full hospital is diverted
+
+While nobody is turned away the census is just arrivals minus discharges,
+so it is counted for a batch of replications at once (sorted times and
+searchsorted); only replications in which the ICU fills or the hospital
+diverts replay their patients through the event loop, where discharges sit
+in heaps keyed by time. The hospital starts with the census left by the last
+WARMUP_DAYS of the admissions history. Replications differ only in their
+random draws; per day the result reports end-of-day bed and ICU occupancy
+percentiles and the share of replications in which the ICU or the whole
+hospital filled up.
+"""
+from __future__ import annotations
+
+import heapq
+from typing import Any
+
+import numpy as np
+from google.adk.tools import FunctionTool
+
+from .surge_forecast_tool import admissions_history, expected_load
+
+TOTAL_BEDS = 2000
+ICU_BEDS = 120
+# (mean days, coefficient of variation) of each lognormal stay.
+WARD_LOS = (6.0, 0.8)
+ICU_LOS = (4.0, 0.7)
+STEP_DOWN_LOS = (3.0, 0.6)
+WARMUP_DAYS = 28
+DEFAULT_REPLICATIONS = 100
+# Keeps a 2,000-bed run well under a second (about 1 ms per replication).
+MAX_REPLICATIONS = 500
+QUANTILES = (0.1, 0.5, 0.9)
+# Replications simulated together (bounds the arrays to a few MB each).
+BATCH = 250
+
+
+def _lognormal_params(*stays: tuple[float, float]) -> tuple[np.ndarray, np.ndarray]:
+    """(mu, sigma) of the lognormal with each (mean, coefficient of variation) in `stays`."""
+    mean, cv = np.array(stays, dtype=float).T
+    sigma2 = np.log1p(cv * cv)
+    return np.log(mean) - sigma2 / 2, np.sqrt(sigma2)
+
+
+def _lognormal(rng: np.random.Generator, los: tuple[float, float], size: int) -> np.ndarray:
+    (mu,), (sigma,) = _lognormal_params(los)
+    return rng.lognormal(mu, sigma, size)
+
+
+def _arrivals(
+    rng: np.random.Generator,
+    admissions: np.ndarray,
+    icu_share: np.ndarray,
+    first_day: int,
+    replications: int,
+    ordered: bool = True,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Replication, arrival time (days from the simulation start; if `ordered`,
+    sorted within each replication) and ICU flag of every patient.
+    """
+    days = len(admissions)
+    counts = rng.poisson(np.maximum(admissions, 0.0), size=(replications, days))
+    rep = np.repeat(np.arange(replications), counts.sum(axis=1))
+    offsets = np.repeat(np.tile(np.arange(days, dtype=float), replications), counts.ravel()) + rng.random(len(rep))
+    if ordered:
+        # Sorting rep * span + offset keeps each replication's block in place.
+        span = 2.0 ** np.ceil(np.log2(days + 1))
+        offsets = np.sort(rep * span + offsets) - rep * span
+    day = np.minimum(offsets.astype(int), days - 1)
+    icu = rng.random(len(rep)) < icu_share[day]
+    return rep, offsets + first_day, icu
+
+
+def _leave_times(rng: np.random.Generator, times: np.ndarray, icu: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    When each patient leaves their bed and (ICU patients; meaningless for the
+    others) the ICU. One normal per patient gives the ICU or ward stay, one
+    more per ICU patient the step-down.
+    """
+    kind = icu.view(np.int8)
+    mu, sigma = _lognormal_params(WARD_LOS, ICU_LOS)
+    first = rng.standard_normal(len(times))
+    first *= sigma[kind]
+    first += mu[kind]
+    np.exp(first, out=first)
+    first += times
+    bed_leave = first.copy()
+    bed_leave[icu] += _lognormal(rng, STEP_DOWN_LOS, int(icu.sum()))
+    return bed_leave, first
+
+
+class _ByReplication:
+    """
+    Times of every replication in one sorted array of keys
+    `rep * span + time + offset` (replication first, then time): one
+    searchsorted counts, in every replication at once, the times up to a point.
+    """
+
+    def __init__(
+        self,
+        rep: np.ndarray,
+        times: np.ndarray,
+        layout: tuple[float, float, int],
+        keep_last: int | None = None,
+        ordered: bool = False,
+    ):
+        self.span, self.offset, replications = layout
+        self.keys = rep * self.span + (times + self.offset)
+        if not ordered:
+            self.keys.sort()
+        bounds = np.searchsorted(self.keys, np.arange(replications + 1) * self.span)
+        if keep_last is not None and (np.diff(bounds) > keep_last).any():
+            # At most `keep_last` per replication: the latest ones.
+            keep = np.arange(len(self.keys)) >= np.repeat(bounds[1:], np.diff(bounds)) - keep_last
+            self.keys = self.keys[keep]
+            bounds = np.searchsorted(self.keys, np.arange(replications + 1) * self.span)
+        self.start, self.end = bounds[:-1], bounds[1:]
+
+    def of(self, r: int) -> np.ndarray:
+        """Replication `r`'s times, sorted."""
+        return self.keys[self.start[r]:self.end[r]] - (r * self.span + self.offset)
+
+
+def _census(
+    warm: _ByReplication,
+    arrivals: _ByReplication,
+    leave: _ByReplication,
+    rep: np.ndarray,
+    day: np.ndarray,
+    ends: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Census with every arrival admitted, in all replications at once: right
+    after each arrival (`rep` / `day` are its replication and day), at each
+    end of day (`ends` holds their keys, replications x horizon) and each
+    day's peak (the previous close or any arrival that day). `warm` and
+    `leave` hold discharge times.
+    """
+    keys = arrivals.keys
+    after = (
+        warm.end[rep] - np.searchsorted(warm.keys, keys, side="right")
+        + np.arange(1, len(keys) + 1) - arrivals.start[rep]
+        - (np.searchsorted(leave.keys, keys, side="right") - leave.start[rep])
+    )
+    end_of_day = (
+        warm.end[:, None] - np.searchsorted(warm.keys, ends, side="right")
+        + np.searchsorted(keys, ends) - arrivals.start[:, None]
+        - (np.searchsorted(leave.keys, ends, side="right") - leave.start[:, None])
+    )
+    peaks = np.concatenate(((warm.end - warm.start)[:, None], end_of_day[:, :-1]), axis=1)
+    np.maximum.at(peaks, (rep, day), after)
+    return after, end_of_day, peaks
+
+
+def _event_loop(
+    warm_beds: list[float],
+    warm_icu: list[float],
+    times: np.ndarray,
+    is_icu: list[bool],
+    bed_leave: list[float],
+    icu_leave: list[float],
+    horizon: int,
+    beds: int,
+    icu_beds: int,
+) -> np.ndarray:
+    """One replication patient by patient, over both heaps (sorted warm-up lists are valid heaps)."""
+    bed_heap, icu_heap = warm_beds, warm_icu
+    out = np.zeros((horizon, 6))
+    pop, push = heapq.heappop, heapq.heappush
+    day, day_end = 0, 1.0
+    peak_beds, peak_icu = len(bed_heap), len(icu_heap)
+    for i, t in enumerate(times.tolist()):
+        while t >= day_end:                                          # close finished days
+            while bed_heap and bed_heap[0] <= day_end:
+                pop(bed_heap)
+            while icu_heap and icu_heap[0] <= day_end:
+                pop(icu_heap)
+            out[day, 0:4] += (len(bed_heap), len(icu_heap), peak_beds, peak_icu)
+            day, day_end = day + 1, day_end + 1.0
+            peak_beds, peak_icu = len(bed_heap), len(icu_heap)
+        while bed_heap and bed_heap[0] <= t:
+            pop(bed_heap)
+        while icu_heap and icu_heap[0] <= t:
+            pop(icu_heap)
+        if len(bed_heap) >= beds:
+            out[day, 5] += 1
+            continue
+        if is_icu[i]:
+            if len(icu_heap) < icu_beds:
+                push(icu_heap, icu_leave[i])
+                peak_icu = max(peak_icu, len(icu_heap))
+            else:
+                out[day, 4] += 1                                     # boards on a ward bed
+        push(bed_heap, bed_leave[i])
+        peak_beds = max(peak_beds, len(bed_heap))
+
+    while day < horizon:                                             # days after the last arrival
+        while bed_heap and bed_heap[0] <= day_end:
+            pop(bed_heap)
+        while icu_heap and icu_heap[0] <= day_end:
+            pop(icu_heap)
+        out[day, 0:4] += (len(bed_heap), len(icu_heap), peak_beds, peak_icu)
+        day, day_end = day + 1, day_end + 1.0
+        peak_beds, peak_icu = len(bed_heap), len(icu_heap)
+    return out
+
+
+def _simulate(
+    rng: np.random.Generator,
+    warmup: tuple[np.ndarray, np.ndarray],
+    admissions: np.ndarray,
+    icu_share: np.ndarray,
+    beds: int,
+    icu_beds: int,
+    replications: int,
+    event_loop_only: bool = False,
+) -> np.ndarray:
+    """
+    A batch of replications; returns (replications, horizon, 6): beds and
+    ICU at end of day, bed/ICU peaks, ICU boarders, diversions.
+
+    While nobody is turned away the census is a count, so it is computed for
+    every replication at once; only replications where the ICU fills (their
+    ICU arrivals) or the hospital diverts someone run the event loop.
+    `event_loop_only` runs it for all of them (the reference the counts
+    must match).
+    """
+    horizon = len(admissions)
+    w_rep, w_times, w_icu = _arrivals(rng, *warmup, -len(warmup[0]), replications, ordered=False)
+    w_bed_leave, w_icu_leave = _leave_times(rng, w_times, w_icu)
+    rep, times, icu = _arrivals(rng, admissions, icu_share, 0, replications)
+    bed_leave, icu_leave = _leave_times(rng, times, icu)
+
+    offset = float(len(warmup[0]))                                   # earliest warm-up arrival
+    latest = max(float(horizon), bed_leave.max(initial=0.0), w_bed_leave.max(initial=0.0))
+    layout = (2.0 ** np.ceil(np.log2(latest + offset + 2)), offset, replications)
+    ends = np.arange(replications)[:, None] * layout[0] + (np.arange(1, horizon + 1) + offset)
+
+    # Warm-up census: history patients still in hospital at time 0.
+    in_bed, in_icu = w_bed_leave > 0, w_icu & (w_icu_leave > 0)
+    warm_beds = _ByReplication(w_rep[in_bed], w_bed_leave[in_bed], layout, keep_last=beds)
+    warm_icu = _ByReplication(w_rep[in_icu], w_icu_leave[in_icu], layout, keep_last=icu_beds)
+
+    arrivals = _ByReplication(rep, times, layout, ordered=True)
+    icu_arrivals = _ByReplication(rep[icu], times[icu], layout, ordered=True)
+    icu_times, icu_stay = times[icu], icu_leave[icu]
+
+    runs = np.zeros((replications, horizon, 6))
+    if event_loop_only:
+        diverting = icu_filling = range(replications)
+    else:
+        day = times.astype(int)
+        after, runs[:, :, 0], runs[:, :, 2] = _census(
+            warm_beds, arrivals, _ByReplication(rep, bed_leave, layout), rep, day, ends
+        )
+        icu_after, runs[:, :, 1], runs[:, :, 3] = _census(
+            warm_icu, icu_arrivals, _ByReplication(rep[icu], icu_stay, layout), rep[icu], day[icu], ends
+        )
+        diverting = np.unique(rep[after > beds])
+        icu_filling = np.setdiff1d(np.unique(rep[icu][icu_after > icu_beds]), diverting)
+
+    # A full ICU only changes what happens to ICU arrivals (boarders keep their bed).
+    for r in icu_filling:
+        part = slice(icu_arrivals.start[r], icu_arrivals.end[r])
+        stays = icu_stay[part].tolist()
+        runs[r][:, [1, 3, 4]] = _event_loop(
+            [], warm_icu.of(r).tolist(), icu_times[part], [True] * len(stays), stays, stays,
+            horizon, len(stays) + 1, icu_beds,
+        )[:, [1, 3, 4]]
+    for r in diverting:
+        part = slice(arrivals.start[r], arrivals.end[r])
+        runs[r] = _event_loop(
+            warm_beds.of(r).tolist(), warm_icu.of(r).tolist(), times[part], icu[part].tolist(),
+            bed_leave[part].tolist(), icu_leave[part].tolist(), horizon, beds, icu_beds,
+        )
+    return runs
+
+
+def simulate_occupancy(
+    admissions: np.ndarray,
+    icu_admissions: np.ndarray,
+    warmup_admissions: np.ndarray,
+    warmup_icu: np.ndarray,
+    dates: list[str],
+    beds: int = TOTAL_BEDS,
+    icu_beds: int = ICU_BEDS,
+    replications: int = DEFAULT_REPLICATIONS,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Per-day occupancy percentiles over `replications` runs of the event simulation."""
+    admissions = np.asarray(admissions, dtype=float)
+    share = np.divide(icu_admissions, admissions, out=np.zeros(len(admissions)), where=admissions > 0)
+    w_adm = np.asarray(warmup_admissions, dtype=float)
+    w_share = np.divide(warmup_icu, w_adm, out=np.zeros(len(w_adm)), where=w_adm > 0)
+
+    rng = np.random.default_rng(seed)
+    runs = np.concatenate([
+        _simulate(rng, (w_adm, w_share), admissions, share, beds, icu_beds, min(BATCH, replications - done))
+        for done in range(0, replications, BATCH)
+    ])
+    bed_q = np.quantile(runs[:, :, 0], QUANTILES, axis=0)
+    icu_q = np.quantile(runs[:, :, 1], QUANTILES, axis=0)
+    icu_full = (runs[:, :, 3] >= icu_beds).mean(axis=0)
+    beds_full = (runs[:, :, 2] >= beds).mean(axis=0)
+
+    daily = []
+    for d, day in enumerate(dates):
+        entry = {"date": day, "expected_admissions": int(round(admissions[d]))}
+        for i, q in enumerate(QUANTILES):
+            entry[f"beds_occupied_p{round(q * 100)}"] = int(round(bed_q[i, d]))
+        for i, q in enumerate(QUANTILES):
+            entry[f"icu_occupied_p{round(q * 100)}"] = int(round(icu_q[i, d]))
+        entry.update(
+            prob_icu_full=round(float(icu_full[d]), 3),
+            prob_beds_full=round(float(beds_full[d]), 3),
+            icu_boarded_mean=round(float(runs[:, d, 4].mean()), 1),
+            diverted_mean=round(float(runs[:, d, 5].mean()), 1),
+        )
+        daily.append(entry)
+
+    saturation = next((e["date"] for e in daily if e["prob_icu_full"] >= 0.5), None)
+    return {
+        "beds": beds,
+        "icu_beds": icu_beds,
+        "replications": replications,
+        "daily": daily,
+        "icu_saturation_date": saturation,
+        "assumptions": [
+            f"Stays are lognormal: ward mean {WARD_LOS[0]:g} d, ICU mean {ICU_LOS[0]:g} d "
+            f"then {STEP_DOWN_LOS[0]:g} d step-down on a ward bed.",
+            f"Starting census from the last {len(w_adm)} days of admissions history.",
+            "ICU patients arriving to a full ICU board on a ward bed; arrivals to a full hospital are diverted.",
+        ],
+        "notes": (
+            f"ICU likely full (≥50% of runs) from {saturation}." if saturation
+            else "ICU does not fill in most runs over the horizon."
+        ),
+    }
+
+
+def occupancy_sim_func(
+    expected_admissions: list[float] | None = None,
+    expected_icu_admissions: list[float] | None = None,
+    start_date: str | None = None,
+    horizon_days: int = 7,
+    beds: int = TOTAL_BEDS,
+    icu_beds: int = ICU_BEDS,
+    replications: int = DEFAULT_REPLICATIONS,
+) -> dict[str, Any]:
+    """
+    Simulates patient-level bed and ICU occupancy (arrivals, lengths of stay,
+    ICU step-down) over the horizon and returns per-day occupancy percentiles
+    (p10/p50/p90), the probability that the ICU or the hospital is full, ICU
+    boarders and diversions. Pass the forecast's per-day expected admissions
+    (and ICU admissions); with none, the numeric surge baseline is used.
+    """
+    load = expected_load(expected_admissions, expected_icu_admissions, start_date, horizon_days)
+    _, totals, icu = admissions_history()
+    return simulate_occupancy(
+        load.admissions,
+        load.icu,
+        totals[-WARMUP_DAYS:],
+        icu[-WARMUP_DAYS:],
+        load.dates,
+        beds=max(1, int(beds)),
+        icu_beds=max(1, int(icu_beds)),
+        replications=int(np.clip(replications, 1, MAX_REPLICATIONS)),
+    )
+
+
+class OccupancySimTool(FunctionTool):
+    """Discrete-event simulation of bed and ICU occupancy over the horizon."""
+    def __init__(self):
+        super().__init__(func=occupancy_sim_func)
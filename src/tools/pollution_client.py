@@ -0,0 +1,209 @@
+# src/tools/pollution_client.py
+"""
+Pooled, cached client for the OpenWeatherMap air-pollution forecast.
+
+- One pooled HTTP session per event loop (async) / per process (sync);
+  `aclose()` closes the sessions of every loop that is still open.
+- TTL cache keyed on (lat, lon) rounded to ~1 km.
+- Identical in-flight async lookups share a single upstream request.
+- Stale-while-revalidate: an expired entry is served immediately while a
+  background refresh runs, and is used as a fallback if the upstream fails.
+  Both paths mark it `"stale": True`, plus `"error"` once a refresh of it
+  has failed.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from src.config import POLLUTION_API_KEY, POLLUTION_API_URL
+
+if TYPE_CHECKING:  # imported lazily: both add noticeably to cold start
+    import httpx
+    import requests
+
+Key = tuple[float, float]
+
+
+class PollutionClient:
+    def __init__(
+        self,
+        base_url: str | None = None,
+        api_key: str | None = None,
+        ttl_seconds: float = 30 * 60,
+        stale_seconds: float = 6 * 60 * 60,
+        timeout: float = 10.0,
+        precision: int = 2,
+        max_entries: int = 256,
+    ):
+        self.base_url = base_url or POLLUTION_API_URL
+        self.api_key = api_key if api_key is not None else POLLUTION_API_KEY
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.timeout = timeout
+        self.precision = precision
+        self.max_entries = max_entries
+
+        self._cache: dict[Key, tuple[float, dict[str, Any]]] = {}
+        self._errors: dict[Key, str] = {}  # last failed refresh of a cached key
+        self._lock = threading.Lock()
+        # Sessions and in-flight tasks are bound to the loop that made them.
+        self._async_sessions: dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+        self._inflight: dict[asyncio.AbstractEventLoop, dict[Key, asyncio.Task]] = {}
+        self._sync_session: requests.Session | None = None
+
+    # ---- cache ---------------------------------------------------------
+
+    def _key(self, lat: float, lon: float) -> Key:
+        return round(float(lat), self.precision), round(float(lon), self.precision)
+
+    def _params(self, key: Key) -> dict[str, Any]:
+        return {"lat": key[0], "lon": key[1], "appid": self.api_key}
+
+    def _lookup(self, key: Key) -> tuple[dict[str, Any] | None, float]:
+        """Cached payload and its age in seconds (payload None if absent/too old)."""
+        with self._lock:
+            entry = self._cache.get(key)
+        if entry is None:
+            return None, float("inf")
+        age = time.monotonic() - entry[0]
+        if age > self.ttl_seconds + self.stale_seconds:
+            return None, age
+        return entry[1], age
+
+    def _store(self, key: Key, payload: dict[str, Any]) -> None:
+        with self._lock:
+            self._cache.pop(key, None)
+            self._errors.pop(key, None)
+            self._cache[key] = (time.monotonic(), payload)
+            while len(self._cache) > self.max_entries:
+                oldest = next(iter(self._cache))
+                del self._cache[oldest]
+                self._errors.pop(oldest, None)
+
+    def _failed(self, key: Key, error: Exception) -> str:
+        with self._lock:
+            if key in self._cache:
+                self._errors[key] = str(error)
+        return str(error)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._errors.clear()
+
+    @staticmethod
+    def _fallback(payload: dict[str, Any] | None, error: str | None) -> dict[str, Any]:
+        """`payload` marked stale (with the refresh error, if any); without one, just the error."""
+        if payload is None:
+            return {"error": error, "data": None}
+        if error is None:
+            return {**payload, "stale": True}
+        return {**payload, "stale": True, "error": error}
+
+    # ---- async path ----------------------------------------------------
+
+    def _session(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._async_sessions.get(loop)
+        if session is not None:
+            return session
+        import httpx
+
+        session = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+        with self._lock:
+            # A closed loop's connections went down with it; only forget them.
+            for old in [old for old in self._async_sessions if old.is_closed()]:
+                del self._async_sessions[old]
+                self._inflight.pop(old, None)
+            self._async_sessions[loop] = session
+            self._inflight[loop] = {}
+        return session
+
+    def _inflight_tasks(self) -> dict[Key, asyncio.Task]:
+        self._session()
+        return self._inflight[asyncio.get_running_loop()]
+
+    async def _fetch(self, key: Key) -> dict[str, Any]:
+        try:
+            response = await self._session().get(self.base_url, params=self._params(key))
+            response.raise_for_status()
+            payload = response.json()
+        except Exception as e:
+            self._failed(key, e)
+            raise
+        self._store(key, payload)
+        return payload
+
+    def _fetch_coalesced(self, key: Key) -> asyncio.Task:
+        inflight = self._inflight_tasks()
+        task = inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(key))
+            inflight[key] = task
+            task.add_done_callback(lambda t, k=key: inflight.pop(k, None))
+            # Background refreshes may never be awaited; keep errors quiet.
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return task
+
+    async def forecast(self, lat: float, lon: float) -> dict[str, Any]:
+        key = self._key(lat, lon)
+        payload, age = self._lookup(key)
+        if payload is not None and age <= self.ttl_seconds:
+            return payload
+        if payload is not None:
+            self._fetch_coalesced(key)
+            with self._lock:
+                error = self._errors.get(key)
+            return self._fallback(payload, error)
+        try:
+            return await asyncio.shield(self._fetch_coalesced(key))
+        except Exception as e:
+            return self._fallback(None, str(e))
+
+    async def aclose(self) -> None:
+        """Close the sessions of this loop and of loops still running in other threads."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            sessions = list(self._async_sessions.items())
+            self._async_sessions.clear()
+            self._inflight.clear()
+        for owner, session in sessions:
+            if owner is loop:
+                await session.aclose()
+            elif owner.is_running():
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(session.aclose(), owner))
+            elif not owner.is_closed():
+                # Idle loop: its session can only be closed on it, by aclose() there.
+                with self._lock:
+                    self._async_sessions.setdefault(owner, session)
+                    self._inflight.setdefault(owner, {})
+
+    # ---- sync path -----------------------------------------------------
+
+    def forecast_sync(self, lat: float, lon: float) -> dict[str, Any]:
+        key = self._key(lat, lon)
+        payload, age = self._lookup(key)
+        if payload is not None and age <= self.ttl_seconds:
+            return payload
+        if self._sync_session is None:
+            import requests
+
+            self._sync_session = requests.Session()
+        try:
+            response = self._sync_session.get(self.base_url, params=self._params(key), timeout=self.timeout)
+            response.raise_for_status()
+            fresh = response.json()
+        except Exception as e:
+            return self._fallback(payload, self._failed(key, e))
+        self._store(key, fresh)
+        return fresh
+
+
+pollution_client = PollutionClient()
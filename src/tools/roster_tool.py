@@ -2,16 +2,23 @@
 from __future__ import annotations
 import csv
 from google.adk.tools import FunctionTool
+from .data_paths import data_path
+from .snapshot_cache import snapshot_cache
 
-def staff_roster_func() -> dict[str, int]:
-    """Returns current baseline staffing counts (doctors/nurses/support)."""
+ROSTER_CSV = "roster.csv"
+
+def _load_roster(path: str) -> dict[str, int]:
     result = {}
-    with open("data/roster.csv") as f:
+    with open(path) as f:
         reader = csv.DictReader(f)
         for row in reader:
             result[row["role"]] = int(row["baseline_count"])
     return result
 
+def staff_roster_func() -> dict[str, int]:
+    """Returns current baseline staffing counts (doctors/nurses/support)."""
+    return dict(snapshot_cache.get(data_path(ROSTER_CSV), _load_roster))
+
 class StaffRosterTool(FunctionTool):
     """Returns current baseline staffing counts (doctors/nurses/support)."""
     def __init__(self):
@@ -0,0 +1,170 @@
+# src/tools/scenario_sweep_tool.py
+"""
+Monte Carlo what-if sweep over the surge drivers, for forecast_agent.
+
+Instead of re-running the orchestrator once per scenario ("what if AQI hits
+400", "what if the festival shifts a day"), the baseline decomposition from
+surge_forecast_tool is sampled `samples` times in one NumPy pass, each
+sample drawing:
+
+  - day-to-day noise: lognormal with the history's residual spread
+  - trend: level shock that widens with the forecast step
+  - festival: timing shifted by up to ±`festival_shift_days` and the peak
+    uplift scaled by a lognormal intensity
+  - pollution: the daily PM2.5 forecast (or `pm25_override`) times a
+    lognormal forecast error, through the same lag-0..2 coefficients
+
+Per day the result gives admission quantiles and the probability of
+exceeding `capacity` (default: the highest daily admissions in the history).
+"""
+from __future__ import annotations
+
+from datetime import date
+from typing import Any
+
+import numpy as np
+from google.adk.tools import FunctionTool
+
+from .pollution_client import pollution_client
+from .surge_forecast_tool import (
+    PM25_LAG_COEFFS,
+    PM25_THRESHOLD,
+    TREND_WINDOW_DAYS,
+    admissions_history,
+    baseline_components,
+    daily_pm25,
+    festival_uplift,
+)
+
+DEFAULT_SAMPLES = 5000
+MAX_SAMPLES = 100_000
+QUANTILES = (0.1, 0.5, 0.9)
+FESTIVAL_INTENSITY_SIGMA = 0.25   # lognormal spread of the festival peak uplift
+PM25_ERROR_SIGMA = 0.3            # lognormal PM2.5 forecast error
+TREND_SHOCK_SIGMA = 0.01          # per-step growth of the level uncertainty
+FESTIVAL_ON_TIME_PROB = 0.6       # the rest is split evenly over the shifted dates
+
+
+def sample_admissions(
+    dates: np.ndarray,
+    totals: np.ndarray,
+    horizon_days: int = 7,
+    start_ordinal: int | None = None,
+    pm25_by_date: dict[int, float] | None = None,
+    pm25_override: float | None = None,
+    festival_shift_days: int = 1,
+    samples: int = DEFAULT_SAMPLES,
+    seed: int = 0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """(future date ordinals, sampled admissions of shape (samples, horizon))."""
+    dates = np.asarray(dates, dtype=np.int64)
+    totals = np.asarray(totals, dtype=float)
+    parts = baseline_components(dates, totals, horizon_days, start_ordinal)
+    future, horizon = parts.future, len(parts.future)
+    rng = np.random.default_rng(seed)
+
+    noise = rng.lognormal(0.0, parts.residual_sigma, size=(samples, horizon))
+    trend_sd = TREND_SHOCK_SIGMA * np.sqrt(np.arange(1, horizon + 1))
+    trend = parts.trend_level[None, :] * np.exp(rng.standard_normal((samples, 1)) * trend_sd[None, :])
+
+    # Festival uplift for every possible shift, then one shift per sample.
+    shifts = np.arange(-festival_shift_days, festival_shift_days + 1)
+    by_shift = np.stack([festival_uplift(future - shift)[0] for shift in shifts])
+    probs = np.full(len(shifts), (1.0 - FESTIVAL_ON_TIME_PROB) / max(len(shifts) - 1, 1))
+    probs[shifts == 0] = FESTIVAL_ON_TIME_PROB if len(shifts) > 1 else 1.0
+    chosen = rng.choice(len(shifts), size=samples, p=probs)
+    intensity = rng.lognormal(0.0, FESTIVAL_INTENSITY_SIGMA, size=(samples, 1))
+    festival = 1.0 + by_shift[chosen] * intensity
+
+    # PM2.5 for the horizon plus the lag days before it.
+    lags = len(PM25_LAG_COEFFS)
+    days = np.arange(future[0] - lags + 1, future[-1] + 1)
+    if pm25_override is not None:
+        pm = np.full(len(days), float(pm25_override))
+    else:
+        pm = np.array([(pm25_by_date or {}).get(int(d), np.nan) for d in days])
+    if np.isnan(pm).all():
+        pollution = np.ones((samples, horizon))
+    else:
+        sampled = np.nan_to_num(pm)[None, :] * rng.lognormal(0.0, PM25_ERROR_SIGMA, size=(samples, len(days)))
+        excess = np.maximum(sampled - PM25_THRESHOLD, 0.0)
+        # lagged[s, d, lag] = excess on day d - lag
+        window = np.lib.stride_tricks.sliding_window_view(excess, lags, axis=1)[:, :, ::-1]
+        pollution = 1.0 + window @ PM25_LAG_COEFFS
+
+    return future, np.maximum(trend * parts.dow[None, :] * festival * pollution * noise, 0.0)
+
+
+def scenario_sweep(
+    dates: np.ndarray,
+    totals: np.ndarray,
+    capacity: float | None = None,
+    quantiles: tuple[float, ...] = QUANTILES,
+    **kwargs: Any,
+) -> dict[str, Any]:
+    """Per-day quantiles and capacity-exceedance probabilities over the sampled scenarios."""
+    future, sampled = sample_admissions(dates, totals, **kwargs)
+    capacity_note = "as given" if capacity is not None else "the highest daily admissions in the history"
+    capacity = float(capacity if capacity is not None else np.max(totals))
+    qs = np.quantile(sampled, quantiles, axis=0)            # (quantile, day)
+    exceeds = sampled > capacity
+    recent_mean = float(np.mean(np.asarray(totals, dtype=float)[-TREND_WINDOW_DAYS:]))
+
+    daily = []
+    for d, day in enumerate(future.tolist()):
+        entry = {"date": date.fromordinal(day).isoformat(), "mean_admissions": int(round(sampled[:, d].mean()))}
+        entry.update({f"p{round(q * 100)}": int(round(qs[i, d])) for i, q in enumerate(quantiles)})
+        entry["prob_exceeds_capacity"] = round(float(exceeds[:, d].mean()), 3)
+        daily.append(entry)
+
+    return {
+        "samples": int(sampled.shape[0]),
+        "capacity": round(capacity),
+        "prob_any_day_exceeds_capacity": round(float(exceeds.any(axis=1).mean()), 3),
+        "peak_day_p90": max(daily, key=lambda e: e[f"p{round(quantiles[-1] * 100)}"])["date"],
+        "daily": daily,
+        "notes": (
+            f"Monte Carlo over day noise, trend, festival timing/intensity and PM2.5 error "
+            f"(recent mean {recent_mean:.0f}/day); capacity {capacity:.0f} is {capacity_note}."
+        ),
+    }
+
+
+async def scenario_sweep_func(
+    horizon_days: int = 7,
+    lat: float | None = None,
+    lon: float | None = None,
+    start_date: str | None = None,
+    pm25_override: float | None = None,
+    festival_shift_days: int = 1,
+    capacity: float | None = None,
+    samples: int = DEFAULT_SAMPLES,
+) -> dict[str, Any]:
+    """
+    Samples thousands of driver combinations (noise, trend, festival timing and
+    intensity, PM2.5) around the numeric baseline and returns per-day admission
+    quantiles (p10/p50/p90) and the probability of exceeding `capacity`
+    admissions per day. Use it for what-if questions: e.g. pm25_override=250
+    for a severe-AQI scenario, festival_shift_days for uncertain festival
+    timing. lat/lon add the PM2.5 forecast.
+    """
+    pm25 = daily_pm25(await pollution_client.forecast(lat, lon)) if lat is not None and lon is not None else {}
+    start = date.fromisoformat(start_date).toordinal() if start_date else None
+    dates, totals, _ = admissions_history()
+    return scenario_sweep(
+        dates,
+        totals,
+        capacity=capacity,
+        horizon_days=horizon_days,
+        start_ordinal=start,
+        pm25_by_date=pm25,
+        pm25_override=pm25_override,
+        festival_shift_days=max(0, int(festival_shift_days)),
+        samples=int(np.clip(samples, 100, MAX_SAMPLES)),
+    )
+
+
+class ScenarioSweepTool(FunctionTool):
+    """Monte Carlo sweep over surge drivers: per-day quantiles and capacity risk."""
+    def __init__(self):
+        super().__init__(func=scenario_sweep_func)
@@ -0,0 +1,86 @@
+# src/tools/snapshot_cache.py
+"""
+Shared, mtime-aware snapshot cache for the CSV-backed tools.
+
+Every tool in src/tools/ loads its file through `snapshot_cache.get(path, loader)`.
+Entries are keyed on (path, loader) and validated against the file's
+(mtime_ns, size) with a single stat(), so hot tool calls are a dict lookup
+instead of file I/O. The cache is LRU-bounded and thread-safe.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+def file_stamp(path: str) -> tuple[int, int]:
+    """(mtime_ns, size) of a file; changes whenever the file is rewritten."""
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+class SnapshotCache:
+    """
+    LRU cache of parsed file snapshots, invalidated by file mtime/size.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, Callable], tuple[tuple[int, int], Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, path: str, loader: Callable[[str], T]) -> T:
+        """Return loader(path), re-running the loader only if the file changed."""
+        key = (os.path.abspath(path), loader)
+        stamp = file_stamp(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        # Parse outside the lock so a slow load does not block other files.
+        value = loader(path)
+        with self._lock:
+            self._entries[key] = (stamp, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def version(self, path: str) -> str:
+        """Short version tag for a file's current snapshot (for cache keys)."""
+        mtime_ns, size = file_stamp(path)
+        return f"{mtime_ns:x}-{size:x}"
+
+    def invalidate(self, path: str | None = None) -> None:
+        """Drop cached snapshots for one file, or everything if path is None."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                return
+            target = os.path.abspath(path)
+            for key in [k for k in self._entries if k[0] == target]:
+                del self._entries[key]
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+            }
+
+
+snapshot_cache = SnapshotCache()
@@ -0,0 +1,138 @@
+# src/tools/staffing_calculator_tool.py
+"""
+Deterministic staffing calculator for staffing_agent.
+
+Given per-day expected admissions and ICU admissions (from the forecast, or
+the numeric baseline when none are passed), each day's load is split across
+shifts and converted to required headcount per role with patient-to-staff
+ratios, separately for ward and ICU patients:
+
+    required[role, day, shift] = ceil(ward_load / ward_ratio + icu_load / icu_ratio)
+    additional[role, day]      = Σ_shift max(0, required − rostered on that shift)
+
+The whole horizon is one array computation. The result follows
+STAFFING_SCHEMA_DESCRIPTION, so the agent only has to explain it.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+from google.adk.tools import FunctionTool
+
+from .roster_tool import staff_roster_func
+from .surge_forecast_tool import expected_load
+
+SHIFTS = ("day", "evening", "night")
+# Share of the daily patient load handled by each shift; the roster's
+# baseline headcount is assumed to be spread across shifts the same way.
+SHIFT_SHARE = np.array([0.5, 0.3, 0.2])
+
+# role -> per shift (ward patients per staff member, ICU patients per staff member).
+# Calibrated so the baseline roster covers a typical day (~210 admissions).
+STAFF_RATIOS: dict[str, dict[str, tuple[float, float]]] = {
+    "doctor": {"day": (6.0, 2.0), "evening": (6.5, 2.0), "night": (8.0, 3.0)},
+    "nurse": {"day": (2.8, 1.0), "evening": (3.0, 1.0), "night": (3.0, 1.5)},
+    "support": {"day": (4.2, 4.0), "evening": (4.5, 4.0), "night": (4.5, 6.0)},
+}
+# Output field per role, as named in STAFFING_SCHEMA_DESCRIPTION.
+PLAN_FIELDS = {
+    "doctor": "recommended_additional_doctors",
+    "nurse": "recommended_additional_nurses",
+    "support": "recommended_support_staff",
+}
+# Extra headcount beyond this share of the roster calls for escalation.
+ESCALATION_SHARE = 0.25
+
+
+def staffing_plan(
+    expected_admissions: np.ndarray,
+    expected_icu: np.ndarray,
+    roster: dict[str, int],
+    risk_levels: list[str],
+    dates: list[str],
+    ratios: dict[str, dict[str, tuple[float, float]]] = STAFF_RATIOS,
+    shift_share: np.ndarray = SHIFT_SHARE,
+) -> dict[str, Any]:
+    """Per-day additional headcount for every role in `ratios`."""
+    total = np.maximum(np.asarray(expected_admissions, dtype=float), 0.0)
+    icu = np.clip(np.asarray(expected_icu, dtype=float), 0.0, total)
+    roles = list(ratios)
+
+    # (role, shift, [ward, icu]) patients per staff member
+    ratio = np.array([[ratios[r][s] for s in SHIFTS] for r in roles], dtype=float)
+    # (kind, day, shift) patient load
+    load = np.stack([total - icu, icu])[:, :, None] * shift_share[None, None, :]
+    # (role, day, shift)
+    required = np.ceil(
+        load[0][None] / ratio[:, None, :, 0] + load[1][None] / ratio[:, None, :, 1] - 1e-9
+    )
+    rostered = np.array([roster.get(r, 0) for r in roles], dtype=float)[:, None] * shift_share[None, :]
+    gap = np.maximum(required - np.floor(rostered)[:, None, :], 0.0)
+    additional = gap.sum(axis=2).astype(int)          # (role, day)
+    busiest_shift = gap.argmax(axis=2)                 # (role, day)
+
+    per_day = []
+    for d, day in enumerate(dates):
+        plan = {"date": day, "risk_level": risk_levels[d]}
+        for i, role in enumerate(roles):
+            plan[PLAN_FIELDS.get(role, f"recommended_additional_{role}")] = int(additional[i, d])
+        if additional[:, d].any():
+            worst = int(np.argmax(additional[:, d]))
+            note = f"largest gap: {roles[worst]}s on the {SHIFTS[busiest_shift[worst, d]]} shift"
+        else:
+            note = "baseline roster covers expected load"
+        plan["notes"] = f"~{total[d]:.0f} admissions ({icu[d]:.0f} ICU); {note}"
+        per_day.append(plan)
+
+    peak = additional.max(axis=1) if len(dates) else np.zeros(len(roles), dtype=int)
+    stretched = [
+        f"{role} +{int(peak[i])} (roster {roster.get(role, 0)})"
+        for i, role in enumerate(roles)
+        if peak[i] > ESCALATION_SHARE * max(roster.get(role, 0), 1)
+    ]
+    if stretched:
+        escalation = (
+            f"Peak extra demand exceeds {ESCALATION_SHARE:.0%} of the roster for: {', '.join(stretched)}. "
+            "Activate on-call pools and cancel non-urgent leave, arrange overflow with partner hospitals, "
+            "and postpone elective surgery on the peak days."
+        )
+    else:
+        escalation = (
+            "Extra demand is within overtime and on-call capacity; keep on-call staff reachable and "
+            "re-check the plan if the forecast rises."
+        )
+
+    assumptions = [
+        "Patient load split across shifts: " + ", ".join(f"{s} {share:.0%}" for s, share in zip(SHIFTS, shift_share)),
+        "Baseline roster is spread across shifts in the same proportions.",
+        "Patients per staff member (ward/ICU): " + "; ".join(
+            f"{r} " + ", ".join(f"{s} {ratios[r][s][0]:g}/{ratios[r][s][1]:g}" for s in SHIFTS) for r in roles
+        ),
+    ]
+    return {"assumptions": assumptions, "per_day_plan": per_day, "escalation_plan": escalation}
+
+
+def staffing_plan_func(
+    expected_admissions: list[float] | None = None,
+    expected_icu_admissions: list[float] | None = None,
+    risk_levels: list[str] | None = None,
+    start_date: str | None = None,
+    horizon_days: int = 7,
+) -> dict[str, Any]:
+    """
+    Computes the per-day staffing plan (additional doctors, nurses and support
+    staff) for a whole horizon from expected daily admissions. Pass the
+    forecast's per-day expected admissions (and ICU admissions / risk levels
+    when known); with no admissions, the numeric surge baseline is used.
+    """
+    load = expected_load(expected_admissions, expected_icu_admissions, start_date, horizon_days)
+    if not risk_levels or len(risk_levels) != len(load.dates):
+        risk_levels = load.risk_levels
+    return staffing_plan(load.admissions, load.icu, staff_roster_func(), list(risk_levels), load.dates)
+
+
+class StaffingPlanTool(FunctionTool):
+    """Computes a per-day staffing plan from expected admissions and the roster."""
+    def __init__(self):
+        super().__init__(func=staffing_plan_func)
@@ -0,0 +1,232 @@
+# src/tools/supply_planner_tool.py
+"""
+Numeric supply engine for supply_agent.
+
+Consumption is projected per item and day from the expected load:
+
+    use[item, day] = per_admission × (admissions − ICU) + per_icu_admission × ICU
+
+and, for every item at once:
+
+  - days of cover: days until cumulative use exceeds current stock
+  - reorder point: use over the supplier lead time + safety stock, where
+    safety stock = z × demand variability × mean daily use × √lead time
+  - order quantity: up to use over (lead time + horizon) + safety stock,
+    rounded up to whole packs. If the total cost exceeds `budget`, the part
+    of each order needed to get back to the reorder point is funded first,
+    most urgent items first, then the remainder in the same order.
+
+Usage rates, lead times, pack sizes and costs come from
+<data dir>/supply_params.csv (DEFAULT_SUPPLY_PARAMS when absent). The result
+follows SUPPLY_SCHEMA_DESCRIPTION, one entry per item.
+"""
+from __future__ import annotations
+
+import csv
+from datetime import date, timedelta
+from typing import Any
+
+import numpy as np
+from google.adk.tools import FunctionTool
+
+from .data_paths import data_path
+from .inventory_tool import inventory_func
+from .snapshot_cache import snapshot_cache
+from .surge_forecast_tool import DailyLoad, expected_load
+
+SUPPLY_PARAMS_CSV = "supply_params.csv"
+
+# Used when the data directory has no supply_params.csv.
+DEFAULT_SUPPLY_PARAMS: dict[str, dict[str, Any]] = {
+    "oxygen_cylinders": {"category": "oxygen", "per_admission": 0.03, "per_icu_admission": 0.5,
+                         "lead_time_days": 2, "pack_size": 1, "unit_cost": 1500.0},
+    "n95_masks": {"category": "PPE and masks", "per_admission": 3.0, "per_icu_admission": 12.0,
+                  "lead_time_days": 5, "pack_size": 50, "unit_cost": 60.0},
+    "iv_fluids": {"category": "IV fluids", "per_admission": 0.3, "per_icu_admission": 2.0,
+                  "lead_time_days": 3, "pack_size": 10, "unit_cost": 80.0},
+    "paracetamol_tablets": {"category": "emergency drugs", "per_admission": 6.0, "per_icu_admission": 10.0,
+                            "lead_time_days": 4, "pack_size": 100, "unit_cost": 1.0},
+}
+SERVICE_Z = 1.65  # ~95% chance of not stocking out during the lead time
+PRIORITIES = np.array(["low", "medium", "high", "critical"])
+
+
+def _load_supply_params(path: str) -> dict[str, dict[str, Any]]:
+    result = {}
+    with open(path) as f:
+        for row in csv.DictReader(f):
+            result[row["item"]] = {
+                "category": row.get("category") or row["item"],
+                "per_admission": float(row["per_admission"]),
+                "per_icu_admission": float(row["per_icu_admission"]),
+                "lead_time_days": int(row["lead_time_days"]),
+                "pack_size": int(row.get("pack_size") or 1),
+                "unit_cost": float(row.get("unit_cost") or 0.0),
+            }
+    return result
+
+
+def supply_params() -> dict[str, dict[str, Any]]:
+    try:
+        return snapshot_cache.get(data_path(SUPPLY_PARAMS_CSV), _load_supply_params)
+    except FileNotFoundError:
+        return DEFAULT_SUPPLY_PARAMS
+
+
+def _fit_budget(
+    qty: np.ndarray, pack: np.ndarray, unit_cost: np.ndarray, urgency: np.ndarray, budget: float
+) -> tuple[np.ndarray, float]:
+    """Whole packs of each order that fit in `budget`, most urgent first; returns (funded, budget left)."""
+    funded = np.zeros_like(qty)
+    pack_cost = pack * unit_cost
+    for i in np.argsort(-urgency, kind="stable"):
+        packs = qty[i] / pack[i]
+        if pack_cost[i] > 0:
+            packs = min(packs, budget // pack_cost[i])
+        funded[i] = packs * pack[i]
+        budget -= packs * pack_cost[i]
+    return funded, budget
+
+
+def supply_plan(
+    load: DailyLoad,
+    stock: dict[str, int],
+    params: dict[str, dict[str, Any]],
+    budget: float | None = None,
+    z: float = SERVICE_Z,
+) -> dict[str, Any]:
+    """Per-item cover, reorder point and order quantity for the whole horizon."""
+    items = list(stock)
+    known = np.array([item in params for item in items])
+    p = [params.get(item, {}) for item in items]
+
+    on_hand = np.array([stock[i] for i in items], dtype=float)
+    per_adm = np.array([q.get("per_admission", 0.0) for q in p])
+    per_icu = np.array([q.get("per_icu_admission", 0.0) for q in p])
+    lead = np.array([q.get("lead_time_days", 0) for q in p], dtype=int)
+    pack = np.maximum(np.array([q.get("pack_size", 1) for q in p], dtype=float), 1.0)
+    unit_cost = np.array([q.get("unit_cost", 0.0) for q in p])
+
+    horizon = len(load.dates)
+    ward = load.admissions - load.icu
+    use = per_adm[:, None] * ward[None, :] + per_icu[:, None] * load.icu[None, :]   # (item, day)
+    mean_use = use.mean(axis=1) if horizon else np.zeros(len(items))
+
+    # Cumulative use, extended past the horizon at the mean daily rate.
+    extra = max(int(lead.max(initial=0)), 0)
+    cumulative = np.cumsum(np.concatenate([use, np.repeat(mean_use[:, None], extra, axis=1)], axis=1), axis=1)
+    runs_out = cumulative > on_hand[:, None]
+    cover = np.where(
+        runs_out.any(axis=1),
+        runs_out.argmax(axis=1).astype(float),
+        cumulative.shape[1] + np.divide(on_hand - cumulative[:, -1], mean_use,
+                                        out=np.full(len(items), np.inf), where=mean_use > 0),
+    )
+
+    rows = np.arange(len(items))
+    lead_use = np.where(lead > 0, cumulative[rows, np.maximum(lead - 1, 0)], 0.0)
+    safety = z * load.admissions_cv * mean_use * np.sqrt(lead)
+    reorder_point = lead_use + safety
+    target = cumulative[rows, np.minimum(lead + horizon, cumulative.shape[1]) - 1] + safety
+    order_qty = np.ceil(np.maximum(target - on_hand, 0.0) / pack) * pack
+    buffer_days = np.ceil(lead + np.divide(safety, mean_use, out=np.zeros(len(items)), where=mean_use > 0))
+
+    # critical: runs out within the lead time; high: below reorder point;
+    # medium: runs out within the horizon; low: covered.
+    level = np.select(
+        [cover <= lead, on_hand <= reorder_point, cover <= horizon + lead],
+        [3, 2, 1],
+        default=0,
+    )
+    level[~known] = 0
+    order_qty[~known] = 0.0
+
+    trimmed = np.zeros(len(items), dtype=bool)
+    if budget is not None:
+        # Most urgent first: priority, then fewest days of cover.
+        urgency = level * 1e6 - np.minimum(cover, 1e5)
+        essential = np.minimum(np.ceil(np.maximum(reorder_point - on_hand, 0.0) / pack) * pack, order_qty)
+        topup = order_qty - essential
+        funded, left = _fit_budget(essential, pack, unit_cost, urgency, float(budget))
+        more, _ = _fit_budget(topup, pack, unit_cost, urgency, left)
+        funded += more
+        trimmed = funded < order_qty
+        order_qty = funded
+    cost = order_qty * unit_cost
+
+    start = date.fromisoformat(load.dates[0]) if load.dates else date.today()
+    order_by = np.floor(np.maximum(cover - lead, 0.0))
+
+    plan = []
+    for i, item in enumerate(items):
+        if not known[i]:
+            plan.append({
+                "category": item, "item": item, "current_stock_level": f"{int(on_hand[i])} units",
+                "recommended_buffer_days": 0, "recommended_order_quantity": 0, "priority": "low",
+                "notes": "no usage profile in supply_params.csv; not planned",
+            })
+            continue
+        notes = (
+            f"~{mean_use[i]:.0f}/day projected use; {cover[i]:.1f} days of cover vs "
+            f"{lead[i]}-day lead time; reorder point {int(np.ceil(reorder_point[i]))}"
+        )
+        if trimmed[i]:
+            notes += "; order reduced to fit the budget"
+        plan.append({
+            "category": p[i]["category"],
+            "item": item,
+            "current_stock_level": f"{int(on_hand[i])} units ({cover[i]:.1f} days of cover)",
+            "recommended_buffer_days": int(buffer_days[i]),
+            "recommended_order_quantity": int(order_qty[i]),
+            "priority": str(PRIORITIES[level[i]]),
+            "notes": notes,
+            "days_of_cover": round(float(min(cover[i], 999.0)), 1),
+            "reorder_point": int(np.ceil(reorder_point[i])),
+            "order_by": (start + timedelta(days=int(min(order_by[i], 3650)))).isoformat(),
+            "order_cost": round(float(cost[i]), 2),
+        })
+
+    ordering = sorted(
+        (entry for entry in plan if entry["recommended_order_quantity"] > 0),
+        key=lambda e: (e["order_by"], -list(PRIORITIES).index(e["priority"])),
+    )
+    by_date: dict[str, list[str]] = {}
+    for entry in ordering:
+        by_date.setdefault(entry["order_by"], []).append(f"{entry['item']} ×{entry['recommended_order_quantity']}")
+    timeline = "; ".join(
+        f"{'Order today' if day <= start.isoformat() else 'Order by ' + day}: {', '.join(names)}"
+        for day, names in by_date.items()
+    ) or "No orders needed within the horizon; re-check stock at the next planning cycle."
+    if budget is not None:
+        timeline += f". Total {cost.sum():,.0f} of budget {float(budget):,.0f}."
+
+    assumptions = [
+        f"Daily use = per-admission rate × ward admissions + per-ICU rate × ICU admissions, over {horizon} days.",
+        f"Safety stock covers demand variability (CV {load.admissions_cv:.0%}) over the lead time at z={z:g}.",
+        "Orders bring stock up to lead-time + horizon use plus safety stock, in whole packs.",
+    ]
+    return {"assumptions": assumptions, "per_category_plan": plan, "ordering_timeline": timeline}
+
+
+def supply_plan_func(
+    expected_admissions: list[float] | None = None,
+    expected_icu_admissions: list[float] | None = None,
+    start_date: str | None = None,
+    horizon_days: int = 7,
+    budget: float | None = None,
+) -> dict[str, Any]:
+    """
+    Projects per-item daily consumption from expected admissions and ICU load,
+    and returns days of cover, reorder points, order quantities (within
+    `budget`, if given) and priorities for every inventory item. Pass the
+    forecast's per-day expected admissions; with none, the numeric surge
+    baseline is used.
+    """
+    load = expected_load(expected_admissions, expected_icu_admissions, start_date, max(1, int(horizon_days)))
+    return supply_plan(load, inventory_func(), supply_params(), budget=budget)
+
+
+class SupplyPlanTool(FunctionTool):
+    """Computes cover, reorder points and order quantities for every stocked item."""
+    def __init__(self):
+        super().__init__(func=supply_plan_func)
@@ -0,0 +1,311 @@
+# src/tools/surge_forecast_tool.py
+"""
+Deterministic numeric surge forecast, computed before the LLM sees anything.
+
+The baseline is a vectorized NumPy decomposition of the admissions history:
+
+    expected = level(trend) × day_of_week × festival × pollution
+
+- level/trend: damped linear trend fitted on the de-seasonalized last weeks
+- day_of_week: shrunken weekday factors from the history
+- festival: calendar uplift with a lead/lag profile around each festival
+- pollution: PM2.5 lag-0..2 regressors from the pollution forecast
+
+The result follows FORECAST_SCHEMA_DESCRIPTION so forecast_agent only has to
+narrate and adjust it.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+import numpy as np
+from google.adk.tools import FunctionTool
+
+from .admissions_store import get_admissions_store
+from .pollution_client import pollution_client
+
+# Festival dates (approximate, Indian metros) and their peak-day uplift.
+FESTIVAL_CALENDAR: dict[str, tuple[float, list[str]]] = {
+    "diwali": (0.35, ["2025-10-20", "2026-11-08", "2027-10-29"]),
+    "holi": (0.20, ["2025-03-14", "2026-03-04", "2027-03-22"]),
+    "dussehra": (0.12, ["2025-10-02", "2026-10-20", "2027-10-09"]),
+    "eid": (0.08, ["2025-03-31", "2026-03-20", "2027-03-10"]),
+    "new_year": (0.15, ["2025-01-01", "2026-01-01", "2027-01-01"]),
+}
+# Share of the peak uplift applied at offsets -1..+2 days from the festival.
+FESTIVAL_PROFILE = {-1: 0.3, 0: 1.0, 1: 0.6, 2: 0.3}
+
+# PM2.5 regressors: uplift per µg/m³ above the threshold, at lags 0, 1, 2 days.
+PM25_THRESHOLD = 60.0
+PM25_LAG_COEFFS = np.array([0.0008, 0.0006, 0.0004])
+
+TREND_WINDOW_DAYS = 28
+TREND_DAMPING = 0.9
+DOW_SHRINKAGE = 2.0
+
+# expected / recent mean → risk level
+RISK_THRESHOLDS = ((1.10, "low"), (1.25, "medium"), (1.45, "high"))
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def surge_risk(ratio: np.ndarray) -> list[str]:
+    """Risk label per day from expected / recent-mean admissions."""
+    limits = [limit for limit, _ in RISK_THRESHOLDS]
+    labels = [label for _, label in RISK_THRESHOLDS] + ["critical"]
+    return [labels[i] for i in np.searchsorted(limits, np.asarray(ratio, dtype=float), side="right")]
+
+
+def admissions_history() -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (date ordinals, totals, ICU) oldest → newest, as NumPy views of the store's
+    columns: zero-copy for the CSV-backed store; with a live feed open they view
+    the copies LiveAdmissionsStore.columns() takes, so later appends never
+    change (or are blocked by) an array already handed out.
+    """
+    dates, totals, icu = get_admissions_store().columns()
+    return (
+        np.frombuffer(dates, dtype=np.intc),
+        np.frombuffer(totals, dtype=np.intc),
+        np.frombuffer(icu, dtype=np.intc),
+    )
+
+
+def festival_uplift(ordinals: np.ndarray) -> tuple[np.ndarray, list[list[str]]]:
+    """Additive festival uplift per day, and the festival names touching each day."""
+    uplift = np.zeros(len(ordinals))
+    names: list[list[str]] = [[] for _ in ordinals]
+    for name, (peak, days) in FESTIVAL_CALENDAR.items():
+        peaks = np.array([date.fromisoformat(d).toordinal() for d in days])
+        offsets = ordinals[:, None] - peaks[None, :]
+        for offset, share in FESTIVAL_PROFILE.items():
+            hit = (offsets == offset).any(axis=1)
+            uplift += hit * peak * share
+            for i in np.flatnonzero(hit):
+                names[i].append(name)
+    return uplift, names
+
+
+def daily_pm25(payload: dict[str, Any] | None) -> dict[int, float]:
+    """Daily mean PM2.5 (date ordinal → µg/m³) from an OpenWeatherMap payload."""
+    items = (payload or {}).get("list") or []
+    if not items:
+        return {}
+    dt = np.array([item["dt"] for item in items], dtype=np.int64)
+    pm = np.array([item.get("components", {}).get("pm2_5", np.nan) for item in items], dtype=float)
+    days = dt // 86400 + _EPOCH_ORDINAL
+    valid = ~np.isnan(pm)
+    uniq, inverse = np.unique(days[valid], return_inverse=True)
+    means = np.bincount(inverse, weights=pm[valid]) / np.bincount(inverse)
+    return dict(zip(uniq.tolist(), means.tolist()))
+
+
+def pollution_factor(ordinals: np.ndarray, pm25_by_date: dict[int, float]) -> np.ndarray:
+    """Multiplicative PM2.5 effect using lag-0..2 excess over the threshold."""
+    if not pm25_by_date:
+        return np.ones(len(ordinals))
+    lags = np.arange(len(PM25_LAG_COEFFS))
+    lagged_days = ordinals[:, None] - lags[None, :]
+    pm = np.vectorize(lambda d: pm25_by_date.get(int(d), np.nan), otypes=[float])(lagged_days)
+    excess = np.nan_to_num(np.maximum(pm - PM25_THRESHOLD, 0.0))
+    return 1.0 + excess @ PM25_LAG_COEFFS
+
+
+@dataclass
+class BaselineComponents:
+    """The multiplicative parts of the baseline for each future day."""
+    future: np.ndarray          # date ordinals
+    trend_level: np.ndarray
+    dow: np.ndarray
+    festival_uplift: np.ndarray
+    festivals: list[list[str]]
+    level: float
+    slope: float
+    damped_steps: np.ndarray
+    residual_sigma: float       # std of log(history / fitted), the day-to-day noise
+
+
+def baseline_components(
+    dates: np.ndarray,
+    totals: np.ndarray,
+    horizon_days: int = 7,
+    start_ordinal: int | None = None,
+) -> BaselineComponents:
+    """Fits level, trend and weekday factors on the history and projects them forward."""
+    if len(dates) == 0:
+        raise ValueError("admissions history is empty")
+    horizon_days = max(1, int(horizon_days))
+
+    # De-festivalize and estimate day-of-week factors (0 = Monday).
+    hist_uplift, _ = festival_uplift(dates)
+    clean = totals / (1.0 + hist_uplift)
+    weekday = (dates - 1) % 7
+    counts = np.bincount(weekday, minlength=7)
+    sums = np.bincount(weekday, weights=clean, minlength=7)
+    raw_dow = np.divide(sums, counts, out=np.full(7, clean.mean()), where=counts > 0) / clean.mean()
+    dow = 1.0 + (raw_dow - 1.0) * counts / (counts + DOW_SHRINKAGE)
+    deseason = clean / dow[weekday]
+
+    # Damped linear trend over the recent window.
+    window = slice(-TREND_WINDOW_DAYS, None)
+    t = (dates[window] - dates[-1]).astype(float)
+    y = deseason[window]
+    slope, level = np.polyfit(t, y, 1) if len(t) >= 3 else (0.0, y.mean())
+    slope = float(np.clip(slope, -0.02 * level, 0.02 * level))
+    fitted = np.maximum(level + slope * t, 1e-9)
+    residual_sigma = float(np.std(np.log(np.maximum(y, 1e-9) / fitted))) if len(t) >= 3 else 0.0
+
+    start = int(start_ordinal) if start_ordinal is not None else int(dates[-1]) + 1
+    future = start + np.arange(horizon_days)
+    steps = future - dates[-1]
+    damped_steps = TREND_DAMPING * (1 - TREND_DAMPING ** steps) / (1 - TREND_DAMPING)
+    fut_uplift, fut_festivals = festival_uplift(future)
+    return BaselineComponents(
+        future=future,
+        trend_level=level + slope * damped_steps,
+        dow=dow[(future - 1) % 7],
+        festival_uplift=fut_uplift,
+        festivals=fut_festivals,
+        level=float(level),
+        slope=slope,
+        damped_steps=damped_steps,
+        residual_sigma=residual_sigma,
+    )
+
+
+def baseline_forecast(
+    dates: np.ndarray,
+    totals: np.ndarray,
+    icu: np.ndarray,
+    horizon_days: int = 7,
+    start_ordinal: int | None = None,
+    pm25_by_date: dict[int, float] | None = None,
+) -> dict[str, Any]:
+    """
+    Forecast daily admissions for `horizon_days` from `start_ordinal`
+    (default: the day after the history ends). Inputs are oldest → newest.
+    """
+    dates = np.asarray(dates, dtype=np.int64)
+    totals = np.asarray(totals, dtype=float)
+    icu = np.asarray(icu, dtype=float)
+    pm25_by_date = pm25_by_date or {}
+    parts = baseline_components(dates, totals, horizon_days, start_ordinal)
+    horizon_days = len(parts.future)
+    future, fut_dow, fut_festivals = parts.future, parts.dow, parts.festivals
+    slope, level, damped_steps = parts.slope, parts.level, parts.damped_steps
+    fut_pollution = pollution_factor(future, pm25_by_date)
+    expected = np.maximum(parts.trend_level * fut_dow * (1.0 + parts.festival_uplift) * fut_pollution, 0.0)
+
+    window = slice(-TREND_WINDOW_DAYS, None)
+    recent_mean = float(totals[window].mean())
+    icu_share = float(icu[window].sum() / max(totals[window].sum(), 1.0))
+    risks = surge_risk(expected / recent_mean)
+
+    daily = []
+    for i, day in enumerate(future.tolist()):
+        drivers = [f"festival:{name}" for name in dict.fromkeys(fut_festivals[i])]
+        if fut_pollution[i] > 1.03:
+            drivers.append("pollution")
+        if fut_dow[i] > 1.05:
+            drivers.append("weekday pattern")
+        if slope * damped_steps[i] > 0.05 * level:
+            drivers.append("rising trend")
+        daily.append({
+            "date": date.fromordinal(day).isoformat(),
+            "surge_risk": risks[i],
+            "expected_admissions": int(round(expected[i])),
+            "expected_icu_admissions": int(round(expected[i] * icu_share)),
+            "main_drivers": drivers or ["baseline"],
+        })
+
+    return {
+        "horizon_days": horizon_days,
+        "daily_forecast": daily,
+        "notes": (
+            f"Numeric baseline from {len(dates)} days of history "
+            f"(recent mean {recent_mean:.0f}/day, trend {slope:+.1f}/day damped, "
+            f"ICU share {icu_share:.1%}); "
+            + ("PM2.5 lag effects included." if pm25_by_date else "no pollution data.")
+        ),
+        "baseline": {
+            "recent_mean_admissions": round(recent_mean, 1),
+            "icu_share": round(icu_share, 4),
+            "history_days": int(len(dates)),
+        },
+    }
+
+
+async def surge_baseline_func(
+    horizon_days: int = 7,
+    lat: float | None = None,
+    lon: float | None = None,
+    start_date: str | None = None,
+) -> dict[str, Any]:
+    """
+    Computes a deterministic numeric surge forecast (per-day expected
+    admissions and surge risk) from admissions history, the festival
+    calendar and, when lat/lon are given, the PM2.5 forecast.
+    """
+    pm25 = daily_pm25(await pollution_client.forecast(lat, lon)) if lat is not None and lon is not None else {}
+    start = date.fromisoformat(start_date).toordinal() if start_date else None
+    return baseline_forecast(
+        *admissions_history(),
+        horizon_days=horizon_days,
+        start_ordinal=start,
+        pm25_by_date=pm25,
+    )
+
+
+@dataclass
+class DailyLoad:
+    """Per-day expected load over a horizon, as consumed by the planning tools."""
+    dates: list[str]
+    admissions: np.ndarray
+    icu: np.ndarray
+    risk_levels: list[str]
+    recent_mean: float
+    admissions_cv: float  # day-to-day variability of recent admissions (std / mean)
+
+
+def expected_load(
+    expected_admissions: list[float] | None = None,
+    expected_icu_admissions: list[float] | None = None,
+    start_date: str | None = None,
+    horizon_days: int = 7,
+) -> DailyLoad:
+    """
+    Per-day admissions/ICU load from a forecast's numbers, or from the
+    numeric baseline (without pollution) when no admissions are given.
+    ICU defaults to the recent ICU share of admissions.
+    """
+    dates_hist, totals, icu_hist = admissions_history()
+    recent = get_admissions_store().rolling(TREND_WINDOW_DAYS)
+    recent_mean, icu_share = recent.mean, recent.icu_ratio
+
+    if expected_admissions:
+        expected = np.asarray(expected_admissions, dtype=float)
+        start = date.fromisoformat(start_date).toordinal() if start_date else int(dates_hist[-1]) + 1
+        dates = [date.fromordinal(start + i).isoformat() for i in range(len(expected))]
+        risk_levels = surge_risk(expected / recent_mean)
+    else:
+        start = date.fromisoformat(start_date).toordinal() if start_date else None
+        days = baseline_forecast(
+            dates_hist, totals, icu_hist, horizon_days=horizon_days, start_ordinal=start
+        )["daily_forecast"]
+        expected = np.array([d["expected_admissions"] for d in days], dtype=float)
+        dates = [d["date"] for d in days]
+        risk_levels = [d["surge_risk"] for d in days]
+
+    if expected_icu_admissions and len(expected_icu_admissions) == len(expected):
+        icu = np.asarray(expected_icu_admissions, dtype=float)
+    else:
+        icu = expected * icu_share
+    return DailyLoad(dates, expected, icu, risk_levels, recent_mean, recent.cv)
+
+
+class SurgeBaselineTool(FunctionTool):
+    """Computes a deterministic numeric surge forecast baseline."""
+    def __init__(self):
+        super().__init__(func=surge_baseline_func)
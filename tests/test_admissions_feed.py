@@ -0,0 +1,122 @@
+# tests/test_admissions_feed.py
+"""Live admissions feed: incremental RollingStats and the file-tail source (src/tools/admissions_feed.py)."""
+import asyncio
+import os
+import random
+from array import array
+from datetime import date, timedelta
+
+import pytest
+
+from src.tools.admissions_feed import FileTailSource, following
+from src.tools.admissions_store import AdmissionsStore, LiveAdmissionsStore, RollingStats, get_admissions_store
+from src.tools.data_paths import use_data_dir
+
+START = date(2025, 11, 1)
+HEADER = "date,total_admissions,icu_admissions\n"
+
+
+def row(day: date, total: int, icu: int) -> dict:
+    return {"date": day.isoformat(), "total_admissions": str(total), "icu_admissions": str(icu)}
+
+
+def live_store(tmp_path, days: int = 30) -> LiveAdmissionsStore:
+    dates = array("i", [(START + timedelta(days=i)).toordinal() for i in range(0, days * 2, 2)])
+    totals = array("i", [200 + i % 9 for i in range(days)])
+    icu = array("i", [20 + i % 3 for i in range(days)])
+    return LiveAdmissionsStore(AdmissionsStore(dates, totals, icu, (0, 0)), str(tmp_path / "admissions.csv"))
+
+
+def test_incremental_rolling_stats_match_a_rebuild(tmp_path):
+    feed = live_store(tmp_path)
+    rng = random.Random(7)
+    newest = date.fromordinal(feed.dates[-1])
+    for step in range(300):
+        kind = rng.random()
+        if kind < 0.5:
+            newest += timedelta(days=1)
+            day = newest  # new newest day: appended
+        elif kind < 0.8:
+            day = date.fromordinal(rng.choice(feed.dates))  # existing day: added to in place
+        else:
+            day = START + timedelta(days=2 * rng.randrange(30) + 1)  # missing older day: inserted
+        assert feed.append([row(day, rng.randrange(150, 300), rng.randrange(10, 40))]) == 1
+
+        rebuilt = RollingStats(*feed.columns())
+        assert feed.summary() == rebuilt.summary(), f"diverged after step {step}"
+        for days in (7, 14, 28):
+            assert feed.rolling(days) == rebuilt.window(days)
+
+
+def test_bad_rows_are_rejected(tmp_path):
+    feed = live_store(tmp_path)
+    rows = [{"date": "2026-01-01", "total_admissions": "x", "icu_admissions": "1"}, {"date": "2026-01-02"}]
+    assert feed.append(rows) == 0
+    assert len(feed) == 30
+
+
+def test_partial_lines_wait_until_finished(tmp_path):
+    path = tmp_path / "feed.csv"
+    path.write_text(HEADER + "2025-12-01,210,20\n2025-12-02,2")
+    source = FileTailSource(str(path))
+    assert source.poll() == [row(date(2025, 12, 1), 210, 20)]
+    assert source.poll() == []
+
+    with open(path, "a") as f:
+        f.write("15,21\n2025-12-03,230")
+    assert source.poll() == [row(date(2025, 12, 2), 215, 21)]
+    with open(path, "a") as f:
+        f.write(",22\n")
+    assert source.poll() == [row(date(2025, 12, 3), 230, 22)]
+
+
+def test_truncation_and_rotation_start_over(tmp_path):
+    path = tmp_path / "feed.csv"
+    path.write_text(HEADER + "2025-12-01,210,20\n2025-12-02,215,21\n")
+    source = FileTailSource(str(path))
+    assert len(source.poll()) == 2
+
+    path.write_text(HEADER + "2025-12-03,230,22\n")  # truncated and rewritten
+    assert source.poll() == [row(date(2025, 12, 3), 230, 22)]
+
+    rotated = tmp_path / "feed.csv.new"
+    rotated.write_text("2025-12-04,240,23\n2025-12-05,250,24\n")  # new file, no header
+    os.replace(rotated, path)
+    assert source.poll() == [row(date(2025, 12, 4), 240, 23), row(date(2025, 12, 5), 250, 24)]
+    path.unlink()
+    assert source.poll() == []
+
+
+def test_from_end_skips_existing_rows_but_keeps_the_header(tmp_path):
+    path = tmp_path / "feed.csv"
+    path.write_text(HEADER + "2025-12-01,210,20\n")
+    source = FileTailSource(str(path), from_end=True)
+    assert source.poll() == []
+    with open(path, "a") as f:
+        f.write("2025-12-02,215,21\n")
+    assert source.poll() == [row(date(2025, 12, 2), 215, 21)]
+
+
+@pytest.mark.parametrize("persist", [False, True])
+def test_following_serves_feed_rows_during_the_block(tmp_path, persist):
+    history = tmp_path / "historical_admissions.csv"
+    history.write_text(HEADER + "2025-11-30,200,20\n")
+    feed_path = tmp_path / "feed.csv"
+    feed_path.write_text(HEADER + "2025-12-01,210,21\n")
+
+    async def main():
+        async with following(str(feed_path), interval=0.01, persist=persist) as feed:
+            assert get_admissions_store() is feed
+            with open(feed_path, "a") as f:
+                f.write("2025-12-02,220,22\n")
+            for _ in range(100):
+                if len(feed) == 3:
+                    break
+                await asyncio.sleep(0.01)
+            return [r["date"] for r in feed.last(3)]
+
+    with use_data_dir(str(tmp_path)):
+        assert sorted(asyncio.run(main())) == ["2025-11-30", "2025-12-01", "2025-12-02"]
+        after = get_admissions_store()
+    assert not isinstance(after, LiveAdmissionsStore)
+    assert len(after) == (3 if persist else 1)
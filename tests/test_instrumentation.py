@@ -0,0 +1,49 @@
+# tests/test_instrumentation.py
+"""Metrics callbacks (src/observability/instrumentation.py): failed calls don't leak start times."""
+import asyncio
+from typing import AsyncGenerator
+
+import pytest
+from google.adk.agents import LlmAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from src.agents.callbacks import agent_callbacks
+from src.observability import instrumentation
+from src.observability.metrics import metrics
+
+
+class FailingModel(BaseLlm):
+    model: str = "failing"
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        raise ConnectionError("upstream down")
+        yield  # pragma: no cover
+
+
+def test_model_error_drops_the_start_time():
+    agent = LlmAgent(name="failing_agent", model=FailingModel(), instruction="Plan.", **agent_callbacks())
+    errors = metrics.counter("model_errors_total").value(agent="failing_agent")
+
+    async def main():
+        runner = InMemoryRunner(agent=agent, app_name="test")
+        session = await runner.session_service.create_session(app_name="test", user_id="u")
+        message = types.Content(role="user", parts=[types.Part(text="hi")])
+        async for _ in runner.run_async(user_id="u", session_id=session.id, new_message=message):
+            pass
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(main())
+    assert not [key for key in instrumentation._starts if key[0] == "model"]
+    assert metrics.counter("model_errors_total").value(agent="failing_agent") == errors + 1
+
+
+def test_start_times_are_bounded(monkeypatch):
+    monkeypatch.setattr(instrumentation, "MAX_STARTS", 3)
+    monkeypatch.setattr(instrumentation, "_starts", type(instrumentation._starts)())
+    for i in range(5):
+        instrumentation._begin(("agent", f"run-{i}", "orchestrator"))
+    assert [key[1] for key in instrumentation._starts] == ["run-2", "run-3", "run-4"]
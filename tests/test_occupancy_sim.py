@@ -0,0 +1,42 @@
+# tests/test_occupancy_sim.py
+"""Bed and ICU occupancy simulation (src/tools/occupancy_sim_tool.py): edge cases and the counting fast path."""
+import numpy as np
+import pytest
+
+from src.tools.occupancy_sim_tool import _simulate, simulate_occupancy
+
+DATES = [f"2025-12-{day:02d}" for day in range(1, 8)]
+
+
+def simulate(admissions: float, icu: float, warmup: float, **kwargs) -> dict:
+    return simulate_occupancy(
+        np.full(7, admissions), np.full(7, icu), np.full(28, warmup), np.full(28, icu), DATES, **kwargs
+    )
+
+
+def test_empty_hospital_with_no_arrivals_stays_empty():
+    result = simulate(0.0, 0.0, 0.0, replications=20)
+    for day in result["daily"]:
+        assert day["beds_occupied_p90"] == day["icu_occupied_p90"] == 0
+        assert day["prob_icu_full"] == day["prob_beds_full"] == 0
+        assert day["icu_boarded_mean"] == day["diverted_mean"] == 0
+    assert result["icu_saturation_date"] is None
+
+
+def test_full_icu_forces_boarding_and_diversion():
+    result = simulate(40.0, 20.0, 40.0, beds=100, icu_beds=10, replications=20)
+    assert result["icu_saturation_date"] == DATES[0]
+    assert all(day["prob_icu_full"] == 1 for day in result["daily"])
+    assert all(day["icu_occupied_p90"] <= 10 and day["beds_occupied_p90"] <= 100 for day in result["daily"])
+    assert sum(day["icu_boarded_mean"] for day in result["daily"]) > 0
+    assert sum(day["diverted_mean"] for day in result["daily"]) > 0
+
+
+@pytest.mark.parametrize("beds, icu_beds", [(2000, 120), (400, 25), (260, 30), (230, 26)])
+def test_counted_census_matches_the_event_loop(beds, icu_beds):
+    admissions, share = np.full(14, 40.0), np.full(14, 0.1)
+    warmup = (np.full(28, 38.0), np.full(28, 0.1))
+    args = (warmup, admissions, share, beds, icu_beds, 40)
+    fast = _simulate(np.random.default_rng(3), *args)
+    reference = _simulate(np.random.default_rng(3), *args, event_loop_only=True)
+    np.testing.assert_array_equal(fast, reference)
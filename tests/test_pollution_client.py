@@ -0,0 +1,142 @@
+# tests/test_pollution_client.py
+"""PollutionClient against the local OpenWeatherMap stub (src/eval/stub_pollution_server.py)."""
+import asyncio
+import time
+
+import pytest
+
+from src.eval.stub_pollution_server import StubPollutionServer, stub_payload
+from src.tools.pollution_client import PollutionClient
+
+LAT, LON = 28.61, 77.21
+
+
+@pytest.fixture
+def server():
+    with StubPollutionServer() as stub:
+        yield stub
+
+
+def client_for(server, **kwargs) -> PollutionClient:
+    return PollutionClient(base_url=server.url, api_key="test", **kwargs)
+
+
+def run(client: PollutionClient, coro):
+    async def main():
+        try:
+            return await coro
+        finally:
+            await client.aclose()
+
+    return asyncio.run(main())
+
+
+def test_fresh_entries_are_served_from_cache(server):
+    client = client_for(server)
+
+    async def twice():
+        first = await client.forecast(LAT, LON)
+        second = await client.forecast(LAT + 0.001, LON)  # same ~1 km cell
+        return first, second
+
+    first, second = run(client, twice())
+    assert first == second == stub_payload(LAT, LON)
+    assert server.requests == 1
+    assert client.forecast_sync(LAT, LON) == first
+    assert server.requests == 1
+
+
+def test_expired_entries_are_fetched_again(server):
+    client = client_for(server, ttl_seconds=0.05, stale_seconds=0)
+    client.forecast_sync(LAT, LON)
+    time.sleep(0.1)
+    client.forecast_sync(LAT, LON)
+    assert server.requests == 2
+
+
+def test_identical_inflight_requests_share_one_upstream_call(server):
+    server.delay = 0.2
+    client = client_for(server)
+
+    async def concurrently():
+        return await asyncio.gather(*(client.forecast(LAT, LON) for _ in range(5)))
+
+    results = run(client, concurrently())
+    assert all(r == results[0] for r in results)
+    assert server.requests == 1
+
+
+def test_stale_entry_is_served_while_refresh_fails(server):
+    client = client_for(server, ttl_seconds=0)
+
+    async def scenario():
+        fresh = await client.forecast(LAT, LON)
+        server.fail = True
+        stale = await client.forecast(LAT, LON)
+        await asyncio.sleep(0.2)  # let the background refresh hit the 503
+        return fresh, stale, await client.forecast(LAT, LON)
+
+    fresh, stale, after_failure = run(client, scenario())
+    assert stale == {**fresh, "stale": True}  # refresh still in flight: no outcome yet
+    assert after_failure["stale"] is True and "503" in after_failure["error"]
+    assert after_failure == {**fresh, "stale": True, "error": after_failure["error"]}
+    assert server.requests >= 2
+
+    async def recovered():
+        server.fail = False
+        await client.forecast(LAT, LON)
+        await asyncio.sleep(0.2)  # a successful refresh clears the error
+        return await client.forecast(LAT, LON)
+
+    assert run(client, recovered()) == {**fresh, "stale": True}
+
+
+def test_stale_markers_match_on_both_paths(server):
+    client = client_for(server, ttl_seconds=0)
+    client.forecast_sync(LAT, LON)
+    server.fail = True
+    sync = client.forecast_sync(LAT, LON)
+
+    async def scenario():
+        await client.forecast(LAT, LON)
+        await asyncio.sleep(0.2)
+        return await client.forecast(LAT, LON)
+
+    result = run(client, scenario())
+    assert result.keys() == sync.keys()
+    assert result["stale"] is sync["stale"] is True
+    assert "503" in result["error"] and "503" in sync["error"]  # httpx and requests word it differently
+
+
+def test_upstream_failure_without_cache_returns_error(server):
+    server.fail = True
+    client = client_for(server)
+    result = run(client, client.forecast(LAT, LON))
+    assert result["data"] is None and "503" in result["error"]
+
+    sync = client.forecast_sync(LAT, LON)
+    assert sync["data"] is None and "503" in sync["error"]
+
+
+def test_sync_fallback_marks_stale_payload(server):
+    client = client_for(server, ttl_seconds=0)
+    fresh = client.forecast_sync(LAT, LON)
+    server.fail = True
+    stale = client.forecast_sync(LAT, LON)
+    assert stale["stale"] is True and "503" in stale["error"]
+    assert stale["list"] == fresh["list"]
+
+
+def test_each_event_loop_gets_its_own_session(server):
+    client = client_for(server, ttl_seconds=0, stale_seconds=0)
+    sessions = []
+
+    async def fetch():
+        await client.forecast(LAT, LON)
+        sessions.append(client._session())
+
+    asyncio.run(fetch())  # loop closed without aclose(): its session is dropped on next use
+    run(client, fetch())
+    assert sessions[0] is not sessions[1]
+    assert sessions[1].is_closed
+    assert not client._async_sessions
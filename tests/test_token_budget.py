@@ -0,0 +1,92 @@
+# tests/test_token_budget.py
+"""Handoff compression (src/agents/token_budget.py): handoffs shrink, the operator's prompt never does."""
+import asyncio
+from typing import AsyncGenerator
+
+from google.adk.agents import LlmAgent, SequentialAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.runners import InMemoryRunner
+from google.adk.tools import AgentTool
+from google.genai import types
+
+from src.agents.token_budget import TokenBudget, estimate_tokens
+
+BUDGET = 64
+FORECAST = "Surge Forecast\n" + "\n".join(
+    f"- 2025-12-{day:02d}: high risk, ~{240 + day} admissions, drivers: festival, pollution" for day in range(1, 15)
+)
+PROMPT = (
+    "Plan for the next 14 days for the Delhi campus. "
+    + "Keep the ICU reserve at ten percent of beds and do not cancel elective surgery before day three. " * 8
+    + "Final constraint: report in Hindi and English."
+)
+
+
+class RecordingModel(BaseLlm):
+    """Answers every call with `text` and keeps the user-role texts it was sent."""
+
+    model: str = "recording"
+    text: str = "ok"
+    seen: list = []
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.seen.append(
+            [p.text for c in llm_request.contents if c.role == "user" for p in c.parts or [] if p.text]
+        )
+        if any(c.role == "model" for c in llm_request.contents) or self.text != "call":
+            yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text="done")]))
+            return
+        call = types.FunctionCall(name="staffing", args={"request": FORECAST})
+        yield LlmResponse(content=types.Content(role="model", parts=[types.Part(function_call=call)]))
+
+
+def specialist(name: str, model: RecordingModel, budget: TokenBudget) -> LlmAgent:
+    return LlmAgent(name=name, model=model, instruction="Plan.", before_model_callback=budget.before_model)
+
+
+def run(agent, prompt: str) -> None:
+    async def main():
+        runner = InMemoryRunner(agent=agent, app_name="test")
+        session = await runner.session_service.create_session(app_name="test", user_id="u")
+        message = types.Content(role="user", parts=[types.Part(text=prompt)])
+        async for _ in runner.run_async(user_id="u", session_id=session.id, new_message=message):
+            pass
+
+    asyncio.run(main())
+
+
+def test_long_user_prompt_reaches_the_model_unchanged():
+    assert estimate_tokens(PROMPT) > BUDGET
+    budget = TokenBudget(handoff_tokens=BUDGET)
+    forecast = RecordingModel(text=FORECAST, seen=[])
+    staffing = RecordingModel(seen=[])
+    workflow = SequentialAgent(
+        name="workflow",
+        sub_agents=[specialist("forecast", forecast, budget), specialist("staffing", staffing, budget)],
+    )
+    run(workflow, PROMPT)
+
+    assert forecast.seen[0] == [PROMPT]
+    texts = staffing.seen[0]
+    assert texts[0] == PROMPT
+    relayed = next(t for t in texts if t.startswith("[forecast] said:"))
+    assert len(relayed) < len(FORECAST)  # the relayed forecast is the handoff
+    assert relayed.rstrip().endswith(">>>")  # ADK's quote markers survive
+
+
+def test_agent_tool_request_is_compressed():
+    budget = TokenBudget(handoff_tokens=BUDGET)
+    staffing = RecordingModel(seen=[])
+    orchestrator = LlmAgent(
+        name="orchestrator",
+        model=RecordingModel(text="call", seen=[]),
+        instruction="Delegate.",
+        tools=[AgentTool(agent=specialist("staffing", staffing, budget))],
+    )
+    run(orchestrator, PROMPT)
+
+    (request,) = staffing.seen[0]
+    assert estimate_tokens(request) < estimate_tokens(FORECAST)
+    assert "2025-12-01" in request